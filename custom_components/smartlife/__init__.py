@@ -1,4 +1,8 @@
 """Support for smartlife devices."""
+from collections.abc import Iterable
+from datetime import datetime
+from functools import partial
+import time
 from typing import NamedTuple, Any
 
 from homeassistant.core import HomeAssistant, callback
@@ -6,8 +10,8 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers import device_registry as dr, entity_registry as er
 from homeassistant.components.light import DOMAIN as LIGHT_DOMAIN
 from homeassistant.components.switch import DOMAIN as SWITCH_DOMAIN
-from homeassistant.helpers.dispatcher import dispatcher_send
-from homeassistant.const import __version__
+from homeassistant.helpers.event import async_call_later
+from homeassistant.const import Platform, __version__
 from homeassistant.loader import async_get_integration
 
 from .const import (
@@ -15,27 +19,58 @@ from .const import (
     LOGGER,
     CONF_CLIENT_ID,
     PLATFORMS,
+    REFRESH_RETRY_INTERVAL,
+    CONF_UNIQUE_ID_VERSION,
+    UNIQUE_ID_VERSION,
+    UNIQUE_ID_LIGHT_CATEGORIES,
+    UNIQUE_ID_SWITCH_CATEGORIES,
+    UNIQUE_ID_SWITCH_POSTFIXES,
     DPCode,
-    SMART_LIFE_HA_SIGNAL_UPDATE_ENTITY,
-    SMART_LIFE_DISCOVERY_NEW
 )
 
 from tuya_sharing import Manager, SharingDeviceListener, CustomerDevice, SharingTokenListener
 from tuya_sharing import logger
 
+from .base import DeviceSchema
+from .bridge import UpdateBridge, UpdateRouter
+from .cloud import SmartLifeCloud
+from .commands import CommandDispatcher
+from .discovery import DiscoveryIndex, async_dispatch_new_devices
+from .executor import BlockingExecutor
+from .pipeline import SetupPipeline
+from .polling import PollingFallback
+from .services import async_setup_services, async_unload_services
+from .significance import SignificanceStats
+from .watchdog import MQWatchdog
+from .storage import DeviceSnapshotStore
+
 logger.setLevel(LOGGER.getEffectiveLevel())
 
+# Device attributes reported by the MQ as well
+DEVICE_STATE_KEYS = {"online", "status", "update_time"}
+
 
 class HomeAssistantSmartLifeData(NamedTuple):
     """Smart Life data stored in the Home Assistant data object."""
 
     manager: Manager
     listener: SharingDeviceListener
+    snapshot: DeviceSnapshotStore
+    discovery: DiscoveryIndex
+    platforms: set[Platform]
+    pipeline: SetupPipeline
+    commands: CommandDispatcher
+    cloud: SmartLifeCloud
+    executor: BlockingExecutor
+    watchdog: MQWatchdog
+    polling: PollingFallback
+    significance: SignificanceStats
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Async setup hass config entry."""
     hass.data.setdefault(DOMAIN, {})
+    async_setup_services(hass)
 
     if hass.data[DOMAIN].get(entry.entry_id) is None:
         token_listener = TokenListener(hass, entry)
@@ -48,35 +83,163 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             token_listener
         )
 
-        listener = DeviceListener(hass, smart_life_manager)
+        executor = BlockingExecutor(hass, entry)
+        cloud = SmartLifeCloud(hass, smart_life_manager, executor)
+        discovery = DiscoveryIndex()
+        listener = DeviceListener(hass, entry, smart_life_manager, discovery)
         smart_life_manager.add_device_listener(listener)
-        hass.data[DOMAIN][entry.entry_id] = HomeAssistantSmartLifeData(
+        commands = CommandDispatcher(
+            hass, entry, smart_life_manager, cloud, listener.router
+        )
+        polling = PollingFallback(
+            hass, smart_life_manager, cloud, listener.bridge, commands
+        )
+        hass_data = hass.data[DOMAIN][entry.entry_id] = HomeAssistantSmartLifeData(
             manager=smart_life_manager,
-            listener=listener
+            listener=listener,
+            snapshot=DeviceSnapshotStore(hass, entry),
+            discovery=discovery,
+            platforms=set(),
+            pipeline=SetupPipeline(hass, cloud),
+            commands=commands,
+            cloud=cloud,
+            executor=executor,
+            watchdog=MQWatchdog(
+                hass,
+                smart_life_manager,
+                executor,
+                polling,
+                lambda: async_refresh_devices(hass, entry, refresh_mq=False),
+            ),
+            polling=polling,
+            significance=SignificanceStats(),
+        )
+        listener.bridge.async_add_report_listener(
+            hass_data.commands.optimistic.async_reported
+        )
+        listener.bridge.async_add_report_listener(
+            hass_data.commands.acks.async_reported
         )
     else:
-        hass_data: HomeAssistantSmartLifeData = hass.data[DOMAIN][entry.entry_id]
+        hass_data = hass.data[DOMAIN][entry.entry_id]
         smart_life_manager = hass_data.manager
 
-    integration = await async_get_integration(hass, DOMAIN)
-    manifest = integration.manifest
-    smart_life_version = manifest["version"]
-    sdk_version = manifest["requirements"]
-    sharing_sdk = ""
-    for item in sdk_version:
-        if "device-sharing-sdk" in item:
-            sharing_sdk = item.split("==")[1]
-    await hass.async_add_executor_job(smart_life_manager.report_version, __version__, smart_life_version, sharing_sdk)
+    pipeline = hass_data.pipeline
+    pipeline.async_reset()
+
+    with pipeline.stage("total"):
+        integration = await async_get_integration(hass, DOMAIN)
+        manifest = integration.manifest
+        smart_life_version = manifest["version"]
+        sdk_version = manifest["requirements"]
+        sharing_sdk = ""
+        for item in sdk_version:
+            if "device-sharing-sdk" in item:
+                sharing_sdk = item.split("==")[1]
+        pipeline.async_report_version(__version__, smart_life_version, sharing_sdk)
+
+        # Start from the known devices or the device snapshot when available,
+        # the cloud is queried in the background. Otherwise, wait for the cloud.
+        warm_start = bool(smart_life_manager.device_map)
+        if not warm_start:
+            with pipeline.stage("load_snapshot"):
+                devices = await hass_data.snapshot.async_load()
+            if devices:
+                LOGGER.debug("Warm start from snapshot with %s devices", len(devices))
+                smart_life_manager.device_map.update(devices)
+                warm_start = True
+
+        if not warm_start:
+            homes, devices = await pipeline.async_fetch_devices()
+            smart_life_manager.user_homes = homes
+            smart_life_manager.device_map.clear()
+            smart_life_manager.device_map.update(devices)
+            await hass_data.snapshot.async_save(smart_life_manager.device_map)
+
+        if smart_life_manager.user_homes:
+            pipeline.async_prefetch_scenes(smart_life_manager.user_homes)
+
+        with pipeline.stage("device_registry"):
+            # Clean up device entities
+            with pipeline.stage("cleanup_device_registry"):
+                async_cleanup_device_registry(hass, entry, smart_life_manager)
+
+            # Migrate old unique_ids to the new format
+            async_migrate_entities_unique_ids(hass, entry, smart_life_manager)
+
+            async_register_devices(
+                hass, entry, smart_life_manager.device_map.values()
+            )
+            hass_data.discovery.async_rebuild(smart_life_manager.device_map.values())
+
+        # Only set up the platforms of the categories present, the others are
+        # set up once a device of their category is added.
+        platforms = async_needed_platforms(hass_data.discovery)
+        hass_data.platforms.clear()
+        hass_data.platforms.update(platforms)
+        with pipeline.stage("forward_platforms"):
+            await hass.config_entries.async_forward_entry_setups(entry, platforms)
+
+        entry.async_on_unload(hass_data.watchdog.async_start())
+        if warm_start:
+            refresh_task = hass.async_create_task(async_refresh_devices(hass, entry))
+            entry.async_on_unload(refresh_task.cancel)
+        else:
+            # Devices are subscribed once their entities are set up.
+            with pipeline.stage("refresh_mq"):
+                await hass_data.watchdog.async_refresh_mq()
+    return True
+
+
+@callback
+def async_needed_platforms(discovery: DiscoveryIndex) -> list[Platform]:
+    """Return the platforms needed for the indexed devices, in setup order."""
+    platforms = discovery.async_platforms()
+    return [
+        platform
+        for platform in PLATFORMS
+        if platform in platforms or platform == Platform.SCENE
+    ]
+
+
+@callback
+def async_add_devices(
+        hass: HomeAssistant, entry: ConfigEntry, devices: list[CustomerDevice]
+) -> None:
+    """Index new devices and signal them to the platforms supporting them."""
+    hass_data: HomeAssistantSmartLifeData = hass.data[DOMAIN][entry.entry_id]
+    hass_data.discovery.async_add(devices)
+
+    # Platforms are set up along with the entry, nothing to load before that.
+    # A platform loaded here picks up the indexed devices during its setup.
+    if hass_data.platforms and (
+        platforms := [
+            platform
+            for platform in async_needed_platforms(hass_data.discovery)
+            if platform not in hass_data.platforms
+        ]
+    ):
+        LOGGER.debug("Loading platforms for new devices: %s", platforms)
+        hass_data.platforms.update(platforms)
+        # Newer Home Assistant versions require late forwarding to wait for the
+        # setup lock of the entry.
+        forward_entry_setups = getattr(
+            hass.config_entries,
+            "async_late_forward_entry_setups",
+            hass.config_entries.async_forward_entry_setups,
+        )
+        hass.async_create_task(forward_entry_setups(entry, platforms))
 
-    # Get devices & clean up device entities
-    await hass.async_add_executor_job(smart_life_manager.update_device_cache)
-    await cleanup_device_registry(hass, smart_life_manager)
+    async_dispatch_new_devices(hass, devices)
 
-    # Migrate old unique_ids to the new format
-    async_migrate_entities_unique_ids(hass, entry, smart_life_manager)
 
+@callback
+def async_register_devices(
+        hass: HomeAssistant, entry: ConfigEntry, devices: Iterable[CustomerDevice]
+) -> None:
+    """Register devices in the device registry."""
     device_registry = dr.async_get(hass)
-    for device in smart_life_manager.device_map.values():
+    for device in devices:
         device_registry.async_get_or_create(
             config_entry_id=entry.entry_id,
             identifiers={(DOMAIN, device.id)},
@@ -85,105 +248,235 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             model=f"{device.product_name} (unsupported)",
         )
 
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-    await hass.async_add_executor_job(smart_life_manager.refresh_mq)
-    return True
-
 
-async def cleanup_device_registry(
-        hass: HomeAssistant, device_manager: Manager
+async def async_refresh_devices(
+        hass: HomeAssistant, entry: ConfigEntry, refresh_mq: bool = True
 ) -> None:
-    """Remove deleted device registry entry if there are no remaining entities."""
+    """Refresh the devices from the cloud and reconcile the device map.
+
+    Only the devices which changed since the last refresh are updated, added
+    or removed, see SetupPipeline.async_fetch_devices.
+    """
+    hass_data: HomeAssistantSmartLifeData = hass.data[DOMAIN][entry.entry_id]
+    manager = hass_data.manager
+
+    try:
+        with hass_data.pipeline.stage("refresh_devices"):
+            homes, devices = await hass_data.pipeline.async_fetch_devices(
+                manager.device_map
+            )
+    except Exception as err:  # pylint: disable=broad-except
+        LOGGER.warning(
+            "Failed to refresh devices, retrying in %s seconds: %s",
+            REFRESH_RETRY_INTERVAL,
+            err,
+        )
+
+        @callback
+        def _async_retry(_: datetime) -> None:
+            hass.async_create_task(async_refresh_devices(hass, entry, refresh_mq))
+
+        entry.async_on_unload(
+            async_call_later(hass, REFRESH_RETRY_INTERVAL, _async_retry)
+        )
+        return
+
+    manager.user_homes = homes
+    hass_data.pipeline.async_prefetch_scenes(homes)
+    spec_changed = async_reconcile_devices(hass, entry, devices)
+    await hass_data.snapshot.async_save(manager.device_map)
+
+    if spec_changed:
+        # Entities are set up from the specification, they need to be recreated.
+        LOGGER.debug("Device specifications changed, reloading")
+        hass.async_create_task(hass.config_entries.async_reload(entry.entry_id))
+        return
+
+    if refresh_mq:
+        await hass_data.watchdog.async_refresh_mq()
+
+
+@callback
+def async_reconcile_devices(
+        hass: HomeAssistant, entry: ConfigEntry, devices: dict[str, CustomerDevice]
+) -> bool:
+    """Reconcile fetched devices with the device map.
+
+    Returns True if the specification of a known device has changed.
+    """
+    hass_data: HomeAssistantSmartLifeData = hass.data[DOMAIN][entry.entry_id]
+    device_map = hass_data.manager.device_map
+
+    for device_id in set(device_map) - set(devices):
+        del device_map[device_id]
+        hass_data.listener.async_remove_device(device_id)
+
+    spec_changed = False
+    new_devices: list[CustomerDevice] = []
+    for device_id, device in devices.items():
+        if (current := device_map.get(device_id)) is None:
+            device_map[device_id] = device
+            new_devices.append(device)
+            continue
+
+        # Entities hold a reference to the device, keep the existing object and
+        # only replace what actually changed.
+        changes = {
+            key: value
+            for key, value in vars(device).items()
+            if getattr(current, key, None) != value
+        }
+        if not changes:
+            continue
+        if "function" in changes or "status_range" in changes:
+            spec_changed = True
+
+        vars(current).update(changes)
+        if changes.keys() <= DEVICE_STATE_KEYS:
+            # Like an MQ report, only the entities of changed DP codes update.
+            hass_data.listener.bridge.push(current)
+        else:
+            hass_data.listener.router.async_route(device_id, None)
+
+    if new_devices:
+        async_register_devices(hass, entry, new_devices)
+        async_add_devices(hass, entry, new_devices)
+
+    return spec_changed
+
+
+@callback
+def async_cleanup_device_registry(
+        hass: HomeAssistant, config_entry: ConfigEntry, device_manager: Manager
+) -> int:
+    """Remove the device registry entries of deleted devices.
+
+    Returns the number of removed device registry entries.
+    """
+    start = time.monotonic()
     device_registry = dr.async_get(hass)
-    for dev_id, device_entry in list(device_registry.devices.items()):
-        for item in device_entry.identifiers:
-            if item[0] == DOMAIN and item[1] not in device_manager.device_map:
-                device_registry.async_remove_device(dev_id)
-                break
+    registry_entries = {
+        device_entry.id: {
+            item[1] for item in device_entry.identifiers if item[0] == DOMAIN
+        }
+        for device_entry in dr.async_entries_for_config_entry(
+            device_registry, config_entry.entry_id
+        )
+    }
+    device_ids = device_manager.device_map.keys()
+    removed = [
+        dev_id
+        for dev_id, identifiers in registry_entries.items()
+        if identifiers - device_ids
+    ]
+    for dev_id in removed:
+        device_registry.async_remove_device(dev_id)
+
+    LOGGER.debug(
+        "Removed %s of %s device registry entries in %.3f seconds",
+        len(removed),
+        len(registry_entries),
+        time.monotonic() - start,
+    )
+    return len(removed)
 
 
 @callback
 def async_migrate_entities_unique_ids(
         hass: HomeAssistant, config_entry: ConfigEntry, device_manager: Manager
 ) -> None:
-    """Migrate unique_ids in the entity registry to the new format."""
+    """Migrate unique_ids in the entity registry to the new format.
+
+    The migration runs once, the version of the unique_ids is then stored in
+    the config entry.
+    """
+    if config_entry.data.get(CONF_UNIQUE_ID_VERSION, 1) >= UNIQUE_ID_VERSION:
+        return
+
     entity_registry = er.async_get(hass)
     registry_entries = er.async_entries_for_config_entry(
         entity_registry, config_entry.entry_id
     )
-    light_entries = {
-        entry.unique_id: entry
-        for entry in registry_entries
-        if entry.domain == LIGHT_DOMAIN
-    }
-    switch_entries = {
-        entry.unique_id: entry
-        for entry in registry_entries
-        if entry.domain == SWITCH_DOMAIN
-    }
-
-    for device in device_manager.device_map.values():
-        # Old lights where in `smartlife.{device_id}` format, now the DPCode is added.
-        #
-        # If the device is a previously supported light category and still has
-        # the old format for the unique ID, migrate it to the new format.
-        #
-        # Previously only devices providing the SWITCH_LED DPCode were supported,
-        # thus this can be added to those existing IDs.
-        #
-        # `smartlife.{device_id}` -> `smartlife.{device_id}{SWITCH_LED}`
-        if (
-                device.category in ("dc", "dd", "dj", "fs", "fwl", "jsq", "xdd", "xxj")
-                and (entry := light_entries.get(f"smartlife.{device.id}"))
-                and f"smartlife.{device.id}{DPCode.SWITCH_LED}" not in light_entries
-        ):
-            entity_registry.async_update_entity(
-                entry.entity_id, new_unique_id=f"smartlife.{device.id}{DPCode.SWITCH_LED}"
-            )
-
-        # Old switches has different formats for the unique ID, but is mappable.
-        #
-        # If the device is a previously supported switch category and still has
-        # the old format for the unique ID, migrate it to the new format.
-        #
-        # `smartlife.{device_id}` -> `smartlife.{device_id}{SWITCH}`
-        # `smartlife.{device_id}_1` -> `smartlife.{device_id}{SWITCH_1}`
-        # ...
-        # `smartlife.{device_id}_6` -> `smartlife.{device_id}{SWITCH_6}`
-        # `smartlife.{device_id}_usb1` -> `smartlife.{device_id}{SWITCH_USB1}`
-        # ...
-        # `smartlife.{device_id}_usb6` -> `smartlife.{device_id}{SWITCH_USB6}`
-        #
-        # In all other cases, the unique ID is not changed.
-        if device.category in ("bh", "cwysj", "cz", "dlq", "kg", "kj", "pc", "xxj"):
-            for postfix, dpcode in (
-                    ("", DPCode.SWITCH),
-                    ("_1", DPCode.SWITCH_1),
-                    ("_2", DPCode.SWITCH_2),
-                    ("_3", DPCode.SWITCH_3),
-                    ("_4", DPCode.SWITCH_4),
-                    ("_5", DPCode.SWITCH_5),
-                    ("_6", DPCode.SWITCH_6),
-                    ("_usb1", DPCode.SWITCH_USB1),
-                    ("_usb2", DPCode.SWITCH_USB2),
-                    ("_usb3", DPCode.SWITCH_USB3),
-                    ("_usb4", DPCode.SWITCH_USB4),
-                    ("_usb5", DPCode.SWITCH_USB5),
-                    ("_usb6", DPCode.SWITCH_USB6),
-            ):
-                if (
-                        entry := switch_entries.get(f"smartlife.{device.id}{postfix}")
-                ) and f"smartlife.{device.id}{dpcode}" not in switch_entries:
-                    entity_registry.async_update_entity(
-                        entry.entity_id, new_unique_id=f"smartlife.{device.id}{dpcode}"
-                    )
+    unique_ids = {entry.unique_id for entry in registry_entries}
+
+    # Old lights where in `smartlife.{device_id}` format, now the DPCode is added.
+    #
+    # If the device is a previously supported light category and still has
+    # the old format for the unique ID, migrate it to the new format.
+    #
+    # Previously only devices providing the SWITCH_LED DPCode were supported,
+    # thus this can be added to those existing IDs.
+    #
+    # `smartlife.{device_id}` -> `smartlife.{device_id}{SWITCH_LED}`
+    #
+    # Old switches has different formats for the unique ID, but is mappable.
+    #
+    # If the device is a previously supported switch category and still has
+    # the old format for the unique ID, migrate it to the new format.
+    #
+    # `smartlife.{device_id}` -> `smartlife.{device_id}{SWITCH}`
+    # `smartlife.{device_id}_1` -> `smartlife.{device_id}{SWITCH_1}`
+    # ...
+    # `smartlife.{device_id}_6` -> `smartlife.{device_id}{SWITCH_6}`
+    # `smartlife.{device_id}_usb1` -> `smartlife.{device_id}{SWITCH_USB1}`
+    # ...
+    # `smartlife.{device_id}_usb6` -> `smartlife.{device_id}{SWITCH_USB6}`
+    #
+    # In all other cases, the unique ID is not changed.
+    updates: list[tuple[str, str]] = []
+    for entry in registry_entries:
+        if entry.domain not in (LIGHT_DOMAIN, SWITCH_DOMAIN):
+            continue
+        if not entry.unique_id.startswith("smartlife."):
+            continue
+
+        device_id = entry.unique_id[len("smartlife."):]
+        postfix = ""
+        if device_id not in device_manager.device_map and "_" in device_id:
+            device_id, postfix = device_id.rsplit("_", 1)
+            postfix = f"_{postfix}"
+        if (device := device_manager.device_map.get(device_id)) is None:
+            continue
+
+        dpcode: DPCode | None = None
+        if entry.domain == LIGHT_DOMAIN:
+            if not postfix and device.category in UNIQUE_ID_LIGHT_CATEGORIES:
+                dpcode = DPCode.SWITCH_LED
+        elif device.category in UNIQUE_ID_SWITCH_CATEGORIES:
+            dpcode = UNIQUE_ID_SWITCH_POSTFIXES.get(postfix)
+
+        if dpcode is None:
+            continue
+        new_unique_id = f"smartlife.{device.id}{dpcode}"
+        if new_unique_id not in unique_ids:
+            unique_ids.add(new_unique_id)
+            updates.append((entry.entity_id, new_unique_id))
+
+    for entity_id, new_unique_id in updates:
+        entity_registry.async_update_entity(entity_id, new_unique_id=new_unique_id)
+
+    LOGGER.debug("Migrated %s unique_ids", len(updates))
+    hass.config_entries.async_update_entry(
+        config_entry,
+        data={**config_entry.data, CONF_UNIQUE_ID_VERSION: UNIQUE_ID_VERSION},
+    )
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unloading the smartlife platforms."""
 
     LOGGER.debug("unload entry id = %s", entry.entry_id)
-    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    hass_data: HomeAssistantSmartLifeData = hass.data[DOMAIN][entry.entry_id]
+    hass_data.commands.async_flush()
+    hass_data.commands.optimistic.async_clear_all()
+    hass_data.commands.acks.async_clear_all()
+    await hass_data.snapshot.async_save(hass_data.manager.device_map)
+    if unload_ok := await hass.config_entries.async_unload_platforms(
+        entry, hass_data.platforms
+    ):
+        hass_data.platforms.clear()
+        DeviceSchema.forget(hass_data.manager.device_map)
+    return unload_ok
 
 
 async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
@@ -192,12 +485,15 @@ async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     hass_data: HomeAssistantSmartLifeData = hass.data[DOMAIN][entry.entry_id]
 
     if hass_data.manager.mq is not None:
-        hass_data.manager.mq.stop()
+        await hass_data.executor.async_run(hass_data.manager.mq.stop)
     hass_data.manager.remove_device_listener(hass_data.listener)
-    await hass.async_add_executor_job(hass_data.manager.unload)
+    await hass_data.executor.async_run(hass_data.manager.unload)
+    hass_data.executor.shutdown()
+    await hass_data.snapshot.async_remove()
     hass.data[DOMAIN].pop(entry.entry_id)
     if not hass.data[DOMAIN]:
         hass.data.pop(DOMAIN)
+        async_unload_services(hass)
     pass
 
 
@@ -207,11 +503,17 @@ class DeviceListener(SharingDeviceListener):
     def __init__(
             self,
             hass: HomeAssistant,
+            entry: ConfigEntry,
             manager: Manager,
+            discovery: DiscoveryIndex,
     ) -> None:
         """Init DeviceListener."""
         self.hass = hass
+        self.entry = entry
         self.manager = manager
+        self.router = UpdateRouter()
+        self.bridge = UpdateBridge(hass, self.router)
+        self.discovery = discovery
 
     def update_device(self, device: CustomerDevice) -> None:
         """Update device status."""
@@ -220,13 +522,10 @@ class DeviceListener(SharingDeviceListener):
             device.id,
             self.manager.device_map[device.id].status,
         )
-        dispatcher_send(self.hass, f"{SMART_LIFE_HA_SIGNAL_UPDATE_ENTITY}_{device.id}")
+        self.bridge.push(device)
 
     def add_device(self, device: CustomerDevice) -> None:
         """Add device added listener."""
-        # Ensure the device isn't present stale
-        self.hass.add_job(self.async_remove_device, device.id)
-        
         # Логируем детальную информацию об устройстве
         LOGGER.debug(
             "Adding device %s (category: %s, product_id: %s)",
@@ -238,23 +537,42 @@ class DeviceListener(SharingDeviceListener):
         LOGGER.debug("Device status: %s", device.status)
         LOGGER.debug("Device function: %s", device.function)
         LOGGER.debug("Device status_range: %s", device.status_range)
-        
-        dispatcher_send(self.hass, SMART_LIFE_DISCOVERY_NEW, [device.id])
+
+        self.hass.add_job(self.async_add_device, device)
 
     def remove_device(self, device_id: str) -> None:
         """Add device removed listener."""
         self.hass.add_job(self.async_remove_device, device_id)
 
+    @callback
+    def async_add_device(self, device: CustomerDevice) -> None:
+        """Add device to Home Assistant."""
+        # Ensure the device isn't present stale
+        self.async_remove_device(device.id)
+
+        async_add_devices(self.hass, self.entry, [device])
+        self._async_save_snapshot()
+
     @callback
     def async_remove_device(self, device_id: str) -> None:
         """Remove device from Home Assistant."""
         LOGGER.debug("Remove device: %s", device_id)
+        self.discovery.async_remove(device_id)
+        self.bridge.forget(device_id)
+        DeviceSchema.forget((device_id,))
         device_registry = dr.async_get(self.hass)
         device_entry = device_registry.async_get_device(
             identifiers={(DOMAIN, device_id)}
         )
         if device_entry is not None:
             device_registry.async_remove_device(device_entry.id)
+        self._async_save_snapshot()
+
+    @callback
+    def _async_save_snapshot(self) -> None:
+        """Save the changed device map with the next snapshot write."""
+        if hass_data := self.hass.data[DOMAIN].get(self.entry.entry_id):
+            hass_data.snapshot.async_delay_save(self.manager.device_map)
 
 
 class TokenListener(SharingTokenListener):
@@ -270,7 +588,10 @@ class TokenListener(SharingTokenListener):
     def update_token(self, token_info: [str, Any]):
         data = {**self.entry.data, "token_info": token_info}
         LOGGER.debug("update token info : %s", data)
-        self.hass.config_entries.async_update_entry(self.entry, data=data)
+        # Called from the SDK and executor threads.
+        self.hass.add_job(
+            partial(self.hass.config_entries.async_update_entry, self.entry, data=data)
+        )
 
     async def async_forward_entry_setup(
         self, device_ids: list[str], raw: bool = False
@@ -0,0 +1,234 @@
+"""Command acknowledgement tracking for smartlife."""
+from __future__ import annotations
+
+from collections.abc import Callable, Collection, Coroutine
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import partial
+import time
+from typing import Any
+
+from tuya_sharing import Manager
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import (
+    ACK_MAX_RETRIES,
+    ACK_RTT_BUCKETS,
+    ACK_TIMEOUT,
+    LOGGER,
+    DPType,
+)
+
+# DP types whose writes set an absolute value, sending them twice is harmless.
+IDEMPOTENT_DP_TYPES = frozenset({DPType.BOOLEAN, DPType.ENUM, DPType.INTEGER})
+
+
+@dataclass
+class _PendingAck:
+    """A DP value sent to a device, waiting for the device to report it."""
+
+    value: Any
+    sent: float
+    retry: bool
+    attempts: int = 1
+    cancel_timeout: CALLBACK_TYPE | None = None
+
+
+@dataclass
+class _AckStats:
+    """Acknowledgement counters of a device."""
+
+    acked: int = 0
+    overridden: int = 0
+    lost: int = 0
+    retried: int = 0
+    rtt_total: float = 0.0
+    rtt_max: float = 0.0
+    rtt: list[int] = field(default_factory=lambda: [0] * (len(ACK_RTT_BUCKETS) + 1))
+    last_lost: list[str] = field(default_factory=list)
+
+
+class AckTracker:
+    """Correlate the DP commands sent to devices with their reports.
+
+    A command is acknowledged when a report of the device carries the sent
+    value, the round trip is recorded in a histogram per device. A report
+    of the DP code with another value overrides the command, which is then
+    no longer resent. Commands not acknowledged within ACK_TIMEOUT seconds are
+    resent up to ACK_MAX_RETRIES times when the DP write is idempotent, then
+    flagged as lost.
+    """
+
+    def __init__(
+            self,
+            hass: HomeAssistant,
+            manager: Manager,
+            resend: Callable[[str, list[dict[str, Any]]], Coroutine[Any, Any, None]],
+    ) -> None:
+        """Init AckTracker."""
+        self.hass = hass
+        self.manager = manager
+        self._resend = resend
+        self._pending: dict[str, dict[str, _PendingAck]] = {}
+        self._stats: dict[str, _AckStats] = {}
+
+    @callback
+    def async_sent(self, device_id: str, commands: list[dict[str, Any]]) -> None:
+        """Wait for the device to report the values of sent commands."""
+        # Commands without a value, like the gate opener, report nothing.
+        if not (commands := [command for command in commands if "value" in command]):
+            return
+        device = self.manager.device_map.get(device_id)
+        pending = self._pending.setdefault(device_id, {})
+        now = time.monotonic()
+        for command in commands:
+            code = command["code"]
+            if (ack := pending.pop(code, None)) is not None:
+                ack.cancel_timeout()
+            retry = (
+                device is not None
+                and (function := device.function.get(code)) is not None
+                and function.type in IDEMPOTENT_DP_TYPES
+            )
+            ack = pending[code] = _PendingAck(command["value"], now, retry)
+            ack.cancel_timeout = self._async_schedule_timeout(device_id, code)
+
+    @callback
+    def async_discard(self, device_id: str, codes: Collection[str]) -> None:
+        """Stop waiting for commands that could not be sent."""
+        for code in codes:
+            self._async_pop(device_id, code)
+
+    @callback
+    def async_reported(self, device_id: str, dpcodes: Collection[str] | None) -> None:
+        """Acknowledge the pending commands a device report carries."""
+        if (pending := self._pending.get(device_id)) is None:
+            return
+        if (device := self.manager.device_map.get(device_id)) is None:
+            return
+
+        now = time.monotonic()
+        for code, ack in list(pending.items()):
+            if dpcodes is not None and code not in dpcodes:
+                continue
+            if code not in device.status:
+                continue
+            if device.status[code] != ack.value:
+                if dpcodes is None:
+                    continue
+                # Changed at the device or by another controller, or clamped
+                # by the device, resending would undo the reported value.
+                self._async_pop(device_id, code)
+                self._stats.setdefault(device_id, _AckStats()).overridden += 1
+                continue
+            self._async_pop(device_id, code)
+            self._async_record_rtt(device_id, now - ack.sent)
+
+    @callback
+    def _async_schedule_timeout(self, device_id: str, code: str) -> CALLBACK_TYPE:
+        """Schedule the timeout of a pending command."""
+        return async_call_later(
+            self.hass, ACK_TIMEOUT, partial(self._async_timeout, device_id, code)
+        )
+
+    @callback
+    def _async_timeout(self, device_id: str, code: str, _: datetime) -> None:
+        """Resend a command the device did not acknowledge, or flag it lost."""
+        if (ack := self._pending.get(device_id, {}).get(code)) is None:
+            return
+        stats = self._stats.setdefault(device_id, _AckStats())
+
+        if ack.retry and ack.attempts <= ACK_MAX_RETRIES:
+            ack.attempts += 1
+            stats.retried += 1
+            ack.cancel_timeout = self._async_schedule_timeout(device_id, code)
+            LOGGER.debug(
+                "Device %s did not acknowledge %s, resending (attempt %s)",
+                device_id,
+                code,
+                ack.attempts,
+            )
+            self.hass.async_create_task(
+                self._async_resend(device_id, code, ack.value)
+            )
+            return
+
+        del self._pending[device_id][code]
+        if not self._pending[device_id]:
+            del self._pending[device_id]
+        stats.lost += 1
+        stats.last_lost = [*stats.last_lost[-9:], code]
+        LOGGER.info(
+            "Device %s did not acknowledge %s after %s attempts, command lost",
+            device_id,
+            code,
+            ack.attempts,
+        )
+
+    async def _async_resend(self, device_id: str, code: str, value: Any) -> None:
+        """Resend a command, failures are left to the next timeout."""
+        try:
+            await self._resend(device_id, [{"code": code, "value": value}])
+        except Exception as err:  # pylint: disable=broad-except
+            LOGGER.debug("Failed to resend %s to device %s: %s", code, device_id, err)
+
+    @callback
+    def _async_pop(self, device_id: str, code: str) -> None:
+        """Stop waiting for a command."""
+        if (pending := self._pending.get(device_id)) is None:
+            return
+        if (ack := pending.pop(code, None)) is not None and ack.cancel_timeout:
+            ack.cancel_timeout()
+        if not pending:
+            del self._pending[device_id]
+
+    @callback
+    def _async_record_rtt(self, device_id: str, rtt: float) -> None:
+        """Record the round trip of an acknowledged command."""
+        stats = self._stats.setdefault(device_id, _AckStats())
+        stats.acked += 1
+        stats.rtt_total += rtt
+        stats.rtt_max = max(stats.rtt_max, rtt)
+        for index, bound in enumerate(ACK_RTT_BUCKETS):
+            if rtt <= bound:
+                stats.rtt[index] += 1
+                break
+        else:
+            stats.rtt[-1] += 1
+
+    @callback
+    def async_clear_all(self) -> None:
+        """Stop waiting for all commands."""
+        for pending in self._pending.values():
+            for ack in pending.values():
+                if ack.cancel_timeout:
+                    ack.cancel_timeout()
+        self._pending.clear()
+
+    @callback
+    def as_dict(self, device_id: str | None = None) -> dict[str, Any]:
+        """Return the acknowledgement stats, by device."""
+        device_ids = self._stats if device_id is None else (device_id,)
+        labels = [f"<={bound}s" for bound in ACK_RTT_BUCKETS] + [
+            f">{ACK_RTT_BUCKETS[-1]}s"
+        ]
+        data: dict[str, Any] = {}
+        for stats_device_id in device_ids:
+            if (stats := self._stats.get(stats_device_id)) is None:
+                continue
+            data[stats_device_id] = {
+                "pending": len(self._pending.get(stats_device_id, {})),
+                "acked": stats.acked,
+                "overridden": stats.overridden,
+                "lost": stats.lost,
+                "retried": stats.retried,
+                "last_lost": list(stats.last_lost),
+                "rtt_avg": round(stats.rtt_total / stats.acked, 3)
+                if stats.acked
+                else None,
+                "rtt_max": round(stats.rtt_max, 3),
+                "rtt": dict(zip(labels, stats.rtt)),
+            }
+        return data
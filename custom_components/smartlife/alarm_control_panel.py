@@ -15,6 +15,7 @@ from homeassistant.const import (
     STATE_ALARM_ARMED_HOME,
     STATE_ALARM_DISARMED,
     STATE_ALARM_TRIGGERED,
+    Platform,
 )
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
@@ -22,7 +23,9 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import HomeAssistantSmartLifeData
 from .base import SmartLifeEntity
-from .const import DOMAIN, SMART_LIFE_DISCOVERY_NEW, DPCode, DPType
+from .const import DOMAIN, DPCode, DPType
+from .discovery import discovery_signal, iter_descriptions
+from .lanes import CommandLane
 
 
 class Mode(StrEnum):
@@ -66,22 +69,23 @@ async def async_setup_entry(
     def async_discover_device(device_ids: list[str]) -> None:
         """Discover and add a discovered Smart Life siren."""
         entities: list[SmartLifeAlarmEntity] = []
-        for device_id in device_ids:
-            device = hass_data.manager.device_map[device_id]
-            if descriptions := ALARM.get(device.category):
-                for description in descriptions:
-                    if description.key in device.status:
-                        entities.append(
-                            SmartLifeAlarmEntity(
-                                device, hass_data.manager, description
-                            )
-                        )
+        for device, description in iter_descriptions(
+            hass_data.manager.device_map, device_ids, ALARM
+        ):
+            if description.key in device.status:
+                entities.append(
+                    SmartLifeAlarmEntity(device, hass_data.manager, description)
+                )
         async_add_entities(entities)
 
-    async_discover_device([*hass_data.manager.device_map])
+    async_discover_device(
+        hass_data.discovery.async_device_ids(Platform.ALARM_CONTROL_PANEL)
+    )
 
     entry.async_on_unload(
-        async_dispatcher_connect(hass, SMART_LIFE_DISCOVERY_NEW, async_discover_device)
+        async_dispatcher_connect(
+            hass, discovery_signal(Platform.ALARM_CONTROL_PANEL), async_discover_device
+        )
     )
 
 
@@ -89,6 +93,7 @@ class SmartLifeAlarmEntity(SmartLifeEntity, AlarmControlPanelEntity):
     """Smart Life Alarm Entity."""
 
     _attr_icon = "mdi:security"
+    _command_lane = CommandLane.SECURITY
 
     def __init__(
         self,
@@ -105,13 +110,13 @@ class SmartLifeAlarmEntity(SmartLifeEntity, AlarmControlPanelEntity):
         if supported_modes := self.find_dpcode(
             description.key, dptype=DPType.ENUM, prefer_function=True
         ):
-            if Mode.HOME in supported_modes.range:
+            if Mode.HOME in supported_modes.range_set:
                 self._attr_supported_features |= AlarmControlPanelEntityFeature.ARM_HOME
 
-            if Mode.ARM in supported_modes.range:
+            if Mode.ARM in supported_modes.range_set:
                 self._attr_supported_features |= AlarmControlPanelEntityFeature.ARM_AWAY
 
-            if Mode.SOS in supported_modes.range:
+            if Mode.SOS in supported_modes.range_set:
                 self._attr_supported_features |= AlarmControlPanelEntityFeature.TRIGGER
 
     @property
@@ -121,20 +126,26 @@ class SmartLifeAlarmEntity(SmartLifeEntity, AlarmControlPanelEntity):
             return None
         return STATE_MAPPING.get(status)
 
-    def alarm_disarm(self, code: str | None = None) -> None:
+    async def async_alarm_disarm(self, code: str | None = None) -> None:
         """Send Disarm command."""
-        self._send_command(
+        await self._async_send_command(
             [{"code": self.entity_description.key, "value": Mode.DISARMED}]
         )
 
-    def alarm_arm_home(self, code: str | None = None) -> None:
+    async def async_alarm_arm_home(self, code: str | None = None) -> None:
         """Send Home command."""
-        self._send_command([{"code": self.entity_description.key, "value": Mode.HOME}])
+        await self._async_send_command(
+            [{"code": self.entity_description.key, "value": Mode.HOME}]
+        )
 
-    def alarm_arm_away(self, code: str | None = None) -> None:
+    async def async_alarm_arm_away(self, code: str | None = None) -> None:
         """Send Arm command."""
-        self._send_command([{"code": self.entity_description.key, "value": Mode.ARM}])
+        await self._async_send_command(
+            [{"code": self.entity_description.key, "value": Mode.ARM}]
+        )
 
-    def alarm_trigger(self, code: str | None = None) -> None:
+    async def async_alarm_trigger(self, code: str | None = None) -> None:
         """Send SOS command."""
-        self._send_command([{"code": self.entity_description.key, "value": Mode.SOS}])
+        await self._async_send_command(
+            [{"code": self.entity_description.key, "value": Mode.SOS}]
+        )
@@ -2,26 +2,33 @@
 from __future__ import annotations
 
 import base64
-from dataclasses import dataclass
+from collections import ChainMap
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass, field
 import json
 import struct
-from typing import Any, Literal, overload
+from typing import Any, Literal, TypeVar, overload
 
 from tuya_sharing import Manager, CustomerDevice
 from tuya_sharing.device import DeviceStatusRange
 import re
 from typing_extensions import Self
 
-from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.core import callback
 from homeassistant.helpers.entity import DeviceInfo, Entity
 
-from .const import DOMAIN, LOGGER, SMART_LIFE_HA_SIGNAL_UPDATE_ENTITY, DPCode, DPType
-from .util import remap_value
+from .commands import CommandDispatcher
+from .lanes import CommandLane
+from .const import DOMAIN, LOGGER, DPCode, DPType
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class IntegerTypeData:
-    """Integer Type Data."""
+    """Integer Type Data.
+
+    The scale factor, the scaled limits and the span of the range are computed
+    once, the type data is read on every state write.
+    """
 
     dpcode: DPCode
     min: int
@@ -30,29 +37,28 @@ class IntegerTypeData:
     step: float
     unit: str | None = None
     type: str | None = None
-
-    @property
-    def max_scaled(self) -> float:
-        """Return the max scaled."""
-        return self.scale_value(self.max)
-
-    @property
-    def min_scaled(self) -> float:
-        """Return the min scaled."""
-        return self.scale_value(self.min)
-
-    @property
-    def step_scaled(self) -> float:
-        """Return the step scaled."""
-        return self.step / (10 ** self.scale)
+    factor: float = field(init=False, repr=False, compare=False)
+    max_scaled: float = field(init=False, repr=False, compare=False)
+    min_scaled: float = field(init=False, repr=False, compare=False)
+    step_scaled: float = field(init=False, repr=False, compare=False)
+    _span: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Precompute the scaling constants."""
+        factor = 10 ** self.scale
+        object.__setattr__(self, "factor", factor)
+        object.__setattr__(self, "max_scaled", self.max / factor)
+        object.__setattr__(self, "min_scaled", self.min / factor)
+        object.__setattr__(self, "step_scaled", self.step / factor)
+        object.__setattr__(self, "_span", self.max - self.min)
 
     def scale_value(self, value: float | int) -> float:
         """Scale a value."""
-        return value / (10 ** self.scale)
+        return value / self.factor
 
     def scale_value_back(self, value: float | int) -> int:
         """Return raw value for scaled."""
-        return int(value * (10 ** self.scale))
+        return int(value * self.factor)
 
     def remap_value_to(
             self,
@@ -62,7 +68,9 @@ class IntegerTypeData:
             reverse: bool = False,
     ) -> float:
         """Remap a value from this range to a new range."""
-        return remap_value(value, self.min, self.max, to_min, to_max, reverse)
+        if reverse:
+            value = self.max - value + self.min
+        return ((value - self.min) / self._span) * (to_max - to_min) + to_min
 
     def remap_value_from(
             self,
@@ -72,7 +80,9 @@ class IntegerTypeData:
             reverse: bool = False,
     ) -> float:
         """Remap a value from its current range to this range."""
-        return remap_value(value, from_min, from_max, self.min, self.max, reverse)
+        if reverse:
+            value = from_max - value + from_min
+        return ((value - from_min) / (from_max - from_min)) * self._span + self.min
 
     @classmethod
     def from_json(cls, dpcode: DPCode, data: str) -> IntegerTypeData | None:
@@ -91,22 +101,30 @@ class IntegerTypeData:
         )
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class EnumTypeData:
-    """Enum Type Data."""
+    """Enum Type Data, the range keeps its order, range_set is for lookups."""
 
     dpcode: DPCode
-    range: list[str]
+    range: tuple[str, ...]
+    range_set: frozenset[str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Precompute the set of the range."""
+        object.__setattr__(self, "range_set", frozenset(self.range))
 
     @classmethod
     def from_json(cls, dpcode: DPCode, data: str) -> EnumTypeData | None:
         """Load JSON string and return a EnumTypeData object."""
         if not (parsed := json.loads(data)):
             return None
-        return cls(dpcode, **parsed)
+        return cls(dpcode, **(parsed | {"range": tuple(parsed["range"])}))
 
 
-@dataclass
+_RAW_ELECTRICITY = struct.Struct(">HBHBH")
+
+
+@dataclass(frozen=True, slots=True)
 class ElectricityTypeData:
     """Electricity Type Data."""
 
@@ -122,20 +140,183 @@ class ElectricityTypeData:
     @classmethod
     def from_raw(cls, data: str) -> Self:
         """Decode base64 string and return a ElectricityTypeData object."""
-        raw = base64.b64decode(data)
-        voltage = struct.unpack(">H", raw[0:2])[0] / 10.0
-        electriccurrent = struct.unpack(">L", b"\x00" + raw[2:5])[0] / 1000.0
-        power = struct.unpack(">L", b"\x00" + raw[5:8])[0] / 1000.0
+        # Voltage is 2 bytes, current and power are 3 bytes each, unpacked as
+        # their high byte and low word.
+        (
+            voltage,
+            current_high,
+            current_low,
+            power_high,
+            power_low,
+        ) = _RAW_ELECTRICITY.unpack_from(memoryview(base64.b64decode(data)))
+        voltage = voltage / 10.0
+        electriccurrent = (current_high << 16 | current_low) / 1000.0
+        power = (power_high << 16 | power_low) / 1000.0
         return cls(
             electriccurrent=str(electriccurrent), power=str(power), voltage=str(voltage)
         )
 
 
+DPTypeData = IntegerTypeData | EnumTypeData | dict[str, Any]
+
+_T = TypeVar("_T")
+
+
+@dataclass
+class _TypeDataEntry:
+    """Interned type data of a single DP code of a product."""
+
+    values: Any
+    data: dict[str, Any] = field(default_factory=dict)
+
+
+class TypeDataRegistry:
+    """Registry of parsed type data, shared by all devices of a product.
+
+    Devices of the same product describe their DP codes with identical JSON,
+    parsing it once per `(product_id, dpcode, source)` gives every entity the
+    same immutable type data instances.
+    """
+
+    def __init__(self) -> None:
+        """Init TypeDataRegistry."""
+        self._entries: dict[tuple[str, str, str], _TypeDataEntry] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def intern(
+            self,
+            product_id: str,
+            dpcode: str,
+            source: str,
+            values: Any,
+            kind: str,
+            factory: Callable[[], _T],
+    ) -> _T:
+        """Return the shared type data of a kind, creating it when needed."""
+        key = (product_id, dpcode, source)
+        entry = self._entries.get(key)
+        # Products should not change their DP description, but if one does the
+        # stale type data must not be handed out.
+        if entry is None or entry.values != values:
+            entry = self._entries[key] = _TypeDataEntry(values)
+
+        if kind in entry.data:
+            self.hits += 1
+            return entry.data[kind]
+
+        self.misses += 1
+        type_data = entry.data[kind] = factory()
+        return type_data
+
+    def as_dict(self) -> dict[str, int]:
+        """Return the registry statistics."""
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+TYPE_DATA_REGISTRY = TypeDataRegistry()
+
+
+class DeviceSchema:
+    """Compiled DP schema of a device.
+
+    Built once from the `function` and `status_range` of a device, holding the
+    DP type and the parsed value description of every DP code.
+    """
+
+    SOURCES = ("function", "status_range")
+
+    def __init__(self, device: CustomerDevice) -> None:
+        """Compile the schema of a device."""
+        self.function = device.function
+        self.status_range = device.status_range
+        self._types: dict[str, dict[str, str]] = {}
+        self._type_data: dict[str, dict[str, DPTypeData | None]] = {}
+        self._decoded: dict[str, tuple[Any, Any]] = {}
+        for source in self.SOURCES:
+            types = self._types[source] = {}
+            type_data = self._type_data[source] = {}
+            for dpcode, item in getattr(device, source).items():
+                types[dpcode] = item.type
+                type_data[dpcode] = TYPE_DATA_REGISTRY.intern(
+                    device.product_id,
+                    dpcode,
+                    source,
+                    item.values,
+                    item.type,
+                    lambda dpcode=dpcode, item=item: self._parse(
+                        dpcode, item.type, item.values
+                    ),
+                )
+
+    @staticmethod
+    def _parse(dpcode: str, dptype: str, values: Any) -> DPTypeData | None:
+        """Parse the value description of a DP code."""
+        try:
+            if dptype == DPType.INTEGER:
+                return IntegerTypeData.from_json(dpcode, values)
+            if dptype == DPType.ENUM:
+                return EnumTypeData.from_json(dpcode, values)
+            if dptype == DPType.JSON:
+                return json.loads(values) or None
+        except (KeyError, TypeError, ValueError):
+            LOGGER.debug("Invalid %s values for dpcode %s: %s", dptype, dpcode, values)
+        return None
+
+    @classmethod
+    def get(cls, device: CustomerDevice) -> DeviceSchema:
+        """Return the compiled schema of a device, compiling it when needed."""
+        schema = _DEVICE_SCHEMAS.get(device.id)
+        if (
+            schema is None
+            or schema.function is not device.function
+            or schema.status_range is not device.status_range
+        ):
+            schema = _DEVICE_SCHEMAS[device.id] = cls(device)
+        return schema
+
+    @staticmethod
+    def forget(device_ids: Iterable[str]) -> None:
+        """Drop the compiled schemas of removed or unloaded devices."""
+        for device_id in device_ids:
+            _DEVICE_SCHEMAS.pop(device_id, None)
+
+    def dptype(self, source: str, dpcode: str) -> str | None:
+        """Return the raw DP type of a DP code in a source."""
+        return self._types[source].get(dpcode)
+
+    def type_data(self, source: str, dpcode: str) -> DPTypeData | None:
+        """Return the parsed value description of a DP code in a source."""
+        return self._type_data[source].get(dpcode)
+
+    def decode(self, dpcode: str, value: Any, decoder: Callable[[Any], _T]) -> _T:
+        """Decode a DP value once, shared by all entities of the device.
+
+        Only the last value of each DP code is kept.
+        """
+        if (decoded := self._decoded.get(dpcode)) is not None and decoded[0] == value:
+            return decoded[1]
+        result = decoder(value)
+        self._decoded[dpcode] = (value, result)
+        return result
+
+
+_DEVICE_SCHEMAS: dict[str, DeviceSchema] = {}
+
+
 class SmartLifeEntity(Entity):
     """SmartLife base device."""
 
     _attr_has_entity_name = True
     _attr_should_poll = False
+    # Show commanded values before the device reports them
+    _optimistic = False
+    # Priority class of the commands of the entity
+    _command_lane = CommandLane.NORMAL
 
     def __init__(self, device: CustomerDevice, device_manager: Manager) -> None:
         """Init SmartLifeHaEntity."""
@@ -143,6 +324,10 @@ class SmartLifeEntity(Entity):
         device.set_up = True
         self.device = device
         self.device_manager = device_manager
+        self._schema = DeviceSchema.get(device)
+        # DP codes the state depends on, None to update on every change.
+        self._dpcodes: frozenset[str] | None = None
+        self._commands: CommandDispatcher | None = None
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -159,6 +344,15 @@ class SmartLifeEntity(Entity):
         """Return if the device is available."""
         return self.device.online
 
+    @property
+    def _status(self) -> Mapping[str, Any]:
+        """Return the device status, with optimistic values on top."""
+        if self._commands is not None and (
+            values := self._commands.optimistic.values(self.device.id)
+        ):
+            return ChainMap(values, self.device.status)
+        return self.device.status
+
     @overload
     def find_dpcode(
             self,
@@ -215,36 +409,22 @@ class SmartLifeEntity(Entity):
 
         for dpcode in dpcodes:
             for key in order:
-                if dpcode not in getattr(self.device, key):
+                if key == "status":
+                    if dpcode in self.device.status:
+                        return dpcode
                     continue
-                if (
-                        dptype == DPType.ENUM
-                        and getattr(self.device, key)[dpcode].type == DPType.ENUM
-                ):
-                    if not (
-                            enum_type := EnumTypeData.from_json(
-                                dpcode, getattr(self.device, key)[dpcode].values
-                            )
-                    ):
-                        continue
-                    return enum_type
-
-                LOGGER.debug("dpcode get device=%s dpcode=%s key=%s", self.device, dpcode, key)
-
-                if (
-                        dptype == DPType.INTEGER
-                        and getattr(self.device, key)[dpcode].type == DPType.INTEGER
-                ):
-                    if not (
-                            integer_type := IntegerTypeData.from_json(
-                                dpcode, getattr(self.device, key)[dpcode].values
-                            )
+
+                if (current_type := self._schema.dptype(key, dpcode)) is None:
+                    continue
+
+                if dptype in (DPType.ENUM, DPType.INTEGER):
+                    if current_type != dptype or not (
+                        type_data := self._schema.type_data(key, dpcode)
                     ):
                         continue
-                    return integer_type
+                    return type_data
 
-                if dptype not in (DPType.ENUM, DPType.INTEGER):
-                    return dpcode
+                return dpcode
 
         return None
 
@@ -259,26 +439,47 @@ class SmartLifeEntity(Entity):
         if prefer_function:
             order = ["function", "status_range"]
         for key in order:
-            if dpcode in getattr(self.device, key):
-                return DPType(getattr(self.device, key)[dpcode].type)
+            if (current_type := self._schema.dptype(key, dpcode)) is not None:
+                return DPType(current_type)
 
         return None
 
     async def async_added_to_hass(self) -> None:
         """Call when entity is added to hass."""
+        assert self.platform.config_entry
+        hass_data = self.hass.data[DOMAIN][self.platform.config_entry.entry_id]
+        self._commands = hass_data.commands
         self.async_on_remove(
-            async_dispatcher_connect(
-                self.hass,
-                f"{SMART_LIFE_HA_SIGNAL_UPDATE_ENTITY}_{self.device.id}",
-                self.async_write_ha_state,
+            hass_data.listener.router.async_register(
+                self.device.id, self._dpcodes, self._async_device_updated
             )
         )
 
-    def _send_command(self, commands: list[dict[str, Any]]) -> None:
+    @callback
+    def _async_device_updated(self) -> None:
+        """Handle an update of the DP codes the entity depends on."""
+        self.async_write_ha_state()
+
+    async def _async_send_command(self, commands: list[dict[str, Any]]) -> None:
         """Send command."""
         LOGGER.debug("Sending commands for device %s: %s", self.device.id, commands)
-        self.device_manager.send_commands(self.device.id, commands)
+        assert self._commands is not None
+        await self._commands.async_send_commands(
+            self.device.id, commands, self._optimistic, self._command_lane
+        )
+
+    async def _async_send_debounced_command(
+            self, commands: list[dict[str, Any]]
+    ) -> None:
+        """Send command of a continuous setter, like a slider."""
+        LOGGER.debug(
+            "Sending debounced commands for device %s: %s", self.device.id, commands
+        )
+        assert self._commands is not None
+        await self._commands.async_send_debounced_commands(
+            self.device.id, commands, self._optimistic
+        )
 
-    def _switch_ONOFF_via_code(self, code: str, state: bool) -> None:
+    async def _async_switch_ONOFF_via_code(self, code: str, state: bool) -> None:
         """Switch on/off via code."""
-        self._send_command([{"code": code, "value": state}])
+        await self._async_send_command([{"code": code, "value": state}])
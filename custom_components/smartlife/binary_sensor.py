@@ -11,14 +11,15 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntityDescription,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import EntityCategory
+from homeassistant.const import EntityCategory, Platform
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import HomeAssistantSmartLifeData
 from .base import SmartLifeEntity
-from .const import DOMAIN, SMART_LIFE_DISCOVERY_NEW, DPCode
+from .const import DOMAIN, DPCode
+from .discovery import discovery_signal, iter_descriptions
 
 @dataclass
 class SmartLifeBinarySensorEntityDescription(BinarySensorEntityDescription):
@@ -377,24 +378,23 @@ async def async_setup_entry(
     def async_discover_device(device_ids: list[str]) -> None:
         """Discover and add a discovered smartlife binary sensors."""
         entities: list[SmartLifeBinarySensorEntity] = []
-        for device_id in device_ids:
-            device = hass_data.manager.device_map[device_id]
-            if descriptions := BINARY_SENSORS.get(device.category):
-                for description in descriptions:
-                    dpcode = description.dpcode or description.key
-                    if dpcode in device.status:
-                        entities.append(
-                            SmartLifeBinarySensorEntity(
-                                device, hass_data.manager, description
-                            )
-                        )
+        for device, description in iter_descriptions(
+            hass_data.manager.device_map, device_ids, BINARY_SENSORS
+        ):
+            dpcode = description.dpcode or description.key
+            if dpcode in device.status:
+                entities.append(
+                    SmartLifeBinarySensorEntity(device, hass_data.manager, description)
+                )
 
         async_add_entities(entities)
 
-    async_discover_device([*hass_data.manager.device_map])
+    async_discover_device(hass_data.discovery.async_device_ids(Platform.BINARY_SENSOR))
 
     entry.async_on_unload(
-        async_dispatcher_connect(hass, SMART_LIFE_DISCOVERY_NEW, async_discover_device)
+        async_dispatcher_connect(
+            hass, discovery_signal(Platform.BINARY_SENSOR), async_discover_device
+        )
     )
 
 
@@ -412,6 +412,7 @@ class SmartLifeBinarySensorEntity(SmartLifeEntity, BinarySensorEntity):
         """Init SmartLifeBinarySensorEntity."""
         super().__init__(device, device_manager)
         self.entity_description = description
+        self._dpcodes = frozenset({description.dpcode or description.key})
         self._attr_unique_id = f"{super().unique_id}{description.key}"
 
     @property
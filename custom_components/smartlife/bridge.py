@@ -0,0 +1,192 @@
+"""Bridge of device updates from the MQ thread to the event loop."""
+from __future__ import annotations
+
+from collections.abc import Callable, Collection
+import threading
+from typing import Any
+
+from tuya_sharing import CustomerDevice
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import BRIDGE_BATCH_SIZE, BRIDGE_MAX_PENDING
+
+
+class UpdateRouter:
+    """Route device updates to the entities consuming the changed DP codes.
+
+    Entities are indexed by device ID and DP code, entities without DP codes
+    are updated on every change of their device.
+    """
+
+    def __init__(self) -> None:
+        """Init UpdateRouter."""
+        self._index: dict[str, dict[str | None, dict[CALLBACK_TYPE, None]]] = {}
+
+    @callback
+    def async_register(
+            self,
+            device_id: str,
+            dpcodes: Collection[str] | None,
+            target: CALLBACK_TYPE,
+    ) -> CALLBACK_TYPE:
+        """Register an entity update callback for DP codes of a device."""
+        device_index = self._index.setdefault(device_id, {})
+        keys: tuple[str | None, ...] = tuple(dpcodes) if dpcodes else (None,)
+        for key in keys:
+            device_index.setdefault(key, {})[target] = None
+
+        @callback
+        def async_unregister() -> None:
+            for key in keys:
+                if (targets := device_index.get(key)) is None:
+                    continue
+                targets.pop(target, None)
+                if not targets:
+                    del device_index[key]
+            if not device_index and self._index.get(device_id) is device_index:
+                del self._index[device_id]
+
+        return async_unregister
+
+    @callback
+    def async_route(self, device_id: str, dpcodes: Collection[str] | None) -> None:
+        """Update the entities of a device depending on the changed DP codes.
+
+        All entities of the device are updated when the DP codes are unknown.
+        """
+        if (device_index := self._index.get(device_id)) is None:
+            return
+
+        targets: dict[CALLBACK_TYPE, None] = {}
+        if dpcodes is None:
+            for key_targets in device_index.values():
+                targets.update(key_targets)
+        else:
+            for key in (None, *dpcodes):
+                if key_targets := device_index.get(key):
+                    targets.update(key_targets)
+
+        for target in targets:
+            target()
+
+
+class UpdateBridge:
+    """Coalesce device updates received on the MQ thread.
+
+    The status itself is in the device map, updates carry the DP codes that
+    changed since the last update, or None when unknown. Pending updates of a
+    device are merged into one, a single wakeup of the event loop drains them
+    in batches. New devices are dropped once the number of pending devices
+    reaches BRIDGE_MAX_PENDING, their next accepted update refreshes all
+    their entities.
+    """
+
+    def __init__(self, hass: HomeAssistant, router: UpdateRouter) -> None:
+        """Init UpdateBridge."""
+        self.hass = hass
+        self.router = router
+        self._lock = threading.Lock()
+        self._pending: dict[str, set[str] | None] = {}
+        self._report_listeners: list[
+            Callable[[str, Collection[str] | None], None]
+        ] = []
+        self._last_status: dict[str, tuple[bool, dict[str, Any]]] = {}
+        self._scheduled = False
+        self._received = 0
+        self._merged = 0
+        self._dropped = 0
+        self._dispatched = 0
+        self._wakeups = 0
+        self._max_pending = 0
+
+    def push(self, device: CustomerDevice) -> None:
+        """Queue an update of a device, called from the MQ thread."""
+        device_id = device.id
+        with self._lock:
+            self._received += 1
+            if device_id not in self._pending and (
+                len(self._pending) >= BRIDGE_MAX_PENDING
+            ):
+                # The changes are lost, the next update refreshes all entities.
+                self._dropped += 1
+                self._last_status.pop(device_id, None)
+                return
+            dpcodes = self._changed_dpcodes(device)
+            if device_id in self._pending:
+                self._merged += 1
+                if (pending := self._pending[device_id]) is not None:
+                    if dpcodes is None:
+                        self._pending[device_id] = None
+                    else:
+                        pending |= dpcodes
+                return
+            self._pending[device_id] = dpcodes
+            self._max_pending = max(self._max_pending, len(self._pending))
+            if self._scheduled:
+                return
+            self._scheduled = True
+            self._wakeups += 1
+
+        self.hass.loop.call_soon_threadsafe(self._async_drain)
+
+    def _changed_dpcodes(self, device: CustomerDevice) -> set[str] | None:
+        """Return the DP codes changed since the last update of a device."""
+        status = dict(device.status)
+        last = self._last_status.get(device.id)
+        self._last_status[device.id] = (device.online, status)
+        if last is None or last[0] != device.online:
+            return None
+        last_status = last[1]
+        changed = {
+            dpcode
+            for dpcode, value in status.items()
+            if dpcode not in last_status or last_status[dpcode] != value
+        }
+        # Nothing known changed, e.g. a repeated report, update all entities.
+        return changed or None
+
+    @callback
+    def async_add_report_listener(
+            self, listener: Callable[[str, Collection[str] | None], None]
+    ) -> None:
+        """Add a callback told about device reports before entities are updated."""
+        self._report_listeners.append(listener)
+
+    def forget(self, device_id: str) -> None:
+        """Forget the last status of a removed device."""
+        with self._lock:
+            self._last_status.pop(device_id, None)
+
+    @callback
+    def _async_drain(self) -> None:
+        """Dispatch a batch of pending updates."""
+        with self._lock:
+            device_ids = list(self._pending)[:BRIDGE_BATCH_SIZE]
+            updates = [
+                (device_id, self._pending.pop(device_id)) for device_id in device_ids
+            ]
+            # Leave room for other jobs before draining the rest.
+            if self._pending:
+                self.hass.loop.call_soon(self._async_drain)
+            else:
+                self._scheduled = False
+            self._dispatched += len(device_ids)
+
+        for device_id, dpcodes in updates:
+            for listener in self._report_listeners:
+                listener(device_id, dpcodes)
+            self.router.async_route(device_id, dpcodes)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters of the bridge."""
+        with self._lock:
+            return {
+                "pending": len(self._pending),
+                "max_pending": self._max_pending,
+                "received": self._received,
+                "merged": self._merged,
+                "dropped": self._dropped,
+                "dispatched": self._dispatched,
+                "wakeups": self._wakeups,
+            }
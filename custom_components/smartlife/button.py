@@ -5,14 +5,16 @@ from tuya_sharing import Manager, CustomerDevice
 
 from homeassistant.components.button import ButtonEntity, ButtonEntityDescription
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import EntityCategory
+from homeassistant.const import EntityCategory, Platform
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import HomeAssistantSmartLifeData
 from .base import SmartLifeEntity
-from .const import DOMAIN, SMART_LIFE_DISCOVERY_NEW, DPCode
+from .const import DOMAIN, LOGGER, DPCode
+from .discovery import discovery_signal, iter_descriptions
+from .lanes import CommandLane
 
 # All descriptions can be found here.
 # https://developer.tuya.com/en/docs/iot/standarddescription?id=K9i5ql6waswzq
@@ -97,23 +99,22 @@ async def async_setup_entry(
     def async_discover_device(device_ids: list[str]) -> None:
         """Discover and add a discovered smartlife buttons."""
         entities: list[SmartLifeButtonEntity] = []
-        for device_id in device_ids:
-            device = hass_data.manager.device_map[device_id]
-            if descriptions := BUTTONS.get(device.category):
-                for description in descriptions:
-                    if description.key in device.status:
-                        entities.append(
-                            SmartLifeButtonEntity(
-                                device, hass_data.manager, description
-                            )
-                        )
+        for device, description in iter_descriptions(
+            hass_data.manager.device_map, device_ids, BUTTONS
+        ):
+            if description.key in device.status:
+                entities.append(
+                    SmartLifeButtonEntity(device, hass_data.manager, description)
+                )
 
         async_add_entities(entities)
 
-    async_discover_device([*hass_data.manager.device_map])
+    async_discover_device(hass_data.discovery.async_device_ids(Platform.BUTTON))
 
     entry.async_on_unload(
-        async_dispatcher_connect(hass, SMART_LIFE_DISCOVERY_NEW, async_discover_device)
+        async_dispatcher_connect(
+            hass, discovery_signal(Platform.BUTTON), async_discover_device
+        )
     )
 
 
@@ -129,9 +130,12 @@ class SmartLifeButtonEntity(SmartLifeEntity, ButtonEntity):
         """Init smartlife button."""
         super().__init__(device, device_manager)
         self.entity_description = description
-        self._attr_unique_id = f"{super().unique_id}{description.key}"        
-    
-    def press(self) -> None:
+        self._attr_unique_id = f"{super().unique_id}{description.key}"
+        # Gate commands go ahead of queued bulk commands
+        if device.category == "qt":
+            self._command_lane = CommandLane.SECURITY
+
+    async def async_press(self) -> None:
         """Press the button."""
         # Для ворот используем команды из логов
         if self.device.category == "qt":
@@ -149,9 +153,11 @@ class SmartLifeButtonEntity(SmartLifeEntity, ButtonEntity):
             if command:
                 LOGGER.debug("Sending gate command: %s", command)
                 # В логах видно, что команды отправляются просто как имя команды, без значения
-                self._send_command([{"code": command}])
+                await self._async_send_command([{"code": command}])
             else:
                 LOGGER.error("Unknown gate command for key: %s", self.entity_description.key)
         else:
             # Для обычных кнопок используем стандартный формат
-            self._send_command([{"code": self.entity_description.key, "value": True}])
+            await self._async_send_command(
+                [{"code": self.entity_description.key, "value": True}]
+            )
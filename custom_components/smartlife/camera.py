@@ -6,13 +6,17 @@ from tuya_sharing import Manager, CustomerDevice
 from homeassistant.components import ffmpeg
 from homeassistant.components.camera import Camera as CameraEntity, CameraEntityFeature
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.setup import async_setup_component
 
 from . import HomeAssistantSmartLifeData
 from .base import SmartLifeEntity
-from .const import DOMAIN, SMART_LIFE_DISCOVERY_NEW, DPCode
+from .const import DOMAIN, LOGGER, DPCode
+from .discovery import discovery_signal
 
 # All descriptions can be found here:
 # https://developer.tuya.com/en/docs/iot/standarddescription?id=K9i5ql6waswzq
@@ -29,6 +33,9 @@ async def async_setup_entry(
     """Set up smartlife cameras dynamically through smartlife discovery."""
     hass_data: HomeAssistantSmartLifeData = hass.data[DOMAIN][entry.entry_id]
 
+    # ffmpeg is only needed for cameras, set it up along with this platform.
+    await async_setup_component(hass, ffmpeg.DOMAIN, {})
+
     @callback
     def async_discover_device(device_ids: list[str]) -> None:
         """Discover and add a discovered smartlife camera."""
@@ -40,10 +47,12 @@ async def async_setup_entry(
 
         async_add_entities(entities)
 
-    async_discover_device([*hass_data.manager.device_map])
+    async_discover_device(hass_data.discovery.async_device_ids(Platform.CAMERA))
 
     entry.async_on_unload(
-        async_dispatcher_connect(hass, SMART_LIFE_DISCOVERY_NEW, async_discover_device)
+        async_dispatcher_connect(
+            hass, discovery_signal(Platform.CAMERA), async_discover_device
+        )
     )
 
 
@@ -75,11 +84,14 @@ class SmartLifeCameraEntity(SmartLifeEntity, CameraEntity):
 
     async def stream_source(self) -> str | None:
         """Return the source of the stream."""
-        return await self.hass.async_add_executor_job(
-            self.device_manager.get_device_stream_allocate,
-            self.device.id,
-            "rtsp",
-        )
+        assert self._commands is not None
+        try:
+            return await self._commands.cloud.async_get_device_stream_allocate(
+                self.device.id, "rtsp"
+            )
+        except HomeAssistantError as err:
+            LOGGER.warning("Failed to allocate a stream of %s: %s", self.device.id, err)
+            return None
 
     async def async_camera_image(
         self, width: int | None = None, height: int | None = None
@@ -95,10 +107,14 @@ class SmartLifeCameraEntity(SmartLifeEntity, CameraEntity):
             height=height,
         )
 
-    def enable_motion_detection(self) -> None:
+    async def async_enable_motion_detection(self) -> None:
         """Enable motion detection in the camera."""
-        self._send_command([{"code": DPCode.MOTION_SWITCH, "value": True}])
+        await self._async_send_command(
+            [{"code": DPCode.MOTION_SWITCH, "value": True}]
+        )
 
-    def disable_motion_detection(self) -> None:
+    async def async_disable_motion_detection(self) -> None:
         """Disable motion detection in camera."""
-        self._send_command([{"code": DPCode.MOTION_SWITCH, "value": False}])
+        await self._async_send_command(
+            [{"code": DPCode.MOTION_SWITCH, "value": False}]
+        )
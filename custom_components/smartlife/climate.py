@@ -18,14 +18,15 @@ from homeassistant.components.climate import (
     HVACMode,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import UnitOfTemperature
+from homeassistant.const import Platform, UnitOfTemperature
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import HomeAssistantSmartLifeData
 from .base import IntegerTypeData, SmartLifeEntity
-from .const import DOMAIN, SMART_LIFE_DISCOVERY_NEW, DPCode, DPType
+from .const import DOMAIN, DPCode, DPType
+from .discovery import discovery_signal
 
 SMART_LIFE_HVAC_TO_HA = {
     "auto": HVACMode.HEAT_COOL,
@@ -109,16 +110,19 @@ async def async_setup_entry(
                 )
         async_add_entities(entities)
 
-    async_discover_device([*hass_data.manager.device_map])
+    async_discover_device(hass_data.discovery.async_device_ids(Platform.CLIMATE))
 
     entry.async_on_unload(
-        async_dispatcher_connect(hass, SMART_LIFE_DISCOVERY_NEW, async_discover_device)
+        async_dispatcher_connect(
+            hass, discovery_signal(Platform.CLIMATE), async_discover_device
+        )
     )
 
 
 class SmartLifeClimateEntity(SmartLifeEntity, ClimateEntity):
     """smartlife Climate Device."""
 
+    _optimistic = True
     _current_humidity: IntegerTypeData | None = None
     _current_temperature: IntegerTypeData | None = None
     _hvac_to_smart_life: dict[str, str]
@@ -251,7 +255,7 @@ class SmartLifeClimateEntity(SmartLifeEntity, ClimateEntity):
             prefer_function=True,
         ):
             self._attr_supported_features |= ClimateEntityFeature.FAN_MODE
-            self._attr_fan_modes = enum_type.range
+            self._attr_fan_modes = list(enum_type.range)
 
         # Determine swing modes
         if self.find_dpcode(
@@ -278,32 +282,34 @@ class SmartLifeClimateEntity(SmartLifeEntity, ClimateEntity):
         """Call when entity is added to hass."""
         await super().async_added_to_hass()
 
-    def set_hvac_mode(self, hvac_mode: HVACMode) -> None:
+    async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
         """Set new target hvac mode."""
         commands = [{"code": DPCode.SWITCH, "value": hvac_mode != HVACMode.OFF}]
         if hvac_mode in self._hvac_to_smart_life:
             commands.append(
                 {"code": DPCode.MODE, "value": self._hvac_to_smart_life[hvac_mode]}
             )
-        self._send_command(commands)
+        await self._async_send_command(commands)
 
-    def set_preset_mode(self, preset_mode):
+    async def async_set_preset_mode(self, preset_mode):
         """Set new target preset mode."""
         commands = [{"code": DPCode.MODE, "value": preset_mode}]
-        self._send_command(commands)
+        await self._async_send_command(commands)
 
-    def set_fan_mode(self, fan_mode: str) -> None:
+    async def async_set_fan_mode(self, fan_mode: str) -> None:
         """Set new target fan mode."""
-        self._send_command([{"code": DPCode.FAN_SPEED_ENUM, "value": fan_mode}])
+        await self._async_send_command(
+            [{"code": DPCode.FAN_SPEED_ENUM, "value": fan_mode}]
+        )
 
-    def set_humidity(self, humidity: int) -> None:
+    async def async_set_humidity(self, humidity: int) -> None:
         """Set new target humidity."""
         if self._set_humidity is None:
             raise RuntimeError(
                 "Cannot set humidity, device doesn't provide methods to set it"
             )
 
-        self._send_command(
+        await self._async_send_debounced_command(
             [
                 {
                     "code": self._set_humidity.dpcode,
@@ -312,11 +318,11 @@ class SmartLifeClimateEntity(SmartLifeEntity, ClimateEntity):
             ]
         )
 
-    def set_swing_mode(self, swing_mode: str) -> None:
+    async def async_set_swing_mode(self, swing_mode: str) -> None:
         """Set new target swing operation."""
         # The API accepts these all at once and will ignore the codes
         # that don't apply to the device being controlled.
-        self._send_command(
+        await self._async_send_command(
             [
                 {
                     "code": DPCode.SHAKE,
@@ -337,7 +343,7 @@ class SmartLifeClimateEntity(SmartLifeEntity, ClimateEntity):
             ]
         )
 
-    def set_temperature(self, **kwargs: Any) -> None:
+    async def async_set_temperature(self, **kwargs: Any) -> None:
         """Set new target temperature."""
         if self._set_temperature is None:
             raise RuntimeError(
@@ -345,7 +351,7 @@ class SmartLifeClimateEntity(SmartLifeEntity, ClimateEntity):
                 " set it"
             )
 
-        self._send_command(
+        await self._async_send_debounced_command(
             [
                 {
                     "code": self._set_temperature.dpcode,
@@ -362,7 +368,7 @@ class SmartLifeClimateEntity(SmartLifeEntity, ClimateEntity):
         if self._current_temperature is None:
             return None
 
-        temperature = self.device.status.get(self._current_temperature.dpcode)
+        temperature = self._status.get(self._current_temperature.dpcode)
         if temperature is None:
             return None
 
@@ -381,7 +387,7 @@ class SmartLifeClimateEntity(SmartLifeEntity, ClimateEntity):
         if self._current_humidity is None:
             return None
 
-        humidity = self.device.status.get(self._current_humidity.dpcode)
+        humidity = self._status.get(self._current_humidity.dpcode)
         if humidity is None:
             return None
 
@@ -393,7 +399,7 @@ class SmartLifeClimateEntity(SmartLifeEntity, ClimateEntity):
         if self._set_temperature is None:
             return None
 
-        temperature = self.device.status.get(self._set_temperature.dpcode)
+        temperature = self._status.get(self._set_temperature.dpcode)
         if temperature is None:
             return None
 
@@ -405,7 +411,7 @@ class SmartLifeClimateEntity(SmartLifeEntity, ClimateEntity):
         if self._set_humidity is None:
             return None
 
-        humidity = self.device.status.get(self._set_humidity.dpcode)
+        humidity = self._status.get(self._set_humidity.dpcode)
         if humidity is None:
             return None
 
@@ -416,21 +422,21 @@ class SmartLifeClimateEntity(SmartLifeEntity, ClimateEntity):
         """Return hvac mode."""
         # If the switch off, hvac mode is off as well. Unless the switch
         # the switch is on or doesn't exists of course...
-        if not self.device.status.get(DPCode.SWITCH, True):
+        if not self._status.get(DPCode.SWITCH, True):
             return HVACMode.OFF
 
         if DPCode.MODE not in self.device.function:
-            if self.device.status.get(DPCode.SWITCH, False):
+            if self._status.get(DPCode.SWITCH, False):
                 return self.entity_description.switch_only_hvac_mode
             return HVACMode.OFF
 
         if (
-            mode := self.device.status.get(DPCode.MODE)
+            mode := self._status.get(DPCode.MODE)
         ) is not None and mode in SMART_LIFE_HVAC_TO_HA:
             return SMART_LIFE_HVAC_TO_HA[mode]
 
         # If the switch is on, and the mode does not match any hvac mode.
-        if self.device.status.get(DPCode.SWITCH, False):
+        if self._status.get(DPCode.SWITCH, False):
             return self.entity_description.switch_only_hvac_mode
 
         return HVACMode.OFF
@@ -441,7 +447,7 @@ class SmartLifeClimateEntity(SmartLifeEntity, ClimateEntity):
         if DPCode.MODE not in self.device.function:
             return None
 
-        mode = self.device.status.get(DPCode.MODE)
+        mode = self._status.get(DPCode.MODE)
         if mode in SMART_LIFE_HVAC_TO_HA:
             return None
 
@@ -450,18 +456,18 @@ class SmartLifeClimateEntity(SmartLifeEntity, ClimateEntity):
     @property
     def fan_mode(self) -> str | None:
         """Return fan mode."""
-        return self.device.status.get(DPCode.FAN_SPEED_ENUM)
+        return self._status.get(DPCode.FAN_SPEED_ENUM)
 
     @property
     def swing_mode(self) -> str:
         """Return swing mode."""
         if any(
-            self.device.status.get(dpcode) for dpcode in (DPCode.SHAKE, DPCode.SWING)
+            self._status.get(dpcode) for dpcode in (DPCode.SHAKE, DPCode.SWING)
         ):
             return SWING_ON
 
-        horizontal = self.device.status.get(DPCode.SWITCH_HORIZONTAL)
-        vertical = self.device.status.get(DPCode.SWITCH_VERTICAL)
+        horizontal = self._status.get(DPCode.SWITCH_HORIZONTAL)
+        vertical = self._status.get(DPCode.SWITCH_VERTICAL)
         if horizontal and vertical:
             return SWING_BOTH
         if horizontal:
@@ -471,25 +477,25 @@ class SmartLifeClimateEntity(SmartLifeEntity, ClimateEntity):
 
         return SWING_OFF
 
-    def turn_on(self) -> None:
+    async def async_turn_on(self) -> None:
         """Turn the device on, retaining current HVAC (if supported)."""
         if DPCode.SWITCH in self.device.function:
-            self._send_command([{"code": DPCode.SWITCH, "value": True}])
+            await self._async_send_command([{"code": DPCode.SWITCH, "value": True}])
             return
 
         # Fake turn on
         for mode in (HVACMode.HEAT_COOL, HVACMode.HEAT, HVACMode.COOL):
             if mode not in self.hvac_modes:
                 continue
-            self.set_hvac_mode(mode)
+            await self.async_set_hvac_mode(mode)
             break
 
-    def turn_off(self) -> None:
+    async def async_turn_off(self) -> None:
         """Turn the device on, retaining current HVAC (if supported)."""
         if DPCode.SWITCH in self.device.function:
-            self._send_command([{"code": DPCode.SWITCH, "value": False}])
+            await self._async_send_command([{"code": DPCode.SWITCH, "value": False}])
             return
 
         # Fake turn off
         if HVACMode.OFF in self.hvac_modes:
-            self.set_hvac_mode(HVACMode.OFF)
+            await self.async_set_hvac_mode(HVACMode.OFF)
@@ -0,0 +1,324 @@
+"""Asyncio client of the Smart Life cloud."""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import time
+from typing import Any, Literal
+import uuid
+
+import aiohttp
+from tuya_sharing import (
+    CustomerDevice,
+    DeviceFunction,
+    DeviceStatusRange,
+    Manager,
+    SharingScene,
+)
+# The request signing and encryption helpers are private to the SDK, the SDK
+# is pinned to an exact version in manifest.json. Check them when bumping it.
+from tuya_sharing.customerapi import (
+    _aes_gcm_encrypt,
+    _aex_gcm_decrypt,
+    _form_to_json,
+    _restful_sign,
+    _secret_generating,
+)
+from tuya_sharing.home import SmartLifeHome
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .const import CLOUD_CONNECTIONS, CLOUD_TIMEOUT
+from .executor import BlockingExecutor
+
+
+class SmartLifeCloud:
+    """Call the Smart Life cloud on the event loop.
+
+    Requests are signed and encrypted like the blocking client of the SDK,
+    but go through the aiohttp session of Home Assistant, which keeps the
+    connections to the endpoint alive. At most CLOUD_CONNECTIONS requests
+    are in flight. The token is shared with the SDK client, which is still
+    used by the MQ and refreshes the token.
+    """
+
+    def __init__(
+            self, hass: HomeAssistant, manager: Manager, executor: BlockingExecutor
+    ) -> None:
+        """Init SmartLifeCloud."""
+        self.hass = hass
+        self.manager = manager
+        self.executor = executor
+        self._session = async_get_clientsession(hass)
+        self._connections = asyncio.Semaphore(CLOUD_CONNECTIONS)
+        self._refresh_lock = asyncio.Lock()
+        self._timeout = aiohttp.ClientTimeout(total=CLOUD_TIMEOUT)
+
+    async def async_get(
+            self, path: str, params: dict[str, Any] | None = None
+    ) -> dict[str, Any] | None:
+        """Send a GET request."""
+        await self._async_refresh_token_if_needed()
+        return await self._async_request("GET", path, params, None)
+
+    async def async_post(
+            self,
+            path: str,
+            params: dict[str, Any] | None = None,
+            body: dict[str, Any] | None = None,
+    ) -> dict[str, Any] | None:
+        """Send a POST request."""
+        await self._async_refresh_token_if_needed()
+        return await self._async_request("POST", path, params, body)
+
+    async def _async_request(
+            self,
+            method: str,
+            path: str,
+            params: dict[str, Any] | None,
+            body: dict[str, Any] | None,
+    ) -> dict[str, Any] | None:
+        """Sign, encrypt and send a request, returns the decrypted response."""
+        api = self.manager.customer_api
+        rid = str(uuid.uuid4())
+        sid = ""
+        hash_key = hashlib.md5(
+            (rid + api.token_info.refresh_token).encode("utf-8")
+        ).hexdigest()
+        secret = _secret_generating(rid, sid, hash_key)
+
+        query_encdata = ""
+        if params:
+            query_encdata = str(
+                _aes_gcm_encrypt(_form_to_json(params), secret), encoding="utf8"
+            )
+            params = {"encdata": query_encdata}
+        body_encdata = ""
+        if body:
+            body_encdata = str(
+                _aes_gcm_encrypt(_form_to_json(body), secret), encoding="utf8"
+            )
+            body = {"encdata": body_encdata}
+
+        headers = {
+            "X-appKey": api.client_id,
+            "X-requestId": rid,
+            "X-sid": sid,
+            "X-time": str(int(time.time() * 1000)),
+        }
+        if api.token_info is not None and api.token_info.access_token:
+            headers["X-token"] = api.token_info.access_token
+        headers["X-sign"] = _restful_sign(hash_key, query_encdata, body_encdata, headers)
+
+        async with self._connections, self._session.request(
+            method,
+            api.endpoint + path,
+            params=params,
+            json=body,
+            headers=headers,
+            timeout=self._timeout,
+        ) as response:
+            if not response.ok:
+                # Raised like a failed request, so the callers revert their
+                # optimistic state and report the failure.
+                raise HomeAssistantError(
+                    f"response error:({response.status}) {await response.text()}"
+                )
+            ret = await response.json(content_type=None)
+
+        if not ret.get("success"):
+            raise HomeAssistantError(f"network error:({ret['code']}) {ret['msg']}")
+
+        result = _aex_gcm_decrypt(ret.get("result"), secret)
+        try:
+            ret["result"] = json.loads(result)
+        except ValueError:
+            ret["result"] = result
+        return ret
+
+    async def _async_refresh_token_if_needed(self) -> None:
+        """Refresh the access token a minute before it expires.
+
+        The refresh runs on the SDK client, which owns the token and guards
+        it against the refresh of its own threads.
+        """
+        if not self._token_expiring():
+            return
+        async with self._refresh_lock:
+            if self._token_expiring():
+                await self.executor.async_run(
+                    self.manager.customer_api.refresh_access_token_if_need
+                )
+
+    def _token_expiring(self) -> bool:
+        """Return if the access token expires within a minute."""
+        expire_time = self.manager.customer_api.token_info.expire_time
+        return expire_time - 60 * 1000 <= int(time.time() * 1000)
+
+    async def async_query_homes(self) -> list[SmartLifeHome]:
+        """Query the homes of the user."""
+        response = await self.async_get("/v1.0/m/life/users/homes")
+        if not response or not response.get("success"):
+            return []
+        return [
+            SmartLifeHome(str(home["ownerId"]), home["name"])
+            for home in response["result"]
+        ]
+
+    async def async_query_devices_by_home(
+            self, home_id: str, details: bool = True
+    ) -> list[CustomerDevice]:
+        """Query the devices of a home, with their specifications if details."""
+        response = await self.async_get(
+            "/v1.0/m/life/ha/home/devices", {"homeId": home_id}
+        )
+        if not response or not response.get("success"):
+            return []
+
+        devices = []
+        for item in response["result"]:
+            device = CustomerDevice(**item)
+            device.status = {
+                item_status["code"]: item_status["value"]
+                for item_status in device.status
+                if "code" in item_status and "value" in item_status
+            }
+            devices.append(device)
+
+        if details:
+            await asyncio.gather(
+                *(self.async_update_device_details(device) for device in devices)
+            )
+        return devices
+
+    async def async_query_device_status(
+            self, device_ids: list[str]
+    ) -> list[dict[str, Any]]:
+        """Query the online state and status of devices, without specifications."""
+        response = await self.async_get(
+            "/v1.0/m/life/ha/devices/detail", {"devIds": ",".join(device_ids)}
+        )
+        if not response or not response.get("success"):
+            return []
+        return response["result"]
+
+    async def async_update_device_details(self, device: CustomerDevice) -> None:
+        """Query the specification and local strategy of a device."""
+        await asyncio.gather(
+            self._async_update_device_specification(device),
+            self._async_update_device_strategy_info(device),
+        )
+
+    async def _async_update_device_specification(self, device: CustomerDevice) -> None:
+        """Query the functions and status ranges of a device."""
+        response = await self.async_get(f"/v1.1/m/life/{device.id}/specifications")
+        if not response or not response.get("success"):
+            return
+        result = response.get("result", {})
+        device.function = {
+            function["code"]: DeviceFunction(**function)
+            for function in result["functions"]
+        }
+        device.status_range = {
+            status["code"]: DeviceStatusRange(**status) for status in result["status"]
+        }
+
+    async def _async_update_device_strategy_info(self, device: CustomerDevice) -> None:
+        """Query how the local status of a device maps to DP codes."""
+        response = await self.async_get(f"/v1.0/m/life/devices/{device.id}/status")
+        if not response or not response.get("success"):
+            return
+        result = response.get("result", {})
+        pid = result["productKey"]
+        dp_id_map = {}
+        support_local = True
+        for dp_status_relation in result["dpStatusRelationDTOS"]:
+            if not dp_status_relation["supportLocal"]:
+                support_local = False
+                break
+            dp_id_map[dp_status_relation["dpId"]] = {
+                "value_convert": dp_status_relation["valueConvert"],
+                "status_code": dp_status_relation["statusCode"],
+                "config_item": {
+                    "statusFormat": dp_status_relation["statusFormat"],
+                    "valueDesc": dp_status_relation["valueDesc"],
+                    "valueType": dp_status_relation["valueType"],
+                    "enumMappingMap": dp_status_relation["enumMappingMap"],
+                    "pid": pid,
+                },
+            }
+        device.support_local = support_local
+        if support_local:
+            device.local_strategy = dp_id_map
+
+    async def async_send_commands(
+            self, device_id: str, commands: list[dict[str, Any]]
+    ) -> None:
+        """Send commands to a device, unless they repeat the previous ones.
+
+        The duplicate filter of the SDK device repository is kept, a request
+        repeating the previous one of the device within 10 seconds is dropped.
+        """
+        if self.manager.device_repository.filter.call(device_id, commands):
+            await self.async_post(
+                f"/v1.1/m/thing/{device_id}/commands", None, {"commands": commands}
+            )
+
+    async def async_resend_commands(
+            self, device_id: str, commands: list[dict[str, Any]]
+    ) -> None:
+        """Send commands to a device, bypassing the duplicate filter."""
+        await self.async_post(
+            f"/v1.1/m/thing/{device_id}/commands", None, {"commands": commands}
+        )
+
+    async def async_query_scenes(self, home_ids: list[str]) -> list[SharingScene]:
+        """Query the scenes of homes."""
+        scenes = []
+        for home_id in home_ids:
+            response = await self.async_get(
+                "/v1.0/m/scene/ha/home/scenes", {"homeId": home_id}
+            )
+            if not response or not response.get("success"):
+                continue
+            for item in response["result"]:
+                scene = SharingScene(**item)
+                scene.home_id = home_id
+                scenes.append(scene)
+        return scenes
+
+    async def async_trigger_scene(self, home_id: str, scene_id: str) -> None:
+        """Trigger a scene of a home."""
+        await self.async_post(
+            "/v1.0/m/scene/ha/trigger", None, {"homeId": home_id, "sceneId": scene_id}
+        )
+
+    async def async_get_device_stream_allocate(
+            self, device_id: str, stream_type: Literal["flv", "hls", "rtmp", "rtsp"]
+    ) -> str | None:
+        """Return the live stream URL of a camera."""
+        response = await self.async_post(
+            f"/v1.0/m/ipc/{device_id}/stream/actions/allocate",
+            None,
+            {"type": stream_type},
+        )
+        if response and response.get("success"):
+            return response["result"]["url"]
+        return None
+
+    async def async_report_version(
+            self, system_version: str, ty_plugin_version: str, ty_sdk_version: str
+    ) -> None:
+        """Report the versions of Home Assistant, the integration and the SDK."""
+        await self.async_post(
+            "/v1.0/m/life/home-assistant/qrcode/versions",
+            None,
+            {
+                "system_version": system_version,
+                "ty_plugin_version": ty_plugin_version,
+                "ty_sdk_version": ty_sdk_version,
+            },
+        )
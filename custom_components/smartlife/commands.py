@@ -0,0 +1,355 @@
+"""Command dispatching for smartlife."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import partial
+import time
+from typing import Any
+
+from tuya_sharing import Manager
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .acks import AckTracker
+from .bridge import UpdateRouter
+from .cloud import SmartLifeCloud
+from .const import (
+    CONF_COMMAND_WINDOW,
+    CONF_DEBOUNCE_DELAY,
+    CONF_DEBOUNCE_LEADING,
+    DEFAULT_COMMAND_WINDOW,
+    DEFAULT_DEBOUNCE_DELAY,
+    LOGGER,
+)
+from .executor import DeviceSerializer
+from .lanes import CommandLane, CommandLanes
+from .optimistic import OptimisticOverlay
+
+_UNSET = object()
+
+
+@dataclass
+class _CommandBatch:
+    """Commands of a device waiting for the end of the coalescing window."""
+
+    future: asyncio.Future[None]
+    commands: dict[str, dict[str, Any]] = field(default_factory=dict)
+    cancel_flush: CALLBACK_TYPE | None = None
+
+
+@dataclass
+class _Debounce:
+    """Latest values of a device waiting for the input to settle."""
+
+    values: dict[str, Any] = field(default_factory=dict)
+    sent: dict[str, Any] = field(default_factory=dict)
+    cancel_send: CALLBACK_TYPE | None = None
+
+
+class CommandDispatcher:
+    """Send the commands of the entities of a config entry.
+
+    With a coalescing window configured, commands of a device issued within
+    the window are merged into a single request, the last value of each DP
+    code wins. Without a window commands are sent right away.
+
+    Continuous setters like sliders can be debounced, the latest values of a
+    device are sent as one request once the input settled, optionally along
+    with the first values.
+
+    Commanded values can be shown optimistically until the device reports
+    them, they are reverted when sending fails. Sent commands are tracked
+    until the device acknowledges them.
+
+    Commands are sent through priority lanes, security commands skip the
+    coalescing window and go ahead of the queued commands of other lanes.
+    The requests of a device are sent one at a time, in order.
+    """
+
+    def __init__(
+            self,
+            hass: HomeAssistant,
+            entry: ConfigEntry,
+            manager: Manager,
+            cloud: SmartLifeCloud,
+            router: UpdateRouter,
+    ) -> None:
+        """Init CommandDispatcher."""
+        self.hass = hass
+        self.entry = entry
+        self.manager = manager
+        self.cloud = cloud
+        self.router = router
+        self.optimistic = OptimisticOverlay(hass, manager, router)
+        self.acks = AckTracker(hass, manager, self._async_resend)
+        self.lanes = CommandLanes(hass)
+        self.devices = DeviceSerializer()
+        self._batches: dict[str, _CommandBatch] = {}
+        self._debounces: dict[str, _Debounce] = {}
+        self._batch_sizes: dict[int, int] = {}
+        self._last_sent: dict[str, float] = {}
+        self._merged = 0
+        self._debounced = 0
+
+    @property
+    def window(self) -> float:
+        """Return the coalescing window in seconds, 0 when disabled."""
+        return self.entry.options.get(CONF_COMMAND_WINDOW, DEFAULT_COMMAND_WINDOW) / 1000
+
+    @property
+    def debounce_delay(self) -> float:
+        """Return the debounce delay in seconds, 0 when disabled."""
+        return self.entry.options.get(CONF_DEBOUNCE_DELAY, DEFAULT_DEBOUNCE_DELAY) / 1000
+
+    async def async_send_commands(
+            self,
+            device_id: str,
+            commands: list[dict[str, Any]],
+            optimistic: bool = False,
+            lane: CommandLane = CommandLane.NORMAL,
+    ) -> None:
+        """Send commands to a device, merged with those of the window."""
+        if optimistic:
+            self.optimistic.async_apply(device_id, commands)
+        try:
+            await self._async_send_commands(device_id, commands, lane)
+        except Exception:
+            if optimistic:
+                self.optimistic.async_revert(
+                    device_id,
+                    [command["code"] for command in commands if "value" in command],
+                )
+            raise
+
+    async def _async_send_commands(
+            self,
+            device_id: str,
+            commands: list[dict[str, Any]],
+            lane: CommandLane = CommandLane.NORMAL,
+    ) -> None:
+        """Send commands to a device, merged with those of the window."""
+        if lane is CommandLane.SECURITY or not (window := self.window):
+            await self._async_send(device_id, commands, lane)
+            return
+
+        if (batch := self._batches.get(device_id)) is None:
+            batch = self._batches[device_id] = _CommandBatch(
+                self.hass.loop.create_future()
+            )
+            batch.cancel_flush = async_call_later(
+                self.hass, window, partial(self._async_flush, device_id)
+            )
+        else:
+            self._merged += 1
+
+        for command in commands:
+            # Last write wins, the DP code moves to the end of the batch. The
+            # whole command is kept, some have no value, e.g. the gate opener.
+            batch.commands.pop(command["code"], None)
+            batch.commands[command["code"]] = command
+
+        await asyncio.shield(batch.future)
+
+    async def async_send_bulk(
+            self, device_commands: Iterable[tuple[str, list[dict[str, Any]]]]
+    ) -> dict[str, dict[str, Any]]:
+        """Send commands to many devices at once, returns the result per device.
+
+        Commands of the same device are merged, the last value of each DP code
+        wins. Each device is one request, the requests share the command
+        slots so their concurrency stays bounded.
+        """
+        merged: dict[str, dict[str, dict[str, Any]]] = {}
+        for device_id, commands in device_commands:
+            values = merged.setdefault(device_id, {})
+            for command in commands:
+                # The whole command is kept, some have no value.
+                values.pop(command["code"], None)
+                values[command["code"]] = command
+
+        async def _async_send_device(
+                device_id: str, values: dict[str, dict[str, Any]]
+        ) -> dict[str, Any]:
+            start = time.monotonic()
+            try:
+                await self._async_send(device_id, list(values.values()))
+            except Exception as err:  # pylint: disable=broad-except
+                return {
+                    "success": False,
+                    "error": str(err),
+                    "elapsed": round(time.monotonic() - start, 3),
+                }
+            return {"success": True, "elapsed": round(time.monotonic() - start, 3)}
+
+        results = await asyncio.gather(
+            *(
+                _async_send_device(device_id, values)
+                for device_id, values in merged.items()
+            )
+        )
+        return dict(zip(merged, results))
+
+    async def async_send_debounced_commands(
+            self,
+            device_id: str,
+            commands: list[dict[str, Any]],
+            optimistic: bool = False,
+    ) -> None:
+        """Send commands of a continuous setter, debounced when configured."""
+        if not self.debounce_delay:
+            await self.async_send_commands(device_id, commands, optimistic)
+            return
+
+        self._async_debounce(device_id, commands)
+
+    @callback
+    def _async_debounce(self, device_id: str, commands: list[dict[str, Any]]) -> None:
+        """Send the latest values of a device as one request once the input settled."""
+        delay = self.debounce_delay
+        leading = self.entry.options.get(CONF_DEBOUNCE_LEADING, False)
+        self.optimistic.async_apply(device_id, commands)
+
+        if (debounce := self._debounces.get(device_id)) is None:
+            debounce = self._debounces[device_id] = _Debounce()
+            if leading:
+                debounce.sent = {
+                    command["code"]: command["value"] for command in commands
+                }
+                self._async_send_in_background(device_id, commands)
+                commands = []
+        else:
+            self._debounced += 1
+        for command in commands:
+            debounce.values.pop(command["code"], None)
+            debounce.values[command["code"]] = command["value"]
+
+        # Each new value restarts the delay.
+        if debounce.cancel_send is not None:
+            debounce.cancel_send()
+        debounce.cancel_send = async_call_later(
+            self.hass, delay, partial(self._async_send_debounced, device_id)
+        )
+
+    @callback
+    def _async_send_debounced(self, device_id: str, _: datetime | None = None) -> None:
+        """Send the latest values of a device, except those already sent."""
+        if (debounce := self._debounces.pop(device_id, None)) is None:
+            return
+        if debounce.cancel_send is not None:
+            debounce.cancel_send()
+        commands = [
+            {"code": code, "value": value}
+            for code, value in debounce.values.items()
+            if debounce.sent.get(code, _UNSET) != value
+        ]
+        if commands:
+            self._async_send_in_background(device_id, commands)
+
+    @callback
+    def _async_send_in_background(
+            self, device_id: str, commands: list[dict[str, Any]]
+    ) -> None:
+        """Send commands without a caller waiting for the result."""
+
+        async def _async_send() -> None:
+            try:
+                await self._async_send_commands(device_id, commands)
+            except Exception as err:  # pylint: disable=broad-except
+                LOGGER.warning(
+                    "Failed to send commands to device %s: %s", device_id, err
+                )
+                self.optimistic.async_revert(
+                    device_id, [command["code"] for command in commands]
+                )
+
+        self.hass.async_create_task(_async_send())
+
+    @callback
+    def _async_flush(self, device_id: str, _: datetime | None = None) -> None:
+        """Send the pending commands of a device."""
+        if (batch := self._batches.pop(device_id, None)) is None:
+            return
+        if batch.cancel_flush is not None:
+            batch.cancel_flush()
+        self.hass.async_create_task(self._async_send_batch(device_id, batch))
+
+    async def _async_send_batch(self, device_id: str, batch: _CommandBatch) -> None:
+        """Send a batch and resolve the future its callers wait on."""
+        try:
+            await self._async_send(device_id, list(batch.commands.values()))
+        except Exception as err:  # pylint: disable=broad-except
+            batch.future.set_exception(err)
+        else:
+            batch.future.set_result(None)
+
+    async def _async_send(
+            self,
+            device_id: str,
+            commands: list[dict[str, Any]],
+            lane: CommandLane = CommandLane.NORMAL,
+    ) -> None:
+        """Send commands to a device in a lane."""
+        self._count_batch(len(commands))
+        self._last_sent[device_id] = time.monotonic()
+        LOGGER.debug("Sending %s commands to device %s", len(commands), device_id)
+        self.acks.async_sent(device_id, commands)
+        try:
+            async with self.devices.async_lock(device_id):
+                await self.lanes.async_run(
+                    lane, self.cloud.async_send_commands, device_id, commands
+                )
+        except Exception:
+            self.acks.async_discard(
+                device_id, [command["code"] for command in commands]
+            )
+            raise
+
+    async def _async_resend(self, device_id: str, commands: list[dict[str, Any]]) -> None:
+        """Resend unacknowledged commands to a device.
+
+        The duplicate filter drops a request repeating the previous one of the
+        device within 10 seconds, which is exactly what a resend is, so it is
+        bypassed.
+        """
+        self._count_batch(len(commands))
+        async with self.devices.async_lock(device_id):
+            await self.lanes.async_run(
+                CommandLane.NORMAL, self.cloud.async_resend_commands, device_id, commands
+            )
+
+    @callback
+    def last_sent(self, device_id: str) -> float | None:
+        """Return the monotonic time commands were last sent to a device."""
+        return self._last_sent.get(device_id)
+
+    def _count_batch(self, size: int) -> None:
+        """Count a request of a batch size."""
+        self._batch_sizes[size] = self._batch_sizes.get(size, 0) + 1
+
+    @callback
+    def async_flush(self) -> None:
+        """Send all pending commands now."""
+        for device_id in list(self._debounces):
+            self._async_send_debounced(device_id)
+        for device_id in list(self._batches):
+            self._async_flush(device_id)
+
+    @callback
+    def as_dict(self) -> dict[str, Any]:
+        """Return the state of the dispatcher."""
+        return {
+            "window": self.window,
+            "pending": len(self._batches),
+            "merged": self._merged,
+            "debounce_delay": self.debounce_delay,
+            "debouncing": len(self._debounces),
+            "debounced": self._debounced,
+            "batch_sizes": dict(sorted(self._batch_sizes.items())),
+            "optimistic": self.optimistic.as_dict(),
+            "lanes": self.lanes.as_dict(),
+        }
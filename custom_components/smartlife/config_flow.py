@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 from homeassistant import config_entries
+from homeassistant.core import callback
 import voluptuous as vol
 from io import BytesIO
 from tuya_sharing import LoginControl
@@ -11,8 +12,21 @@ from .const import (
     CONF_USER_CODE,
     LOGGER,
     CONF_CLIENT_ID,
-    CONF_SCHEMA
-
+    CONF_SCHEMA,
+    CONF_UNIQUE_ID_VERSION,
+    UNIQUE_ID_VERSION,
+    CONF_COMMAND_WINDOW,
+    DEFAULT_COMMAND_WINDOW,
+    MAX_COMMAND_WINDOW,
+    CONF_DEBOUNCE_DELAY,
+    CONF_DEBOUNCE_LEADING,
+    DEFAULT_DEBOUNCE_DELAY,
+    MAX_DEBOUNCE_DELAY,
+    CONF_EXECUTOR_WORKERS,
+    DEFAULT_EXECUTOR_WORKERS,
+    MAX_EXECUTOR_WORKERS,
+    CONF_SIGNIFICANCE_FILTER,
+    DEFAULT_SIGNIFICANCE_FILTER,
 )
 
 APP_QR_CODE_HEADER = "tuyaSmart--qrLogin?token="
@@ -27,6 +41,14 @@ class SmartlifeConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         self._qr_code: str | None = None
         self.login_control = LoginControl()
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> SmartlifeOptionsFlow:
+        """Get the options flow for this handler."""
+        return SmartlifeOptionsFlow(config_entry)
+
     async def async_step_user(self, user_input=None):
         """Step user."""
         errors = {}
@@ -92,7 +114,8 @@ class SmartlifeConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     "user_code": self._user_code,
                     "token_info": token_info,
                     "terminal_id": info.get("terminal_id"),
-                    "endpoint": info.get("endpoint")
+                    "endpoint": info.get("endpoint"),
+                    CONF_UNIQUE_ID_VERSION: UNIQUE_ID_VERSION,
                 }
             )
 
@@ -108,6 +131,62 @@ class SmartlifeConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         )
 
 
+class SmartlifeOptionsFlow(config_entries.OptionsFlow):
+    """smartlife Options Flow."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize the options flow."""
+        self.config_entry = config_entry
+
+    async def async_step_init(self, user_input=None):
+        """Step init."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_COMMAND_WINDOW,
+                        default=options.get(
+                            CONF_COMMAND_WINDOW, DEFAULT_COMMAND_WINDOW
+                        ),
+                    ): vol.All(
+                        vol.Coerce(int), vol.Range(min=0, max=MAX_COMMAND_WINDOW)
+                    ),
+                    vol.Required(
+                        CONF_DEBOUNCE_DELAY,
+                        default=options.get(
+                            CONF_DEBOUNCE_DELAY, DEFAULT_DEBOUNCE_DELAY
+                        ),
+                    ): vol.All(
+                        vol.Coerce(int), vol.Range(min=0, max=MAX_DEBOUNCE_DELAY)
+                    ),
+                    vol.Required(
+                        CONF_DEBOUNCE_LEADING,
+                        default=options.get(CONF_DEBOUNCE_LEADING, False),
+                    ): bool,
+                    vol.Required(
+                        CONF_EXECUTOR_WORKERS,
+                        default=options.get(
+                            CONF_EXECUTOR_WORKERS, DEFAULT_EXECUTOR_WORKERS
+                        ),
+                    ): vol.All(
+                        vol.Coerce(int), vol.Range(min=1, max=MAX_EXECUTOR_WORKERS)
+                    ),
+                    vol.Required(
+                        CONF_SIGNIFICANCE_FILTER,
+                        default=options.get(
+                            CONF_SIGNIFICANCE_FILTER, DEFAULT_SIGNIFICANCE_FILTER
+                        ),
+                    ): bool,
+                }
+            ),
+        )
+
+
 def _generate_qr_code(data: str) -> str:
     """Generate a base64 PNG string represent QR Code image of data."""
     import pyqrcode  # pylint: disable=import-outside-toplevel
@@ -35,11 +35,79 @@ CONF_ENDPOINT = "endpoint"
 CONF_USER_CODE = "user_code"
 CONF_CLIENT_ID = "HA_3y9q4ak7g4ephrvke"
 CONF_SCHEMA = "haauthorize"
+CONF_UNIQUE_ID_VERSION = "unique_id_version"
+CONF_COMMAND_WINDOW = "command_window"
+
+# Commands are not coalesced by default, the window is in milliseconds
+DEFAULT_COMMAND_WINDOW = 0
+MAX_COMMAND_WINDOW = 2000
+CONF_DEBOUNCE_DELAY = "debounce_delay"
+CONF_DEBOUNCE_LEADING = "debounce_leading"
+CONF_EXECUTOR_WORKERS = "executor_workers"
+CONF_SIGNIFICANCE_FILTER = "significance_filter"
+
+# Continuous setters are not debounced by default, the delay is in milliseconds
+DEFAULT_DEBOUNCE_DELAY = 0
+MAX_DEBOUNCE_DELAY = 5000
+
+# Threads running the blocking SDK calls of a config entry
+DEFAULT_EXECUTOR_WORKERS = 2
+MAX_EXECUTOR_WORKERS = 8
+
+# Insignificant changes of measurement sensors are written unless enabled
+DEFAULT_SIGNIFICANCE_FILTER = False
+
+# Seconds to wait for a device to report a commanded value before reverting it
+OPTIMISTIC_TIMEOUT = 10
+
+# Seconds to wait for a device to acknowledge a command before resending it
+ACK_TIMEOUT = 5
+# Resends of an unacknowledged idempotent command before it is flagged lost
+ACK_MAX_RETRIES = 1
+# Upper bounds in seconds of the command round trip histogram buckets
+ACK_RTT_BUCKETS = (0.25, 0.5, 1.0, 2.0, 5.0)
 
 
 SMART_LIFE_DISCOVERY_NEW = "smartlife_discovery_new"
 SMART_LIFE_HA_SIGNAL_UPDATE_ENTITY = "smartlife_entry_update"
 
+# Seconds to wait before retrying a failed background device refresh
+REFRESH_RETRY_INTERVAL = 60
+
+# Maximum number of concurrent requests to the cloud of a config entry
+CLOUD_CONNECTIONS = 8
+# Seconds before a request to the cloud times out
+CLOUD_TIMEOUT = 10
+
+# Maximum number of concurrent command requests of a config entry
+COMMAND_SLOTS = 4
+
+# Seconds between two probes of the MQ connection
+MQ_WATCHDOG_INTERVAL = 30
+# Seconds without any MQ message after which the connection is renewed
+MQ_STALE_TIMEOUT = 3600
+# Bounds in seconds of the backoff between two MQ reconnection attempts
+MQ_BACKOFF_MIN = 5
+MQ_BACKOFF_MAX = 300
+
+# Seconds between two runs of the polling fallback while the MQ is down
+POLL_TICK = 5
+# Seconds between two polls of active, regular and idle devices
+POLL_ACTIVE_INTERVAL = 15
+POLL_INTERVAL = 60
+POLL_IDLE_INTERVAL = 600
+# Seconds a device stays active after a command or a polled change
+POLL_ACTIVE_WINDOW = 300
+# Maximum number of polling requests per minute of a config entry
+POLL_BUDGET = 30
+# Devices queried per polling request
+POLL_BATCH_SIZE = 20
+
+# Maximum number of devices with a pending update from the MQ thread
+BRIDGE_MAX_PENDING = 1024
+# Maximum number of device updates dispatched per event loop iteration
+BRIDGE_BATCH_SIZE = 64
+
 
 PLATFORMS = [
     Platform.ALARM_CONTROL_PANEL,
@@ -60,6 +128,62 @@ PLATFORMS = [
     Platform.VACUUM,
 ]
 
+# Device categories each platform may provide entities for, scenes are not
+# bound to devices and are not listed.
+PLATFORM_CATEGORIES: dict[Platform, frozenset[str]] = {
+    Platform.ALARM_CONTROL_PANEL: frozenset({"mal"}),
+    Platform.BINARY_SENSOR: frozenset(
+        {
+            "co2bj", "cobj", "cwwsq", "dgnbj", "hps", "jqbj", "jwbj", "ldcg", "mc",
+            "mcs", "mk", "pir", "pm2.5", "qt", "rqbj", "sj", "sos", "voc", "wkf",
+            "wsdcg", "ylcg", "ywbj", "zd",
+        }
+    ),
+    Platform.BUTTON: frozenset({"hxd", "qt", "sd"}),
+    Platform.CAMERA: frozenset({"sp"}),
+    Platform.CLIMATE: frozenset({"kt", "qn", "rs", "wk", "wkf"}),
+    Platform.COVER: frozenset({"ckmkzq", "cl", "clkg", "jdcljqr"}),
+    Platform.FAN: frozenset({"cs", "fs", "fsd", "fskg", "kj"}),
+    Platform.HUMIDIFIER: frozenset({"cs", "jsq"}),
+    Platform.LIGHT: frozenset(
+        {
+            "clkg", "cz", "dc", "dd", "dj", "fs", "fsd", "fwd", "gyd", "hxd", "jsq",
+            "kg", "kt", "mbd", "pc", "qjdcz", "qn", "sp", "tgkg", "tgq", "tyndj", "xdd",
+            "ykq",
+        }
+    ),
+    Platform.NUMBER: frozenset(
+        {
+            "bh", "cwwsq", "dgnbj", "fs", "hps", "jsq", "kfj", "mzj", "sd", "sgbj",
+            "sp", "szjqr", "tgkg", "tgq", "zd",
+        }
+    ),
+    Platform.SELECT: frozenset(
+        {
+            "cl", "cs", "cz", "dgnbj", "fs", "jsq", "kfj", "kg", "kj", "pc", "qn", "sd",
+            "sgbj", "sp", "szjqr", "tdq", "tgkg", "tgq",
+        }
+    ),
+    Platform.SENSOR: frozenset(
+        {
+            "bh", "cl", "co2bj", "cobj", "cs", "cwwsq", "cz", "dgnbj", "dlq", "fs",
+            "hjjcy", "jqbj", "jsq", "jwbj", "kg", "kj", "ldcg", "mc", "mcs", "mzj",
+            "pc", "pir", "pm2.5", "qn", "qt", "rqbj", "sd", "sj", "sos", "sp", "szjqr",
+            "tdq", "tyndj", "voc", "wkcz", "wkf", "wnykq", "wsdcg", "wxkg", "ylcg",
+            "ywbj", "zd", "zndb",
+        }
+    ),
+    Platform.SIREN: frozenset({"dgnbj", "sgbj", "sp"}),
+    Platform.SWITCH: frozenset(
+        {
+            "bh", "cl", "cn", "cwwsq", "cwysj", "cz", "dj", "dlq", "fs", "hxd", "jsq",
+            "kg", "kj", "kt", "mzj", "pc", "qjdcz", "qn", "qt", "sd", "sgbj", "sp",
+            "szjqr", "tdq", "tyndj", "wkcz", "wkf", "wsdcg", "xdd", "xxj", "zndb",
+        }
+    ),
+    Platform.VACUUM: frozenset({"sd"}),
+}
+
 
 class WorkMode(StrEnum):
     """Work modes."""
@@ -381,6 +505,34 @@ class DPCode(StrEnum):
     GATE_SIGNAL_STRENGTH = "信号强度显示"  # Signal strength (from logs, Chinese: "signal strength display")
 
 
+# Version of the entity unique_ids, the config entries store the version their
+# entities were migrated to.
+UNIQUE_ID_VERSION = 2
+
+# Categories of the lights and switches using the unique_ids of version 1
+UNIQUE_ID_LIGHT_CATEGORIES = frozenset(
+    {"dc", "dd", "dj", "fs", "fwl", "jsq", "xdd", "xxj"}
+)
+UNIQUE_ID_SWITCH_CATEGORIES = frozenset(
+    {"bh", "cwysj", "cz", "dlq", "kg", "kj", "pc", "xxj"}
+)
+UNIQUE_ID_SWITCH_POSTFIXES: dict[str, DPCode] = {
+    "": DPCode.SWITCH,
+    "_1": DPCode.SWITCH_1,
+    "_2": DPCode.SWITCH_2,
+    "_3": DPCode.SWITCH_3,
+    "_4": DPCode.SWITCH_4,
+    "_5": DPCode.SWITCH_5,
+    "_6": DPCode.SWITCH_6,
+    "_usb1": DPCode.SWITCH_USB1,
+    "_usb2": DPCode.SWITCH_USB2,
+    "_usb3": DPCode.SWITCH_USB3,
+    "_usb4": DPCode.SWITCH_USB4,
+    "_usb5": DPCode.SWITCH_USB5,
+    "_usb6": DPCode.SWITCH_USB6,
+}
+
+
 @dataclass
 class UnitOfMeasurement:
     """Describes a unit of measurement."""
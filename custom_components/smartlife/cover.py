@@ -15,13 +15,15 @@ from homeassistant.components.cover import (
     CoverEntityFeature,
 )
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import HomeAssistantSmartLifeData
-from .base import IntegerTypeData, SmartLifeEntity
-from .const import DOMAIN, SMART_LIFE_DISCOVERY_NEW, DPCode, DPType
+from .base import EnumTypeData, IntegerTypeData, SmartLifeEntity
+from .const import DOMAIN, DPCode, DPType
+from .discovery import discovery_signal, iter_descriptions
 
 
 @dataclass
@@ -150,33 +152,34 @@ async def async_setup_entry(
     def async_discover_device(device_ids: list[str]) -> None:
         """Discover and add a discovered smartlife cover."""
         entities: list[SmartLifeCoverEntity] = []
-        for device_id in device_ids:
-            device = hass_data.manager.device_map[device_id]
-            if descriptions := COVERS.get(device.category):
-                for description in descriptions:
-                    if (
-                        description.key in device.function
-                        or description.key in device.status_range
-                    ):
-                        entities.append(
-                            SmartLifeCoverEntity(
-                                device, hass_data.manager, description
-                            )
-                        )
+        for device, description in iter_descriptions(
+            hass_data.manager.device_map, device_ids, COVERS
+        ):
+            if (
+                description.key in device.function
+                or description.key in device.status_range
+            ):
+                entities.append(
+                    SmartLifeCoverEntity(device, hass_data.manager, description)
+                )
 
         async_add_entities(entities)
 
-    async_discover_device([*hass_data.manager.device_map])
+    async_discover_device(hass_data.discovery.async_device_ids(Platform.COVER))
 
     entry.async_on_unload(
-        async_dispatcher_connect(hass, SMART_LIFE_DISCOVERY_NEW, async_discover_device)
+        async_dispatcher_connect(
+            hass, discovery_signal(Platform.COVER), async_discover_device
+        )
     )
 
 
 class SmartLifeCoverEntity(SmartLifeEntity, CoverEntity):
     """smartlife Cover Device."""
 
+    _optimistic = True
     _current_position: IntegerTypeData | None = None
+    _instruction_type: EnumTypeData | None = None
     _set_position: IntegerTypeData | None = None
     _tilt: IntegerTypeData | None = None
     entity_description: SmartLifeCoverEntityDescription
@@ -195,18 +198,22 @@ class SmartLifeCoverEntity(SmartLifeEntity, CoverEntity):
 
         # Check if this cover is based on a switch or has controls
         if self.find_dpcode(description.key, prefer_function=True):
-            if device.function[description.key].type == "Boolean":
+            if (
+                self.get_dptype(description.key, prefer_function=True)
+                == DPType.BOOLEAN
+            ):
                 self._attr_supported_features |= (
                     CoverEntityFeature.OPEN | CoverEntityFeature.CLOSE
                 )
             elif enum_type := self.find_dpcode(
                 description.key, dptype=DPType.ENUM, prefer_function=True
             ):
-                if description.open_instruction_value in enum_type.range:
+                self._instruction_type = enum_type
+                if description.open_instruction_value in enum_type.range_set:
                     self._attr_supported_features |= CoverEntityFeature.OPEN
-                if description.close_instruction_value in enum_type.range:
+                if description.close_instruction_value in enum_type.range_set:
                     self._attr_supported_features |= CoverEntityFeature.CLOSE
-                if description.stop_instruction_value in enum_type.range:
+                if description.stop_instruction_value in enum_type.range_set:
                     self._attr_supported_features |= CoverEntityFeature.STOP
 
         # Determine type to use for setting the position
@@ -239,7 +246,7 @@ class SmartLifeCoverEntity(SmartLifeEntity, CoverEntity):
         if self._current_position is None:
             return None
 
-        if (position := self.device.status.get(self._current_position.dpcode)) is None:
+        if (position := self._status.get(self._current_position.dpcode)) is None:
             return None
 
         return round(
@@ -255,7 +262,7 @@ class SmartLifeCoverEntity(SmartLifeEntity, CoverEntity):
         if self._tilt is None:
             return None
 
-        if (angle := self.device.status.get(self._tilt.dpcode)) is None:
+        if (angle := self._status.get(self._tilt.dpcode)) is None:
             return None
 
         return round(self._tilt.remap_value_to(angle, 0, 100))
@@ -266,7 +273,7 @@ class SmartLifeCoverEntity(SmartLifeEntity, CoverEntity):
         if (
             self.entity_description.current_state is not None
             and (
-                current_state := self.device.status.get(
+                current_state := self._status.get(
                     self.entity_description.current_state
                 )
             )
@@ -281,12 +288,10 @@ class SmartLifeCoverEntity(SmartLifeEntity, CoverEntity):
 
         return None
 
-    def open_cover(self, **kwargs: Any) -> None:
+    async def async_open_cover(self, **kwargs: Any) -> None:
         """Open the cover."""
         value: bool | str = True
-        if self.find_dpcode(
-            self.entity_description.key, dptype=DPType.ENUM, prefer_function=True
-        ):
+        if self._instruction_type is not None:
             value = self.entity_description.open_instruction_value
 
         commands: list[dict[str, str | int]] = [
@@ -303,14 +308,12 @@ class SmartLifeCoverEntity(SmartLifeEntity, CoverEntity):
                 }
             )
 
-        self._send_command(commands)
+        await self._async_send_command(commands)
 
-    def close_cover(self, **kwargs: Any) -> None:
+    async def async_close_cover(self, **kwargs: Any) -> None:
         """Close cover."""
         value: bool | str = False
-        if self.find_dpcode(
-            self.entity_description.key, dptype=DPType.ENUM, prefer_function=True
-        ):
+        if self._instruction_type is not None:
             value = self.entity_description.close_instruction_value
 
         commands: list[dict[str, str | int]] = [
@@ -327,16 +330,16 @@ class SmartLifeCoverEntity(SmartLifeEntity, CoverEntity):
                 }
             )
 
-        self._send_command(commands)
+        await self._async_send_command(commands)
 
-    def set_cover_position(self, **kwargs: Any) -> None:
+    async def async_set_cover_position(self, **kwargs: Any) -> None:
         """Move the cover to a specific position."""
         if self._set_position is None:
             raise RuntimeError(
                 "Cannot set position, device doesn't provide methods to set it"
             )
 
-        self._send_command(
+        await self._async_send_debounced_command(
             [
                 {
                     "code": self._set_position.dpcode,
@@ -349,9 +352,9 @@ class SmartLifeCoverEntity(SmartLifeEntity, CoverEntity):
             ]
         )
 
-    def stop_cover(self, **kwargs: Any) -> None:
+    async def async_stop_cover(self, **kwargs: Any) -> None:
         """Stop the cover."""
-        self._send_command(
+        await self._async_send_command(
             [
                 {
                     "code": self.entity_description.key,
@@ -360,14 +363,14 @@ class SmartLifeCoverEntity(SmartLifeEntity, CoverEntity):
             ]
         )
 
-    def set_cover_tilt_position(self, **kwargs: Any) -> None:
+    async def async_set_cover_tilt_position(self, **kwargs: Any) -> None:
         """Move the cover tilt to a specific position."""
         if self._tilt is None:
             raise RuntimeError(
                 "Cannot set tilt, device doesn't provide methods to set it"
             )
 
-        self._send_command(
+        await self._async_send_debounced_command(
             [
                 {
                     "code": self._tilt.dpcode,
@@ -15,6 +15,7 @@ from homeassistant.helpers.device_registry import DeviceEntry
 from homeassistant.util import dt as dt_util
 
 from . import HomeAssistantSmartLifeData
+from .base import TYPE_DATA_REGISTRY
 from .const import (
     DOMAIN,
     DPCode,
@@ -54,14 +55,25 @@ def _async_get_diagnostics(
         "mqtt_connected": mqtt_connected,
         "disabled_by": entry.disabled_by,
         "disabled_polling": entry.pref_disable_polling,
+        "type_data_registry": TYPE_DATA_REGISTRY.as_dict(),
+        "setup_timings": hass_data.pipeline.as_dict(),
+        "device_sync": hass_data.pipeline.sync_as_dict(),
+        "update_bridge": hass_data.listener.bridge.as_dict(),
+        "significance_filter": hass_data.significance.as_dict(),
+        "commands": hass_data.commands.as_dict(),
+        "executor": hass_data.executor.as_dict(),
+        "mq_watchdog": hass_data.watchdog.as_dict(),
+        "polling_fallback": hass_data.polling.as_dict(),
     }
 
     if device:
         smartlife_device_id = next(iter(device.identifiers))[1]
+        data["command_acks"] = hass_data.commands.acks.as_dict(smartlife_device_id)
         data |= _async_device_as_dict(
             hass, hass_data.manager.device_map[smartlife_device_id]
         )
     else:
+        data["command_acks"] = hass_data.commands.acks.as_dict()
         data.update(
             devices=[
                 _async_device_as_dict(hass, device)
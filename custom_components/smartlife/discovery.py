@@ -0,0 +1,109 @@
+"""Device discovery index for smartlife."""
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Mapping
+from typing import TypeVar
+
+from tuya_sharing import CustomerDevice
+
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+
+from .const import PLATFORM_CATEGORIES, SMART_LIFE_DISCOVERY_NEW
+
+_DescriptionT = TypeVar("_DescriptionT")
+
+CATEGORY_PLATFORMS: dict[str, frozenset[Platform]] = {}
+for _platform, _categories in PLATFORM_CATEGORIES.items():
+    for _category in _categories:
+        CATEGORY_PLATFORMS[_category] = CATEGORY_PLATFORMS.get(
+            _category, frozenset()
+        ) | {_platform}
+
+
+def discovery_signal(platform: Platform) -> str:
+    """Return the discovery signal of a platform."""
+    return f"{SMART_LIFE_DISCOVERY_NEW}_{platform}"
+
+
+class DiscoveryIndex:
+    """Index of the devices of a config entry by category.
+
+    The devices are grouped by category in a single pass, each platform only
+    gets to see the devices of the categories it supports.
+    """
+
+    def __init__(self) -> None:
+        """Init DiscoveryIndex."""
+        self._categories: dict[str, dict[str, None]] = {}
+        self._device_categories: dict[str, str] = {}
+
+    @callback
+    def async_rebuild(self, devices: Iterable[CustomerDevice]) -> None:
+        """Rebuild the index from scratch."""
+        self._categories.clear()
+        self._device_categories.clear()
+        self.async_add(devices)
+
+    @callback
+    def async_add(self, devices: Iterable[CustomerDevice]) -> None:
+        """Add devices to the index."""
+        for device in devices:
+            self.async_remove(device.id)
+            self._device_categories[device.id] = device.category
+            self._categories.setdefault(device.category, {})[device.id] = None
+
+    @callback
+    def async_remove(self, device_id: str) -> None:
+        """Remove a device from the index."""
+        if (category := self._device_categories.pop(device_id, None)) is None:
+            return
+        device_ids = self._categories[category]
+        del device_ids[device_id]
+        if not device_ids:
+            del self._categories[category]
+
+    @callback
+    def async_platforms(self) -> set[Platform]:
+        """Return the platforms supporting the categories of the indexed devices."""
+        return {
+            platform
+            for category in self._categories
+            for platform in CATEGORY_PLATFORMS.get(category, ())
+        }
+
+    @callback
+    def async_device_ids(self, platform: Platform) -> list[str]:
+        """Return the IDs of the devices a platform may provide entities for."""
+        return [
+            device_id
+            for category in PLATFORM_CATEGORIES[platform] & self._categories.keys()
+            for device_id in self._categories[category]
+        ]
+
+
+@callback
+def async_dispatch_new_devices(
+    hass: HomeAssistant, devices: Iterable[CustomerDevice]
+) -> None:
+    """Signal new devices to the platforms supporting their category."""
+    platform_device_ids: dict[Platform, list[str]] = {}
+    for device in devices:
+        for platform in CATEGORY_PLATFORMS.get(device.category, ()):
+            platform_device_ids.setdefault(platform, []).append(device.id)
+
+    for platform, device_ids in platform_device_ids.items():
+        async_dispatcher_send(hass, discovery_signal(platform), device_ids)
+
+
+def iter_descriptions(
+    device_map: Mapping[str, CustomerDevice],
+    device_ids: Iterable[str],
+    descriptions: Mapping[str, tuple[_DescriptionT, ...]],
+) -> Iterator[tuple[CustomerDevice, _DescriptionT]]:
+    """Yield the descriptions of the category of each device."""
+    for device_id in device_ids:
+        device = device_map[device_id]
+        for description in descriptions.get(device.category, ()):
+            yield device, description
@@ -0,0 +1,143 @@
+"""Executor of the blocking SDK calls of smartlife."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Callable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+import threading
+import time
+from typing import Any, TypeVar
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+
+from .const import CONF_EXECUTOR_WORKERS, DEFAULT_EXECUTOR_WORKERS
+
+_T = TypeVar("_T")
+
+
+class DeviceSerializer:
+    """Let a single call per device run at a time, in call order."""
+
+    def __init__(self) -> None:
+        """Init DeviceSerializer."""
+        self._locks: dict[str, tuple[asyncio.Lock, int]] = {}
+
+    @asynccontextmanager
+    async def async_lock(self, device_id: str) -> AsyncIterator[None]:
+        """Wait for the previous calls of a device to finish."""
+        lock, users = self._locks.get(device_id, (None, 0))
+        if lock is None:
+            lock = asyncio.Lock()
+        self._locks[device_id] = (lock, users + 1)
+        try:
+            async with lock:
+                yield
+        finally:
+            lock, users = self._locks[device_id]
+            if users == 1:
+                del self._locks[device_id]
+            else:
+                self._locks[device_id] = (lock, users - 1)
+
+    @callback
+    def busy(self) -> int:
+        """Return the number of devices with calls running or waiting."""
+        return len(self._locks)
+
+
+class BlockingExecutor:
+    """Run the blocking SDK calls of a config entry on its own threads.
+
+    The calls never compete with the recorder or other integrations for the
+    Home Assistant executor. The number of threads is an option of the
+    config entry, calls of the same device run one at a time.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Init BlockingExecutor."""
+        self.hass = hass
+        self.entry = entry
+        self.devices = DeviceSerializer()
+        self._executor: ThreadPoolExecutor | None = None
+        self._workers = 0
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._max_queued = 0
+        self._running = 0
+        self._calls = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    @property
+    def workers(self) -> int:
+        """Return the configured number of threads."""
+        return self.entry.options.get(CONF_EXECUTOR_WORKERS, DEFAULT_EXECUTOR_WORKERS)
+
+    async def async_run(
+            self,
+            target: Callable[..., _T],
+            *args: Any,
+            device_id: str | None = None,
+    ) -> _T:
+        """Run a blocking call, after the previous calls of the device."""
+        if device_id is None:
+            return await self._async_submit(target, *args)
+        async with self.devices.async_lock(device_id):
+            return await self._async_submit(target, *args)
+
+    async def _async_submit(self, target: Callable[..., _T], *args: Any) -> _T:
+        """Queue a blocking call on the threads."""
+        if self._executor is None or self._workers != self.workers:
+            # Resized in the options, running calls finish on the old threads.
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+            self._workers = self.workers
+            self._executor = ThreadPoolExecutor(
+                self._workers, thread_name_prefix="smartlife"
+            )
+
+        queued = time.monotonic()
+        with self._lock:
+            self._queued += 1
+            self._max_queued = max(self._max_queued, self._queued)
+
+        def _run() -> _T:
+            wait = time.monotonic() - queued
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+                self._calls += 1
+                self._wait_total += wait
+                self._wait_max = max(self._wait_max, wait)
+            try:
+                return target(*args)
+            finally:
+                with self._lock:
+                    self._running -= 1
+
+        return await self.hass.loop.run_in_executor(self._executor, _run)
+
+    def shutdown(self) -> None:
+        """Stop the threads once the running calls finished."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    @callback
+    def as_dict(self) -> dict[str, Any]:
+        """Return the gauges of the executor."""
+        with self._lock:
+            return {
+                "workers": self._workers or self.workers,
+                "queued": self._queued,
+                "max_queued": self._max_queued,
+                "running": self._running,
+                "calls": self._calls,
+                "wait_avg": round(self._wait_total / self._calls, 3)
+                if self._calls
+                else None,
+                "wait_max": round(self._wait_max, 3),
+                "busy_devices": self.devices.busy(),
+            }
@@ -12,6 +12,7 @@ from homeassistant.components.fan import (
     FanEntityFeature,
 )
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
@@ -22,7 +23,8 @@ from homeassistant.util.percentage import (
 
 from . import HomeAssistantSmartLifeData
 from .base import EnumTypeData, IntegerTypeData, SmartLifeEntity
-from .const import DOMAIN, SMART_LIFE_DISCOVERY_NEW, DPCode, DPType
+from .const import DOMAIN, DPCode, DPType
+from .discovery import discovery_signal
 
 SMART_LIFE_SUPPORT_TYPE = {
     "fs",  # Fan
@@ -49,16 +51,19 @@ async def async_setup_entry(
                 entities.append(SmartLifeFanEntity(device, hass_data.manager))
         async_add_entities(entities)
 
-    async_discover_device([*hass_data.manager.device_map])
+    async_discover_device(hass_data.discovery.async_device_ids(Platform.FAN))
 
     entry.async_on_unload(
-        async_dispatcher_connect(hass, SMART_LIFE_DISCOVERY_NEW, async_discover_device)
+        async_dispatcher_connect(
+            hass, discovery_signal(Platform.FAN), async_discover_device
+        )
     )
 
 
 class SmartLifeFanEntity(SmartLifeEntity, FanEntity):
     """Smart Life Fan Device."""
 
+    _optimistic = True
     _direction: EnumTypeData | None = None
     _oscillate: DPCode | None = None
     _presets: EnumTypeData | None = None
@@ -84,7 +89,7 @@ class SmartLifeFanEntity(SmartLifeEntity, FanEntity):
         ):
             self._presets = enum_type
             self._attr_supported_features |= FanEntityFeature.PRESET_MODE
-            self._attr_preset_modes = enum_type.range
+            self._attr_preset_modes = list(enum_type.range)
 
         # Find speed controls, can be either percentage or a set of speeds
         dpcodes = (
@@ -116,22 +121,26 @@ class SmartLifeFanEntity(SmartLifeEntity, FanEntity):
             self._direction = enum_type
             self._attr_supported_features |= FanEntityFeature.DIRECTION
 
-    def set_preset_mode(self, preset_mode: str) -> None:
+    async def async_set_preset_mode(self, preset_mode: str) -> None:
         """Set the preset mode of the fan."""
         if self._presets is None:
             return
-        self._send_command([{"code": self._presets.dpcode, "value": preset_mode}])
+        await self._async_send_command(
+            [{"code": self._presets.dpcode, "value": preset_mode}]
+        )
 
-    def set_direction(self, direction: str) -> None:
+    async def async_set_direction(self, direction: str) -> None:
         """Set the direction of the fan."""
         if self._direction is None:
             return
-        self._send_command([{"code": self._direction.dpcode, "value": direction}])
+        await self._async_send_command(
+            [{"code": self._direction.dpcode, "value": direction}]
+        )
 
-    def set_percentage(self, percentage: int) -> None:
+    async def async_set_percentage(self, percentage: int) -> None:
         """Set the speed of the fan, as a percentage."""
         if self._speed is not None:
-            self._send_command(
+            await self._async_send_debounced_command(
                 [
                     {
                         "code": self._speed.dpcode,
@@ -142,7 +151,7 @@ class SmartLifeFanEntity(SmartLifeEntity, FanEntity):
             return
 
         if self._speeds is not None:
-            self._send_command(
+            await self._async_send_debounced_command(
                 [
                     {
                         "code": self._speeds.dpcode,
@@ -153,11 +162,11 @@ class SmartLifeFanEntity(SmartLifeEntity, FanEntity):
                 ]
             )
 
-    def turn_off(self, **kwargs: Any) -> None:
+    async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the fan off."""
-        self._send_command([{"code": self._switch, "value": False}])
+        await self._async_send_command([{"code": self._switch, "value": False}])
 
-    def turn_on(
+    async def async_turn_on(
         self,
         percentage: int | None = None,
         preset_mode: str | None = None,
@@ -192,27 +201,29 @@ class SmartLifeFanEntity(SmartLifeEntity, FanEntity):
         if preset_mode is not None and self._presets is not None:
             commands.append({"code": self._presets.dpcode, "value": preset_mode})
 
-        self._send_command(commands)
+        await self._async_send_command(commands)
 
-    def oscillate(self, oscillating: bool) -> None:
+    async def async_oscillate(self, oscillating: bool) -> None:
         """Oscillate the fan."""
         if self._oscillate is None:
             return
-        self._send_command([{"code": self._oscillate, "value": oscillating}])
+        await self._async_send_command(
+            [{"code": self._oscillate, "value": oscillating}]
+        )
 
     @property
     def is_on(self) -> bool | None:
         """Return true if fan is on."""
         if self._switch is None:
             return None
-        return self.device.status.get(self._switch)
+        return self._status.get(self._switch)
 
     @property
     def current_direction(self) -> str | None:
         """Return the current direction of the fan."""
         if (
             self._direction is None
-            or (value := self.device.status.get(self._direction.dpcode)) is None
+            or (value := self._status.get(self._direction.dpcode)) is None
         ):
             return None
 
@@ -229,25 +240,25 @@ class SmartLifeFanEntity(SmartLifeEntity, FanEntity):
         """Return true if the fan is oscillating."""
         if self._oscillate is None:
             return None
-        return self.device.status.get(self._oscillate)
+        return self._status.get(self._oscillate)
 
     @property
     def preset_mode(self) -> str | None:
         """Return the current preset_mode."""
         if self._presets is None:
             return None
-        return self.device.status.get(self._presets.dpcode)
+        return self._status.get(self._presets.dpcode)
 
     @property
     def percentage(self) -> int | None:
         """Return the current speed."""
         if self._speed is not None:
-            if (value := self.device.status.get(self._speed.dpcode)) is None:
+            if (value := self._status.get(self._speed.dpcode)) is None:
                 return None
             return int(self._speed.remap_value_to(value, 1, 100))
 
         if self._speeds is not None:
-            if (value := self.device.status.get(self._speeds.dpcode)) is None:
+            if (value := self._status.get(self._speeds.dpcode)) is None:
                 return None
             return ordered_list_item_to_percentage(self._speeds.range, value)
 
@@ -12,13 +12,15 @@ from homeassistant.components.humidifier import (
     HumidifierEntityFeature,
 )
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import HomeAssistantSmartLifeData
 from .base import IntegerTypeData, SmartLifeEntity
-from .const import DOMAIN, SMART_LIFE_DISCOVERY_NEW, DPCode, DPType
+from .const import DOMAIN, DPCode, DPType
+from .discovery import discovery_signal
 
 
 @dataclass
@@ -70,16 +72,19 @@ async def async_setup_entry(
                     )
         async_add_entities(entities)
 
-    async_discover_device([*hass_data.manager.device_map])
+    async_discover_device(hass_data.discovery.async_device_ids(Platform.HUMIDIFIER))
 
     entry.async_on_unload(
-        async_dispatcher_connect(hass, SMART_LIFE_DISCOVERY_NEW, async_discover_device)
+        async_dispatcher_connect(
+            hass, discovery_signal(Platform.HUMIDIFIER), async_discover_device
+        )
     )
 
 
 class SmartLifeHumidifierEntity(SmartLifeEntity, HumidifierEntity):
     """smartlife (de)humidifier Device."""
 
+    _optimistic = True
     _set_humidity: IntegerTypeData | None = None
     _switch_dpcode: DPCode | None = None
     entity_description: SmartLifeHumidifierEntityDescription
@@ -113,19 +118,19 @@ class SmartLifeHumidifierEntity(SmartLifeEntity, HumidifierEntity):
             DPCode.MODE, dptype=DPType.ENUM, prefer_function=True
         ):
             self._attr_supported_features |= HumidifierEntityFeature.MODES
-            self._attr_available_modes = enum_type.range
+            self._attr_available_modes = list(enum_type.range)
 
     @property
     def is_on(self) -> bool:
         """Return the device is on or off."""
         if self._switch_dpcode is None:
             return False
-        return self.device.status.get(self._switch_dpcode, False)
+        return self._status.get(self._switch_dpcode, False)
 
     @property
     def mode(self) -> str | None:
         """Return the current mode."""
-        return self.device.status.get(DPCode.MODE)
+        return self._status.get(DPCode.MODE)
 
     @property
     def target_humidity(self) -> int | None:
@@ -133,28 +138,28 @@ class SmartLifeHumidifierEntity(SmartLifeEntity, HumidifierEntity):
         if self._set_humidity is None:
             return None
 
-        humidity = self.device.status.get(self._set_humidity.dpcode)
+        humidity = self._status.get(self._set_humidity.dpcode)
         if humidity is None:
             return None
 
         return round(self._set_humidity.scale_value(humidity))
 
-    def turn_on(self, **kwargs):
+    async def async_turn_on(self, **kwargs):
         """Turn the device on."""
-        self._send_command([{"code": self._switch_dpcode, "value": True}])
+        await self._async_send_command([{"code": self._switch_dpcode, "value": True}])
 
-    def turn_off(self, **kwargs):
+    async def async_turn_off(self, **kwargs):
         """Turn the device off."""
-        self._send_command([{"code": self._switch_dpcode, "value": False}])
+        await self._async_send_command([{"code": self._switch_dpcode, "value": False}])
 
-    def set_humidity(self, humidity: int) -> None:
+    async def async_set_humidity(self, humidity: int) -> None:
         """Set new target humidity."""
         if self._set_humidity is None:
             raise RuntimeError(
                 "Cannot set humidity, device doesn't provide methods to set it"
             )
 
-        self._send_command(
+        await self._async_send_command(
             [
                 {
                     "code": self._set_humidity.dpcode,
@@ -163,6 +168,6 @@ class SmartLifeHumidifierEntity(SmartLifeEntity, HumidifierEntity):
             ]
         )
 
-    def set_mode(self, mode):
+    async def async_set_mode(self, mode):
         """Set new target preset mode."""
-        self._send_command([{"code": DPCode.MODE, "value": mode}])
+        await self._async_send_command([{"code": DPCode.MODE, "value": mode}])
@@ -0,0 +1,132 @@
+"""Priority command lanes for smartlife."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from enum import IntEnum
+import heapq
+import itertools
+import time
+from typing import Any, TypeVar
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import COMMAND_SLOTS
+
+_T = TypeVar("_T")
+
+
+class CommandLane(IntEnum):
+    """Priority classes of commands, lower values are sent first."""
+
+    SECURITY = 0
+    NORMAL = 1
+
+
+@dataclass(order=True)
+class _Job:
+    """A cloud call waiting for a command slot."""
+
+    lane: CommandLane
+    seq: int
+    queued: float = field(compare=False)
+    granted: asyncio.Future[None] = field(compare=False)
+
+
+@dataclass
+class _LaneStats:
+    """Counters of a lane."""
+
+    depth: int = 0
+    max_depth: int = 0
+    sent: int = 0
+    wait_total: float = 0.0
+    wait_max: float = 0.0
+
+
+class CommandLanes:
+    """Run the command calls of a config entry by priority.
+
+    At most COMMAND_SLOTS calls run at once. When all slots are taken, the
+    next free slot goes to the oldest call of the highest priority lane, a
+    security command waits at most for a running call to finish.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Init CommandLanes."""
+        self.hass = hass
+        self._queue: list[_Job] = []
+        self._seq = itertools.count()
+        self._running = 0
+        self._stats = {lane: _LaneStats() for lane in CommandLane}
+
+    async def async_run(
+            self,
+            lane: CommandLane,
+            target: Callable[..., Awaitable[_T]],
+            *args: Any,
+    ) -> _T:
+        """Run a cloud call in a lane and wait for its result."""
+        job = _Job(
+            lane, next(self._seq), time.monotonic(), self.hass.loop.create_future()
+        )
+        heapq.heappush(self._queue, job)
+        stats = self._stats[lane]
+        stats.depth += 1
+        stats.max_depth = max(stats.max_depth, stats.depth)
+        self._async_start()
+
+        try:
+            await job.granted
+        except asyncio.CancelledError:
+            if job.granted.done() and not job.granted.cancelled():
+                # Cancelled right after getting the slot, hand it on.
+                self._async_release()
+            raise
+        try:
+            return await target(*args)
+        finally:
+            self._async_release()
+
+    @callback
+    def _async_start(self) -> None:
+        """Hand the free slots to the queued calls, by priority."""
+        while self._running < COMMAND_SLOTS and self._queue:
+            job = heapq.heappop(self._queue)
+            stats = self._stats[job.lane]
+            stats.depth -= 1
+            if job.granted.cancelled():
+                continue
+            wait = time.monotonic() - job.queued
+            stats.sent += 1
+            stats.wait_total += wait
+            stats.wait_max = max(stats.wait_max, wait)
+            self._running += 1
+            job.granted.set_result(None)
+
+    @callback
+    def _async_release(self) -> None:
+        """Free the slot of a finished call and start the next one."""
+        self._running -= 1
+        self._async_start()
+
+    @callback
+    def as_dict(self) -> dict[str, Any]:
+        """Return the queue depth and wait times of each lane."""
+        return {
+            "slots": COMMAND_SLOTS,
+            "running": self._running,
+            **{
+                lane.name.lower(): {
+                    "depth": stats.depth,
+                    "max_depth": stats.max_depth,
+                    "sent": stats.sent,
+                    "wait_avg": round(stats.wait_total / stats.sent, 3)
+                    if stats.sent
+                    else None,
+                    "wait_max": round(stats.wait_max, 3),
+                }
+                for lane, stats in self._stats.items()
+            },
+        }
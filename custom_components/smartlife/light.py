@@ -3,7 +3,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 import json
-from typing import Any, cast
+from typing import Any
 
 from tuya_sharing import Manager, CustomerDevice
 
@@ -16,18 +16,19 @@ from homeassistant.components.light import (
     LightEntityDescription,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import EntityCategory
+from homeassistant.const import EntityCategory, Platform
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import HomeAssistantSmartLifeData
-from .base import IntegerTypeData, SmartLifeEntity
-from .const import DOMAIN, SMART_LIFE_DISCOVERY_NEW, DPCode, DPType, WorkMode
+from .base import TYPE_DATA_REGISTRY, IntegerTypeData, SmartLifeEntity
+from .const import DOMAIN, DPCode, DPType, WorkMode
+from .discovery import discovery_signal, iter_descriptions
 from .util import remap_value
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ColorTypeData:
     """Color Type Data."""
 
@@ -339,27 +340,32 @@ LIGHTS["cz"] = LIGHTS["kg"]
 LIGHTS["pc"] = LIGHTS["kg"]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ColorData:
-    """Color Data."""
+    """Color Data, with the HS color and brightness remapped once."""
 
     type_data: ColorTypeData
     h_value: int
     s_value: int
     v_value: int
-
-    @property
-    def hs_color(self) -> tuple[float, float]:
-        """Get the HS value from this color data."""
-        return (
-            self.type_data.h_type.remap_value_to(self.h_value, 0, 360),
-            self.type_data.s_type.remap_value_to(self.s_value, 0, 100),
+    hs_color: tuple[float, float] = field(init=False)
+    brightness: int = field(init=False)
+
+    def __post_init__(self) -> None:
+        """Remap the HS color and brightness from this color data."""
+        object.__setattr__(
+            self,
+            "hs_color",
+            (
+                self.type_data.h_type.remap_value_to(self.h_value, 0, 360),
+                self.type_data.s_type.remap_value_to(self.s_value, 0, 100),
+            ),
+        )
+        object.__setattr__(
+            self,
+            "brightness",
+            round(self.type_data.v_type.remap_value_to(self.v_value, 0, 255)),
         )
-
-    @property
-    def brightness(self) -> int:
-        """Get the brightness value from this color data."""
-        return round(self.type_data.v_type.remap_value_to(self.v_value, 0, 255))
 
 
 async def async_setup_entry(
@@ -372,29 +378,29 @@ async def async_setup_entry(
     def async_discover_device(device_ids: list[str]):
         """Discover and add a discovered smartlife light."""
         entities: list[SmartLifeLightEntity] = []
-        for device_id in device_ids:
-            device = hass_data.manager.device_map[device_id]
-            if descriptions := LIGHTS.get(device.category):
-                for description in descriptions:
-                    if description.key in device.status:
-                        entities.append(
-                            SmartLifeLightEntity(
-                                device, hass_data.manager, description
-                            )
-                        )
+        for device, description in iter_descriptions(
+            hass_data.manager.device_map, device_ids, LIGHTS
+        ):
+            if description.key in device.status:
+                entities.append(
+                    SmartLifeLightEntity(device, hass_data.manager, description)
+                )
 
         async_add_entities(entities)
 
-    async_discover_device([*hass_data.manager.device_map])
+    async_discover_device(hass_data.discovery.async_device_ids(Platform.LIGHT))
 
     entry.async_on_unload(
-        async_dispatcher_connect(hass, SMART_LIFE_DISCOVERY_NEW, async_discover_device)
+        async_dispatcher_connect(
+            hass, discovery_signal(Platform.LIGHT), async_discover_device
+        )
     )
 
 
 class SmartLifeLightEntity(SmartLifeEntity, LightEntity):
     """smartlife light device."""
 
+    _optimistic = True
     entity_description: SmartLifeLightEntityDescription
 
     _brightness_max: IntegerTypeData | None = None
@@ -445,17 +451,21 @@ class SmartLifeLightEntity(SmartLifeEntity, LightEntity):
         ) and self.get_dptype(dpcode) == DPType.JSON:
             self._color_data_dpcode = dpcode
             self._attr_supported_color_modes.add(ColorMode.HS)
-            if dpcode in self.device.function:
-                values = cast(str, self.device.function[dpcode].values)
-            else:
-                values = self.device.status_range[dpcode].values
+            source = "function" if dpcode in self.device.function else "status_range"
 
             # Fetch color data type information
-            if function_data := json.loads(values):
-                self._color_data_type = ColorTypeData(
-                    h_type=IntegerTypeData(dpcode, **function_data["h"]),
-                    s_type=IntegerTypeData(dpcode, **function_data["s"]),
-                    v_type=IntegerTypeData(dpcode, **function_data["v"]),
+            if function_data := self._schema.type_data(source, dpcode):
+                self._color_data_type = TYPE_DATA_REGISTRY.intern(
+                    device.product_id,
+                    dpcode,
+                    source,
+                    getattr(device, source)[dpcode].values,
+                    "colour",
+                    lambda: ColorTypeData(
+                        h_type=IntegerTypeData(dpcode, **function_data["h"]),
+                        s_type=IntegerTypeData(dpcode, **function_data["s"]),
+                        v_type=IntegerTypeData(dpcode, **function_data["v"]),
+                    ),
                 )
             else:
                 # If no type is found, use a default one
@@ -471,9 +481,9 @@ class SmartLifeLightEntity(SmartLifeEntity, LightEntity):
     @property
     def is_on(self) -> bool:
         """Return true if light is on."""
-        return self.device.status.get(self.entity_description.key, False)
+        return self._status.get(self.entity_description.key, False)
 
-    def turn_on(self, **kwargs: Any) -> None:
+    async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn on or control the light."""
         commands = [{"code": self.entity_description.key, "value": True}]
 
@@ -555,13 +565,13 @@ class SmartLifeLightEntity(SmartLifeEntity, LightEntity):
                 self._brightness_max is not None
                 and self._brightness_min is not None
                 and (
-                    brightness_max := self.device.status.get(
+                    brightness_max := self._status.get(
                         self._brightness_max.dpcode
                     )
                 )
                 is not None
                 and (
-                    brightness_min := self.device.status.get(
+                    brightness_min := self._status.get(
                         self._brightness_min.dpcode
                     )
                 )
@@ -585,11 +595,17 @@ class SmartLifeLightEntity(SmartLifeEntity, LightEntity):
                 },
             ]
 
-        self._send_command(commands)
+        # Brightness sliders only change the brightness, debounce them.
+        if ATTR_BRIGHTNESS in kwargs and kwargs.keys() <= {ATTR_BRIGHTNESS}:
+            await self._async_send_debounced_command(commands)
+        else:
+            await self._async_send_command(commands)
 
-    def turn_off(self, **kwargs: Any) -> None:
+    async def async_turn_off(self, **kwargs: Any) -> None:
         """Instruct the light to turn off."""
-        self._send_command([{"code": self.entity_description.key, "value": False}])
+        await self._async_send_command(
+            [{"code": self.entity_description.key, "value": False}]
+        )
 
     @property
     def brightness(self) -> int | None:
@@ -601,7 +617,7 @@ class SmartLifeLightEntity(SmartLifeEntity, LightEntity):
         if not self._brightness:
             return None
 
-        brightness = self.device.status.get(self._brightness.dpcode)
+        brightness = self._status.get(self._brightness.dpcode)
         if brightness is None:
             return None
 
@@ -613,9 +629,9 @@ class SmartLifeLightEntity(SmartLifeEntity, LightEntity):
         if (
             self._brightness_max is not None
             and self._brightness_min is not None
-            and (brightness_max := self.device.status.get(self._brightness_max.dpcode))
+            and (brightness_max := self._status.get(self._brightness_max.dpcode))
             is not None
-            and (brightness_min := self.device.status.get(self._brightness_min.dpcode))
+            and (brightness_min := self._status.get(self._brightness_min.dpcode))
             is not None
         ):
             # Remap values onto our scale
@@ -637,7 +653,7 @@ class SmartLifeLightEntity(SmartLifeEntity, LightEntity):
         if not self._color_temp:
             return None
 
-        temperature = self.device.status.get(self._color_temp.dpcode)
+        temperature = self._status.get(self._color_temp.dpcode)
         if temperature is None:
             return None
 
@@ -663,7 +679,7 @@ class SmartLifeLightEntity(SmartLifeEntity, LightEntity):
         # else than "white".
         if (
             self._color_mode_dpcode
-            and self.device.status.get(self._color_mode_dpcode) != WorkMode.WHITE
+            and self._status.get(self._color_mode_dpcode) != WorkMode.WHITE
         ):
             return ColorMode.HS
         if self._color_temp:
@@ -677,14 +693,21 @@ class SmartLifeLightEntity(SmartLifeEntity, LightEntity):
         if (
             self._color_data_type is None
             or self._color_data_dpcode is None
-            or self._color_data_dpcode not in self.device.status
+            or self._color_data_dpcode not in self._status
         ):
             return None
 
-        if not (status_data := self.device.status[self._color_data_dpcode]):
+        if not (status_data := self._status[self._color_data_dpcode]):
             return None
 
-        if not (status := json.loads(status_data)):
+        # Decoded once per raw value, the properties of a state write share it.
+        return self._schema.decode(
+            self._color_data_dpcode, status_data, self._decode_color_data
+        )
+
+    def _decode_color_data(self, status_data: str) -> ColorData | None:
+        """Decode the color data of a raw status value."""
+        if self._color_data_type is None or not (status := json.loads(status_data)):
             return None
 
         return ColorData(
@@ -9,14 +9,15 @@ from homeassistant.components.number import (
     NumberEntityDescription,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.const import EntityCategory, Platform, UnitOfTime
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import HomeAssistantSmartLifeData
 from .base import IntegerTypeData, SmartLifeEntity
-from .const import DEVICE_CLASS_UNITS, DOMAIN, SMART_LIFE_DISCOVERY_NEW, DPCode, DPType
+from .const import DEVICE_CLASS_UNITS, DOMAIN, DPCode, DPType
+from .discovery import discovery_signal, iter_descriptions
 
 # All descriptions can be found here. Mostly the Integer data types in the
 # default instructions set of each category end up being a number.
@@ -320,29 +321,29 @@ async def async_setup_entry(
     def async_discover_device(device_ids: list[str]) -> None:
         """Discover and add a discovered smartlife number."""
         entities: list[SmartLifeNumberEntity] = []
-        for device_id in device_ids:
-            device = hass_data.manager.device_map[device_id]
-            if descriptions := NUMBERS.get(device.category):
-                for description in descriptions:
-                    if description.key in device.status:
-                        entities.append(
-                            SmartLifeNumberEntity(
-                                device, hass_data.manager, description
-                            )
-                        )
+        for device, description in iter_descriptions(
+            hass_data.manager.device_map, device_ids, NUMBERS
+        ):
+            if description.key in device.status:
+                entities.append(
+                    SmartLifeNumberEntity(device, hass_data.manager, description)
+                )
 
         async_add_entities(entities)
 
-    async_discover_device([*hass_data.manager.device_map])
+    async_discover_device(hass_data.discovery.async_device_ids(Platform.NUMBER))
 
     entry.async_on_unload(
-        async_dispatcher_connect(hass, SMART_LIFE_DISCOVERY_NEW, async_discover_device)
+        async_dispatcher_connect(
+            hass, discovery_signal(Platform.NUMBER), async_discover_device
+        )
     )
 
 
 class SmartLifeNumberEntity(SmartLifeEntity, NumberEntity):
     """smartlife Number Entity."""
 
+    _optimistic = True
     _number: IntegerTypeData | None = None
 
     def __init__(
@@ -354,6 +355,7 @@ class SmartLifeNumberEntity(SmartLifeEntity, NumberEntity):
         """Init smartlife sensor."""
         super().__init__(device, device_manager)
         self.entity_description = description
+        self._dpcodes = frozenset({description.key})
         self._attr_unique_id = f"{super().unique_id}{description.key}"
 
         if int_type := self.find_dpcode(
@@ -408,17 +410,17 @@ class SmartLifeNumberEntity(SmartLifeEntity, NumberEntity):
             return None
 
         # Raw value
-        if (value := self.device.status.get(self.entity_description.key)) is None:
+        if (value := self._status.get(self.entity_description.key)) is None:
             return None
 
         return self._number.scale_value(value)
 
-    def set_native_value(self, value: float) -> None:
+    async def async_set_native_value(self, value: float) -> None:
         """Set new value."""
         if self._number is None:
             raise RuntimeError("Cannot set value, device doesn't provide type data")
 
-        self._send_command(
+        await self._async_send_debounced_command(
             [
                 {
                     "code": self.entity_description.key,
@@ -0,0 +1,140 @@
+"""Optimistic device state for smartlife."""
+from __future__ import annotations
+
+from collections.abc import Collection
+from datetime import datetime
+from functools import partial
+from typing import Any
+
+from tuya_sharing import Manager
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .bridge import UpdateRouter
+from .const import LOGGER, OPTIMISTIC_TIMEOUT
+
+_MISSING = object()
+
+
+class OptimisticOverlay:
+    """Commanded DP values shown on top of the device status.
+
+    Values are applied when a command is sent and cleared once the device
+    reports the DP code. Values the device did not report within
+    OPTIMISTIC_TIMEOUT seconds are reverted to the device status.
+    """
+
+    def __init__(self, hass: HomeAssistant, manager: Manager, router: UpdateRouter) -> None:
+        """Init OptimisticOverlay."""
+        self.hass = hass
+        self.manager = manager
+        self.router = router
+        self._values: dict[str, dict[str, Any]] = {}
+        self._cancel_revert: dict[tuple[str, str], CALLBACK_TYPE] = {}
+        self._applied = 0
+        self._confirmed = 0
+        self._overridden = 0
+        self._reverted = 0
+
+    def values(self, device_id: str) -> dict[str, Any] | None:
+        """Return the optimistic values of a device."""
+        return self._values.get(device_id)
+
+    @callback
+    def async_apply(self, device_id: str, commands: list[dict[str, Any]]) -> None:
+        """Show commanded values until the device reports them.
+
+        Commands without a value, like the gate opener, have nothing to show.
+        """
+        codes = [command["code"] for command in commands if "value" in command]
+        if not codes:
+            return
+        values = self._values.setdefault(device_id, {})
+        for command in commands:
+            if "value" not in command:
+                continue
+            code = command["code"]
+            values[code] = command["value"]
+            self._applied += 1
+            if cancel_revert := self._cancel_revert.pop((device_id, code), None):
+                cancel_revert()
+            self._cancel_revert[(device_id, code)] = async_call_later(
+                self.hass, OPTIMISTIC_TIMEOUT, partial(self._async_timeout, device_id, code)
+            )
+        self.router.async_route(device_id, codes)
+
+    @callback
+    def async_reported(self, device_id: str, dpcodes: Collection[str] | None) -> None:
+        """Clear the optimistic values of the DP codes reported by a device.
+
+        When the reported DP codes are unknown, only the values the device
+        status confirms are cleared.
+        """
+        if (values := self._values.get(device_id)) is None:
+            return
+        if (device := self.manager.device_map.get(device_id)) is None:
+            return
+
+        for code in list(values):
+            confirmed = device.status.get(code, _MISSING) == values[code]
+            if dpcodes is None and not confirmed:
+                continue
+            if dpcodes is not None and code not in dpcodes:
+                continue
+            if confirmed:
+                self._confirmed += 1
+            else:
+                self._overridden += 1
+            self._async_clear(device_id, code)
+
+    @callback
+    def async_revert(self, device_id: str, codes: Collection[str]) -> None:
+        """Revert optimistic values to the device status."""
+        reverted = [code for code in codes if self._async_clear(device_id, code)]
+        if reverted:
+            self._reverted += len(reverted)
+            self.router.async_route(device_id, reverted)
+
+    @callback
+    def _async_timeout(self, device_id: str, code: str, _: datetime) -> None:
+        """Revert a value the device did not report in time."""
+        self._cancel_revert.pop((device_id, code), None)
+        LOGGER.info(
+            "Device %s did not report %s within %s seconds, reverting its state",
+            device_id,
+            code,
+            OPTIMISTIC_TIMEOUT,
+        )
+        self.async_revert(device_id, (code,))
+
+    @callback
+    def _async_clear(self, device_id: str, code: str) -> bool:
+        """Clear an optimistic value, returns False if there was none."""
+        if cancel_revert := self._cancel_revert.pop((device_id, code), None):
+            cancel_revert()
+        if (values := self._values.get(device_id)) is None or code not in values:
+            return False
+        del values[code]
+        if not values:
+            del self._values[device_id]
+        return True
+
+    @callback
+    def async_clear_all(self) -> None:
+        """Clear all optimistic values."""
+        for cancel_revert in self._cancel_revert.values():
+            cancel_revert()
+        self._cancel_revert.clear()
+        self._values.clear()
+
+    @callback
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters of the overlay."""
+        return {
+            "pending": sum(len(values) for values in self._values.values()),
+            "applied": self._applied,
+            "confirmed": self._confirmed,
+            "overridden": self._overridden,
+            "reverted": self._reverted,
+        }
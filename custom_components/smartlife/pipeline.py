@@ -0,0 +1,169 @@
+"""Setup pipeline for smartlife."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+import time
+from typing import Any
+
+from tuya_sharing import CustomerDevice, SharingScene
+from tuya_sharing.home import SmartLifeHome
+
+from homeassistant.core import HomeAssistant, callback
+
+from .cloud import SmartLifeCloud
+from .const import LOGGER
+
+
+class SetupPipeline:
+    """Run the cloud calls of the setup of a config entry.
+
+    Independent cloud calls run concurrently on the event loop, the time
+    spent in each stage is kept for the diagnostics.
+    """
+
+    def __init__(self, hass: HomeAssistant, cloud: SmartLifeCloud) -> None:
+        """Init SetupPipeline."""
+        self.hass = hass
+        self.cloud = cloud
+        self._timings: dict[str, float] = {}
+        self._scenes: asyncio.Future[list[SharingScene]] | None = None
+        self._syncs = 0
+        self._last_sync: dict[str, int] = {}
+
+    @callback
+    def async_reset(self) -> None:
+        """Reset the pipeline for a new setup of the config entry."""
+        self._timings.clear()
+        if self._scenes is not None:
+            self._scenes.cancel()
+        self._scenes = self.hass.loop.create_future()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time a stage of the setup."""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self._timings[name] = round(time.monotonic() - start, 3)
+
+    @callback
+    def async_report_version(self, *versions: str) -> None:
+        """Report the versions in the background, off the setup path."""
+
+        async def _async_report_version() -> None:
+            with self.stage("report_version"):
+                try:
+                    await self.cloud.async_report_version(*versions)
+                except Exception as err:  # pylint: disable=broad-except
+                    LOGGER.debug("Failed to report version: %s", err)
+
+        self.hass.async_create_background_task(
+            _async_report_version(), "smartlife report version"
+        )
+
+    async def async_fetch_devices(
+            self, known: Mapping[str, CustomerDevice] | None = None
+    ) -> tuple[list[SmartLifeHome], dict[str, CustomerDevice]]:
+        """Fetch the homes and their devices, without touching the cache.
+
+        The device lists carry the status of each device. The specification
+        and local strategy are only queried for devices which are not known
+        or whose update time changed, the others keep the known ones.
+        """
+        with self.stage("query_homes"):
+            homes = await self.cloud.async_query_homes()
+
+        with self.stage("query_devices"):
+            home_devices = await asyncio.gather(
+                *(
+                    self.cloud.async_query_devices_by_home(home.id, details=False)
+                    for home in homes
+                )
+            )
+
+        devices: dict[str, CustomerDevice] = {}
+        changed: list[CustomerDevice] = []
+        for home_device_list in home_devices:
+            for device in home_device_list:
+                devices[device.id] = device
+                if (current := (known or {}).get(device.id)) is not None and (
+                    _async_copy_details(current, device)
+                ):
+                    continue
+                changed.append(device)
+
+        with self.stage("query_details"):
+            await asyncio.gather(
+                *(self.cloud.async_update_device_details(device) for device in changed)
+            )
+
+        self._syncs += 1
+        self._last_sync = {
+            "devices": len(devices),
+            "details_queried": len(changed),
+        }
+        LOGGER.debug(
+            "Fetched %s devices, %s with details", len(devices), len(changed)
+        )
+        return homes, devices
+
+    @callback
+    def async_prefetch_scenes(self, homes: list[SmartLifeHome]) -> None:
+        """Query the scenes of the homes concurrently with the rest of the setup."""
+        if self._scenes is None or self._scenes.done():
+            return
+
+        async def _async_query_scenes() -> None:
+            with self.stage("query_scenes"):
+                try:
+                    home_scenes = await asyncio.gather(
+                        *(
+                            self.cloud.async_query_scenes([home.id])
+                            for home in homes
+                        )
+                    )
+                except Exception as err:  # pylint: disable=broad-except
+                    LOGGER.warning("Failed to query scenes: %s", err)
+                    home_scenes = []
+            if self._scenes is not None and not self._scenes.done():
+                self._scenes.set_result(
+                    [scene for scenes in home_scenes for scene in scenes]
+                )
+
+        self.hass.async_create_background_task(
+            _async_query_scenes(), "smartlife query scenes"
+        )
+
+    async def async_scenes(self) -> list[SharingScene]:
+        """Wait for the scenes of the homes."""
+        assert self._scenes is not None
+        return await asyncio.shield(self._scenes)
+
+    @callback
+    def as_dict(self) -> dict[str, float]:
+        """Return the timings of the stages of the last setup."""
+        return dict(self._timings)
+
+    @callback
+    def sync_as_dict(self) -> dict[str, Any]:
+        """Return the counters of the device fetches."""
+        return {"syncs": self._syncs, "last_sync": dict(self._last_sync)}
+
+
+@callback
+def _async_copy_details(current: CustomerDevice, device: CustomerDevice) -> bool:
+    """Copy the details of a known device if it was not updated since."""
+    if (
+        not current.update_time
+        or current.update_time != device.update_time
+        or not (current.function or current.status_range)
+    ):
+        return False
+    device.function = current.function
+    device.status_range = current.status_range
+    device.support_local = current.support_local
+    device.local_strategy = current.local_strategy
+    return True
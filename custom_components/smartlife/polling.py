@@ -0,0 +1,223 @@
+"""Polling fallback of smartlife while the MQ is down."""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+import time
+from typing import Any
+
+from tuya_sharing import CustomerDevice, Manager
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .bridge import UpdateBridge
+from .cloud import SmartLifeCloud
+from .commands import CommandDispatcher
+from .const import (
+    LOGGER,
+    POLL_ACTIVE_INTERVAL,
+    POLL_ACTIVE_WINDOW,
+    POLL_BATCH_SIZE,
+    POLL_BUDGET,
+    POLL_IDLE_INTERVAL,
+    POLL_INTERVAL,
+    POLL_TICK,
+    DPCode,
+)
+
+# DP codes of battery powered devices, which sleep most of the time
+BATTERY_DPCODES = {
+    DPCode.BATTERY_PERCENTAGE,
+    DPCode.BATTERY_STATE,
+    DPCode.BATTERY_VALUE,
+    DPCode.VA_BATTERY,
+}
+
+
+class PollingFallback:
+    """Poll the status of the devices while the MQ is down.
+
+    Devices commanded or seen changing within POLL_ACTIVE_WINDOW seconds are
+    polled every POLL_ACTIVE_INTERVAL seconds, offline and battery powered
+    devices every POLL_IDLE_INTERVAL seconds, the others every POLL_INTERVAL
+    seconds. Due devices are queried in batches, at most POLL_BUDGET requests
+    per minute, the most frequently polled devices first.
+    """
+
+    def __init__(
+            self,
+            hass: HomeAssistant,
+            manager: Manager,
+            cloud: SmartLifeCloud,
+            bridge: UpdateBridge,
+            commands: CommandDispatcher,
+    ) -> None:
+        """Init PollingFallback."""
+        self.hass = hass
+        self.manager = manager
+        self.cloud = cloud
+        self.bridge = bridge
+        self.commands = commands
+        self._cancel_tick: CALLBACK_TYPE | None = None
+        self._polling = False
+        self._next_poll: dict[str, float] = {}
+        self._last_change: dict[str, float] = {}
+        self._tokens = float(POLL_BUDGET)
+        self._refilled = time.monotonic()
+        self._activations = 0
+        self._requests = 0
+        self._polled_devices = 0
+        self._changed_devices = 0
+        self._deferred = 0
+
+    @property
+    def active(self) -> bool:
+        """Return if the devices are being polled."""
+        return self._cancel_tick is not None
+
+    @callback
+    def async_start(self) -> None:
+        """Start polling the devices."""
+        if self._cancel_tick is not None:
+            return
+        LOGGER.info("MQ unavailable, polling the devices")
+        self._activations += 1
+        self._next_poll.clear()
+        self._last_change.clear()
+        self._cancel_tick = async_track_time_interval(
+            self.hass, self._async_tick, timedelta(seconds=POLL_TICK)
+        )
+        self._async_tick()
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop polling the devices."""
+        if self._cancel_tick is None:
+            return
+        LOGGER.info("MQ available, stopped polling the devices")
+        self._cancel_tick()
+        self._cancel_tick = None
+
+    @callback
+    def _async_interval(self, device: CustomerDevice, now: float) -> float:
+        """Return the polling interval of a device."""
+        active_since = [
+            since
+            for since in (
+                self.commands.last_sent(device.id),
+                self._last_change.get(device.id),
+            )
+            if since is not None
+        ]
+        if active_since and now - max(active_since) < POLL_ACTIVE_WINDOW:
+            return POLL_ACTIVE_INTERVAL
+        if not device.online or BATTERY_DPCODES & device.status.keys():
+            return POLL_IDLE_INTERVAL
+        return POLL_INTERVAL
+
+    @callback
+    def _async_refill(self, now: float) -> None:
+        """Refill the request budget, POLL_BUDGET requests per minute."""
+        self._tokens = min(
+            POLL_BUDGET, self._tokens + (now - self._refilled) * POLL_BUDGET / 60
+        )
+        self._refilled = now
+
+    @callback
+    def _async_tick(self, _: datetime | None = None) -> None:
+        """Poll the due devices, as far as the budget allows."""
+        if self._polling:
+            # The previous requests are still running.
+            return
+
+        now = time.monotonic()
+        self._async_refill(now)
+        due: list[tuple[float, float, str]] = []
+        for device_id, device in self.manager.device_map.items():
+            if not getattr(device, "set_up", False):
+                continue
+            if (next_poll := self._next_poll.get(device_id, now)) <= now:
+                due.append((self._async_interval(device, now), next_poll, device_id))
+        if not due:
+            return
+
+        due.sort()
+        batches = [
+            due[index : index + POLL_BATCH_SIZE]
+            for index in range(0, len(due), POLL_BATCH_SIZE)
+        ]
+        allowed = int(self._tokens)
+        if len(batches) > allowed:
+            # Deferred devices stay due, they are polled first next time.
+            self._deferred += sum(len(batch) for batch in batches[allowed:])
+            batches = batches[:allowed]
+        if not batches:
+            return
+
+        self._tokens -= len(batches)
+        for batch in batches:
+            for interval, _due, device_id in batch:
+                self._next_poll[device_id] = now + interval
+
+        self._polling = True
+        self.hass.async_create_background_task(
+            self._async_poll(
+                [[device_id for *_, device_id in batch] for batch in batches]
+            ),
+            "smartlife poll devices",
+        )
+
+    async def _async_poll(self, batches: list[list[str]]) -> None:
+        """Query the batches of devices concurrently."""
+        try:
+            await asyncio.gather(
+                *(self._async_poll_batch(device_ids) for device_ids in batches)
+            )
+        finally:
+            self._polling = False
+
+    async def _async_poll_batch(self, device_ids: list[str]) -> None:
+        """Query a batch of devices and push the changed ones."""
+        self._requests += 1
+        try:
+            items = await self.cloud.async_query_device_status(device_ids)
+        except Exception as err:  # pylint: disable=broad-except
+            LOGGER.warning("Failed to poll %s devices: %s", len(device_ids), err)
+            return
+
+        now = time.monotonic()
+        for item in items:
+            if (device := self.manager.device_map.get(item.get("id"))) is None:
+                continue
+            self._polled_devices += 1
+            online = item.get("online", device.online)
+            status = {
+                item_status["code"]: item_status["value"]
+                for item_status in item.get("status", [])
+                if "code" in item_status and "value" in item_status
+            }
+            if online == device.online and all(
+                device.status.get(dpcode) == value for dpcode, value in status.items()
+            ):
+                continue
+            device.online = online
+            device.status.update(status)
+            self._last_change[device.id] = now
+            self._changed_devices += 1
+            # Like an MQ report, only the entities of changed DP codes update.
+            self.bridge.push(device)
+
+    @callback
+    def as_dict(self) -> dict[str, Any]:
+        """Return the state and counters of the fallback."""
+        self._async_refill(time.monotonic())
+        return {
+            "active": self.active,
+            "activations": self._activations,
+            "budget": round(self._tokens, 1),
+            "requests": self._requests,
+            "polled_devices": self._polled_devices,
+            "changed_devices": self._changed_devices,
+            "deferred": self._deferred,
+        }
@@ -3,7 +3,7 @@ from __future__ import annotations
 
 from typing import Any
 
-from tuya_sharing import Manager, SharingScene
+from tuya_sharing import SharingScene
 
 from homeassistant.components.scene import Scene
 from homeassistant.config_entries import ConfigEntry
@@ -12,6 +12,7 @@ from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import HomeAssistantSmartLifeData
+from .cloud import SmartLifeCloud
 from .const import DOMAIN
 
 
@@ -20,10 +21,16 @@ async def async_setup_entry(
 ) -> None:
     """Set up smartlife scenes."""
     hass_data: HomeAssistantSmartLifeData = hass.data[DOMAIN][entry.entry_id]
-    scenes = await hass.async_add_executor_job(hass_data.manager.query_scenes)
-    async_add_entities(
-        SmartLifeSceneEntity(hass_data.manager, scene) for scene in scenes
-    )
+
+    # Scenes are queried by the setup pipeline once the homes are known.
+    async def async_add_scenes() -> None:
+        scenes = await hass_data.pipeline.async_scenes()
+        async_add_entities(
+            SmartLifeSceneEntity(hass_data.cloud, scene) for scene in scenes
+        )
+
+    add_scenes_task = hass.async_create_task(async_add_scenes())
+    entry.async_on_unload(add_scenes_task.cancel)
 
 
 class SmartLifeSceneEntity(Scene):
@@ -31,11 +38,11 @@ class SmartLifeSceneEntity(Scene):
 
     _should_poll = False
 
-    def __init__(self, home_manager: Manager, scene: SharingScene) -> None:
+    def __init__(self, cloud: SmartLifeCloud, scene: SharingScene) -> None:
         """Init smartlife Scene."""
         super().__init__()
         self._attr_unique_id = f"tys{scene.scene_id}"
-        self.home_manager = home_manager
+        self.cloud = cloud
         self.scene = scene
 
     @property
@@ -58,6 +65,6 @@ class SmartLifeSceneEntity(Scene):
         """Return if the scene is enabled."""
         return self.scene.enabled
 
-    def activate(self, **kwargs: Any) -> None:
+    async def async_activate(self, **kwargs: Any) -> None:
         """Activate the scene."""
-        self.home_manager.trigger_scene(self.scene.home_id, self.scene.scene_id)
+        await self.cloud.async_trigger_scene(self.scene.home_id, self.scene.scene_id)
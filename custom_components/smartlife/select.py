@@ -5,14 +5,15 @@ from tuya_sharing import Manager, CustomerDevice
 
 from homeassistant.components.select import SelectEntity, SelectEntityDescription
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import EntityCategory
+from homeassistant.const import EntityCategory, Platform
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import HomeAssistantSmartLifeData
 from .base import SmartLifeEntity
-from .const import DOMAIN, SMART_LIFE_DISCOVERY_NEW, DPCode, DPType
+from .const import DOMAIN, DPCode, DPType
+from .discovery import discovery_signal, iter_descriptions
 
 # All descriptions can be found here. Mostly the Enum data types in the
 # default instructions set of each category end up being a select.
@@ -380,29 +381,30 @@ async def async_setup_entry(
     def async_discover_device(device_ids: list[str]) -> None:
         """Discover and add a discovered Smart Life select."""
         entities: list[SmartLifeSelectEntity] = []
-        for device_id in device_ids:
-            device = hass_data.manager.device_map[device_id]
-            if descriptions := SELECTS.get(device.category):
-                for description in descriptions:
-                    if description.key in device.status:
-                        entities.append(
-                            SmartLifeSelectEntity(
-                                device, hass_data.manager, description
-                            )
-                        )
+        for device, description in iter_descriptions(
+            hass_data.manager.device_map, device_ids, SELECTS
+        ):
+            if description.key in device.status:
+                entities.append(
+                    SmartLifeSelectEntity(device, hass_data.manager, description)
+                )
 
         async_add_entities(entities)
 
-    async_discover_device([*hass_data.manager.device_map])
+    async_discover_device(hass_data.discovery.async_device_ids(Platform.SELECT))
 
     entry.async_on_unload(
-        async_dispatcher_connect(hass, SMART_LIFE_DISCOVERY_NEW, async_discover_device)
+        async_dispatcher_connect(
+            hass, discovery_signal(Platform.SELECT), async_discover_device
+        )
     )
 
 
 class SmartLifeSelectEntity(SmartLifeEntity, SelectEntity):
     """Smart Life Select Entity."""
 
+    _optimistic = True
+
     def __init__(
         self,
         device: CustomerDevice,
@@ -412,27 +414,28 @@ class SmartLifeSelectEntity(SmartLifeEntity, SelectEntity):
         """Init Smart Life select."""
         super().__init__(device, device_manager)
         self.entity_description = description
+        self._dpcodes = frozenset({description.key})
         self._attr_unique_id = f"{super().unique_id}{description.key}"
 
         self._attr_options: list[str] = []
         if enum_type := self.find_dpcode(
             description.key, dptype=DPType.ENUM, prefer_function=True
         ):
-            self._attr_options = enum_type.range
+            self._attr_options = list(enum_type.range)
 
     @property
     def current_option(self) -> str | None:
         """Return the selected entity option to represent the entity state."""
         # Raw value
-        value = self.device.status.get(self.entity_description.key)
+        value = self._status.get(self.entity_description.key)
         if value is None or value not in self._attr_options:
             return None
 
         return value
 
-    def select_option(self, option: str) -> None:
+    async def async_select_option(self, option: str) -> None:
         """Change the selected option."""
-        self._send_command(
+        await self._async_send_command(
             [
                 {
                     "code": self.entity_description.key,
@@ -2,6 +2,8 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from datetime import datetime
+import time
 
 from tuya_sharing import Manager, CustomerDevice
 from tuya_sharing.device import DeviceStatusRange
@@ -17,6 +19,7 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     PERCENTAGE,
     EntityCategory,
+    Platform,
     UnitOfElectricCurrent,
     UnitOfElectricPotential,
     UnitOfPower,
@@ -24,21 +27,31 @@ from homeassistant.const import (
     UnitOfEnergy,
     SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
 )
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.typing import StateType
 
 from . import HomeAssistantSmartLifeData
 from .base import ElectricityTypeData, EnumTypeData, IntegerTypeData, SmartLifeEntity
 from .const import (
+    CONF_SIGNIFICANCE_FILTER,
+    DEFAULT_SIGNIFICANCE_FILTER,
     DEVICE_CLASS_UNITS,
     DOMAIN,
-    SMART_LIFE_DISCOVERY_NEW,
     DPCode,
     DPType,
     UnitOfMeasurement,
 )
+from .discovery import discovery_signal, iter_descriptions
+from .significance import (
+    DEVICE_CLASS_FILTERS,
+    UNIT_SCALES,
+    SignificanceFilter,
+    SignificanceStats,
+    SignificanceTracker,
+)
 
 
 @dataclass
@@ -46,6 +59,8 @@ class SmartLifeSensorEntityDescription(SensorEntityDescription):
     """Describes Smart Life sensor entity."""
 
     subkey: str | None = None
+    # Overrides the significance filter of the device class
+    significance_filter: SignificanceFilter | None = None
 
 
 # Commonly used battery sensors, that are re-used in the sensors down below.
@@ -1135,24 +1150,28 @@ async def async_setup_entry(
     def async_discover_device(device_ids: list[str]) -> None:
         """Discover and add a discovered Smart Life sensor."""
         entities: list[SmartLifeSensorEntity] = []
-        for device_id in device_ids:
-            device = hass_data.manager.device_map[device_id]
-            if descriptions := SENSORS.get(device.category):
-                for description in descriptions:
-                    # Для устройств категории qt добавляем все сенсоры без проверки наличия в status
-                    if device.category == "qt" or description.key in device.status:
-                        entities.append(
-                            SmartLifeSensorEntity(
-                                device, hass_data.manager, description
-                            )
-                        )
+        for device, description in iter_descriptions(
+            hass_data.manager.device_map, device_ids, SENSORS
+        ):
+            # Для устройств категории qt добавляем все сенсоры без проверки наличия в status
+            if device.category == "qt" or description.key in device.status:
+                entities.append(
+                    SmartLifeSensorEntity(
+                        device,
+                        hass_data.manager,
+                        description,
+                        hass_data.significance,
+                    )
+                )
 
         async_add_entities(entities)
 
-    async_discover_device([*hass_data.manager.device_map])
+    async_discover_device(hass_data.discovery.async_device_ids(Platform.SENSOR))
 
     entry.async_on_unload(
-        async_dispatcher_connect(hass, SMART_LIFE_DISCOVERY_NEW, async_discover_device)
+        async_dispatcher_connect(
+            hass, discovery_signal(Platform.SENSOR), async_discover_device
+        )
     )
 
 
@@ -1165,16 +1184,22 @@ class SmartLifeSensorEntity(SmartLifeEntity, SensorEntity):
     _type: DPType | None = None
     _type_data: IntegerTypeData | EnumTypeData | None = None
     _uom: UnitOfMeasurement | None = None
+    _significance: SignificanceTracker | None = None
+    _cancel_deferred_write: CALLBACK_TYPE | None = None
+    _cancel_heartbeat: CALLBACK_TYPE | None = None
 
     def __init__(
         self,
         device: CustomerDevice,
         device_manager: Manager,
         description: SmartLifeSensorEntityDescription,
+        significance_stats: SignificanceStats | None = None,
     ) -> None:
         """Init SmartLifeSensorEntity."""
         super().__init__(device, device_manager)
         self.entity_description = description
+        self._significance_stats = significance_stats
+        self._dpcodes = frozenset({description.key})
         self._attr_unique_id = (
             f"{super().unique_id}{description.key}{description.subkey or ''}"
         )
@@ -1228,6 +1253,112 @@ class SmartLifeSensorEntity(SmartLifeEntity, SensorEntity):
                 self._uom.conversion_unit or self._uom.unit
             )
 
+    async def async_added_to_hass(self) -> None:
+        """Call when entity is added to hass."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self._async_cancel_deferred_write)
+        self.async_on_remove(self._async_cancel_heartbeat)
+        if self._significance_stats is None:
+            return
+        significance_filter = self.entity_description.significance_filter
+        if (
+            significance_filter is None
+            and self.state_class == SensorStateClass.MEASUREMENT
+            and self.device_class is not None
+        ):
+            significance_filter = DEVICE_CLASS_FILTERS.get(self.device_class)
+        if significance_filter is not None:
+            # The phase sensors share a DP code, tell them apart by subkey.
+            key = self.entity_description.key
+            if subkey := self.entity_description.subkey:
+                key = f"{key}.{subkey}"
+            self._significance = SignificanceTracker(
+                key,
+                significance_filter,
+                UNIT_SCALES.get(self.native_unit_of_measurement or "", 1.0),
+            )
+
+    @callback
+    def _async_device_updated(self) -> None:
+        """Write the state if the new value is significant."""
+        if (tracker := self._significance) is None or not self._significance_enabled:
+            self._async_cancel_heartbeat()
+            self.async_write_ha_state()
+            return
+
+        now = time.monotonic()
+        value = self.native_value
+        available = self.available
+        if not tracker.significant(value, available, now):
+            self._significance_stats.count(tracker.key, "suppressed")
+            if self._cancel_heartbeat is None:
+                # Write the latest value once the last write is max_age old,
+                # even if the device reports nothing in the meantime.
+                self._cancel_heartbeat = async_call_later(
+                    self.hass, tracker.expires_in(now), self._async_heartbeat
+                )
+            return
+
+        if delay := tracker.deferred_for(available, now):
+            if self._cancel_deferred_write is None:
+                self._cancel_deferred_write = async_call_later(
+                    self.hass, delay, self._async_deferred_write
+                )
+            self._significance_stats.count(tracker.key, "deferred")
+            return
+
+        self._async_write_significant(tracker, value, available, now)
+
+    @property
+    def _significance_enabled(self) -> bool:
+        """Return if insignificant changes are skipped, an option of the entry."""
+        return self.platform.config_entry.options.get(
+            CONF_SIGNIFICANCE_FILTER, DEFAULT_SIGNIFICANCE_FILTER
+        )
+
+    @callback
+    def _async_deferred_write(self, _: datetime) -> None:
+        """Write the latest state once the minimum interval has passed."""
+        self._cancel_deferred_write = None
+        if (tracker := self._significance) is not None:
+            self._async_write_significant(
+                tracker, self.native_value, self.available, time.monotonic()
+            )
+
+    @callback
+    def _async_heartbeat(self, _: datetime) -> None:
+        """Write the latest suppressed state once max_age has passed."""
+        self._cancel_heartbeat = None
+        if (tracker := self._significance) is not None:
+            self._async_write_significant(
+                tracker, self.native_value, self.available, time.monotonic()
+            )
+
+    @callback
+    def _async_write_significant(
+        self, tracker: SignificanceTracker, value: StateType, available: bool, now: float
+    ) -> None:
+        """Write a significant state."""
+        self._async_cancel_deferred_write()
+        self._async_cancel_heartbeat()
+        tracker.written(value, available, now)
+        self._significance_stats.count(tracker.key, "written")
+        self.async_write_ha_state()
+
+    @callback
+    def _async_cancel_deferred_write(self) -> None:
+        """Cancel a deferred state write."""
+        if self._cancel_deferred_write is not None:
+            self._cancel_deferred_write()
+            self._cancel_deferred_write = None
+
+    @callback
+    def _async_cancel_heartbeat(self) -> None:
+        """Cancel a max_age write."""
+        if self._cancel_heartbeat is not None:
+            self._cancel_heartbeat()
+            self._cancel_heartbeat = None
+
     @property
     def native_value(self) -> StateType:
         """Return the value reported by the sensor."""
@@ -1256,7 +1387,7 @@ class SmartLifeSensorEntity(SmartLifeEntity, SensorEntity):
         # Unexpected enum value
         if (
             isinstance(self._type_data, EnumTypeData)
-            and value not in self._type_data.range
+            and value not in self._type_data.range_set
         ):
             return None
 
@@ -1264,13 +1395,17 @@ class SmartLifeSensorEntity(SmartLifeEntity, SensorEntity):
         if self._type is DPType.JSON:
             if self.entity_description.subkey is None:
                 return None
-            values = ElectricityTypeData.from_json(value)
+            values = self._schema.decode(
+                self.entity_description.key, value, ElectricityTypeData.from_json
+            )
             return getattr(values, self.entity_description.subkey)
 
         if self._type is DPType.RAW:
             if self.entity_description.subkey is None:
                 return None
-            values = ElectricityTypeData.from_raw(value)
+            values = self._schema.decode(
+                self.entity_description.key, value, ElectricityTypeData.from_raw
+            )
             return getattr(values, self.entity_description.subkey)
 
         # Valid string or enum value
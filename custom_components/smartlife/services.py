@@ -0,0 +1,129 @@
+"""Services for smartlife."""
+from __future__ import annotations
+
+import time
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.helpers import config_validation as cv, device_registry as dr
+
+from .commands import CommandDispatcher
+from .const import DOMAIN, LOGGER
+
+SERVICE_SEND_BULK_COMMANDS = "send_bulk_commands"
+
+ATTR_COMMANDS = "commands"
+ATTR_DEVICE_ID = "device_id"
+ATTR_DEVICES = "devices"
+
+COMMAND_SCHEMA = vol.Schema(
+    {
+        vol.Required("code"): cv.string,
+        vol.Optional("value"): vol.Any(bool, int, float, str, dict, list, None),
+    }
+)
+
+SEND_BULK_COMMANDS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICES): vol.All(
+            cv.ensure_list,
+            [
+                vol.Schema(
+                    {
+                        vol.Required(ATTR_DEVICE_ID): cv.string,
+                        vol.Required(ATTR_COMMANDS): vol.All(
+                            cv.ensure_list, [COMMAND_SCHEMA]
+                        ),
+                    }
+                )
+            ],
+        )
+    }
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of the integration, once."""
+    if hass.services.has_service(DOMAIN, SERVICE_SEND_BULK_COMMANDS):
+        return
+
+    async def async_send_bulk_commands(call: ServiceCall) -> ServiceResponse:
+        """Send commands to many devices with a single service call."""
+        start = time.monotonic()
+        device_registry = dr.async_get(hass)
+        dispatchers: dict[CommandDispatcher, list[tuple[str, list[dict[str, Any]]]]] = {}
+        results: dict[str, dict[str, Any]] = {}
+
+        for item in call.data[ATTR_DEVICES]:
+            device_id = _async_resolve_device_id(device_registry, item[ATTR_DEVICE_ID])
+            if (dispatcher := _async_find_dispatcher(hass, device_id)) is None:
+                results[item[ATTR_DEVICE_ID]] = {
+                    "success": False,
+                    "error": "unknown device",
+                }
+                continue
+            dispatchers.setdefault(dispatcher, []).append(
+                (device_id, item[ATTR_COMMANDS])
+            )
+
+        for dispatcher, device_commands in dispatchers.items():
+            results |= await dispatcher.async_send_bulk(device_commands)
+
+        failed = sum(1 for result in results.values() if not result["success"])
+        elapsed = round(time.monotonic() - start, 3)
+        LOGGER.debug(
+            "Sent bulk commands to %s devices in %ss, %s failed",
+            len(results),
+            elapsed,
+            failed,
+        )
+        return {
+            "devices": results,
+            "succeeded": len(results) - failed,
+            "failed": failed,
+            "elapsed": elapsed,
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SEND_BULK_COMMANDS,
+        async_send_bulk_commands,
+        schema=SEND_BULK_COMMANDS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+@callback
+def async_unload_services(hass: HomeAssistant) -> None:
+    """Remove the services of the integration."""
+    hass.services.async_remove(DOMAIN, SERVICE_SEND_BULK_COMMANDS)
+
+
+@callback
+def _async_resolve_device_id(device_registry: dr.DeviceRegistry, device_id: str) -> str:
+    """Return the smartlife device ID of a device registry ID, or the ID as is."""
+    if device_entry := device_registry.async_get(device_id):
+        for domain, identifier in device_entry.identifiers:
+            if domain == DOMAIN:
+                return identifier
+    return device_id
+
+
+@callback
+def _async_find_dispatcher(
+        hass: HomeAssistant, device_id: str
+) -> CommandDispatcher | None:
+    """Return the command dispatcher of the config entry owning a device."""
+    for hass_data in hass.data.get(DOMAIN, {}).values():
+        if device_id in hass_data.manager.device_map:
+            return hass_data.commands
+    return None
@@ -0,0 +1,129 @@
+"""Significance filter of sensor state writes for smartlife."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+from homeassistant.components.sensor import SensorDeviceClass
+from homeassistant.const import (
+    UnitOfElectricCurrent,
+    UnitOfElectricPotential,
+    UnitOfPower,
+)
+
+
+@dataclass(frozen=True)
+class SignificanceFilter:
+    """Describes when a new sensor value is worth a state write.
+
+    A numeric change is significant when it exceeds both the absolute deadband,
+    in W, V or A, and the relative deadband of the last written value. Significant changes
+    are written at most once per min_interval seconds, insignificant ones are
+    written anyway once the last write is older than max_age seconds.
+    """
+
+    deadband: float = 0.0
+    relative_deadband: float = 0.0
+    min_interval: float = 0.0
+    max_age: float = 300.0
+
+
+# Filters of measurement sensors by device class, used when the description
+# has no filter of its own. Filters only apply once enabled in the options.
+DEVICE_CLASS_FILTERS: dict[SensorDeviceClass, SignificanceFilter] = {
+    SensorDeviceClass.POWER: SignificanceFilter(deadband=1.0, relative_deadband=0.02),
+    SensorDeviceClass.CURRENT: SignificanceFilter(relative_deadband=0.02),
+    SensorDeviceClass.VOLTAGE: SignificanceFilter(deadband=1.0),
+}
+
+# Size of a native unit in the unit of the absolute deadbands
+UNIT_SCALES: dict[str, float] = {
+    UnitOfPower.KILO_WATT: 1000.0,
+    UnitOfElectricCurrent.MILLIAMPERE: 0.001,
+    UnitOfElectricPotential.MILLIVOLT: 0.001,
+}
+
+
+class SignificanceStats:
+    """Counters of the significance filters of a config entry, by sensor key."""
+
+    def __init__(self) -> None:
+        """Init SignificanceStats."""
+        self._counters: dict[str, dict[str, int]] = {}
+
+    def count(self, key: str, counter: str) -> None:
+        """Increment a counter of a sensor key."""
+        counters = self._counters.setdefault(
+            key, {"written": 0, "suppressed": 0, "deferred": 0}
+        )
+        counters[counter] += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters."""
+        return {key: dict(counters) for key, counters in self._counters.items()}
+
+
+class SignificanceTracker:
+    """Track the last written state of a sensor against its filter."""
+
+    def __init__(
+        self, key: str, significance_filter: SignificanceFilter, scale: float = 1.0
+    ) -> None:
+        """Init SignificanceTracker."""
+        self.key = key
+        self.filter = significance_filter
+        self.scale = scale
+        self._written = False
+        self._value: Any = None
+        self._available = False
+        self._time = 0.0
+
+    def significant(self, value: Any, available: bool, now: float) -> bool:
+        """Return if a new state changed enough to be written."""
+        if (
+            not self._written
+            or available != self._available
+            or now - self._time >= self.filter.max_age
+        ):
+            return True
+
+        number, last_number = _as_number(value), _as_number(self._value)
+        if number is None or last_number is None:
+            return value != self._value
+
+        delta = abs(number - last_number)
+        return delta > max(
+            self.filter.deadband / self.scale,
+            self.filter.relative_deadband * abs(last_number),
+        )
+
+    def expires_in(self, now: float) -> float:
+        """Return how long until the last write is older than max_age."""
+        return max(0.0, self._time + self.filter.max_age - now)
+
+    def deferred_for(self, available: bool, now: float) -> float:
+        """Return how long a significant write has to wait for min_interval."""
+        if not self._written or available != self._available:
+            return 0.0
+        return max(0.0, self._time + self.filter.min_interval - now)
+
+    def written(self, value: Any, available: bool, now: float) -> None:
+        """Record a state write."""
+        self._written = True
+        self._value = value
+        self._available = available
+        self._time = now
+
+
+def _as_number(value: Any) -> float | None:
+    """Return a numeric value, including numeric strings like the RAW phases."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return None
@@ -11,13 +11,16 @@ from homeassistant.components.siren import (
     SirenEntityFeature,
 )
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import HomeAssistantSmartLifeData
 from .base import SmartLifeEntity
-from .const import DOMAIN, SMART_LIFE_DISCOVERY_NEW, DPCode
+from .const import DOMAIN, DPCode
+from .discovery import discovery_signal, iter_descriptions
+from .lanes import CommandLane
 
 # All descriptions can be found here:
 # https://developer.tuya.com/en/docs/iot/standarddescription?id=K9i5ql6waswzq
@@ -59,23 +62,22 @@ async def async_setup_entry(
     def async_discover_device(device_ids: list[str]) -> None:
         """Discover and add a discovered smartlife siren."""
         entities: list[SmartLifeSirenEntity] = []
-        for device_id in device_ids:
-            device = hass_data.manager.device_map[device_id]
-            if descriptions := SIRENS.get(device.category):
-                for description in descriptions:
-                    if description.key in device.status:
-                        entities.append(
-                            SmartLifeSirenEntity(
-                                device, hass_data.manager, description
-                            )
-                        )
+        for device, description in iter_descriptions(
+            hass_data.manager.device_map, device_ids, SIRENS
+        ):
+            if description.key in device.status:
+                entities.append(
+                    SmartLifeSirenEntity(device, hass_data.manager, description)
+                )
 
         async_add_entities(entities)
 
-    async_discover_device([*hass_data.manager.device_map])
+    async_discover_device(hass_data.discovery.async_device_ids(Platform.SIREN))
 
     entry.async_on_unload(
-        async_dispatcher_connect(hass, SMART_LIFE_DISCOVERY_NEW, async_discover_device)
+        async_dispatcher_connect(
+            hass, discovery_signal(Platform.SIREN), async_discover_device
+        )
     )
 
 
@@ -83,6 +85,7 @@ class SmartLifeSirenEntity(SmartLifeEntity, SirenEntity):
     """smartlife Siren Entity."""
 
     _attr_supported_features = SirenEntityFeature.TURN_ON | SirenEntityFeature.TURN_OFF
+    _command_lane = CommandLane.SECURITY
 
     def __init__(
         self,
@@ -93,6 +96,7 @@ class SmartLifeSirenEntity(SmartLifeEntity, SirenEntity):
         """Init smartlife Siren."""
         super().__init__(device, device_manager)
         self.entity_description = description
+        self._dpcodes = frozenset({description.key})
         self._attr_unique_id = f"{super().unique_id}{description.key}"
 
     @property
@@ -100,10 +104,14 @@ class SmartLifeSirenEntity(SmartLifeEntity, SirenEntity):
         """Return true if siren is on."""
         return self.device.status.get(self.entity_description.key, False)
 
-    def turn_on(self, **kwargs: Any) -> None:
+    async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the siren on."""
-        self._send_command([{"code": self.entity_description.key, "value": True}])
+        await self._async_send_command(
+            [{"code": self.entity_description.key, "value": True}]
+        )
 
-    def turn_off(self, **kwargs: Any) -> None:
+    async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the siren off."""
-        self._send_command([{"code": self.entity_description.key, "value": False}])
+        await self._async_send_command(
+            [{"code": self.entity_description.key, "value": False}]
+        )
@@ -0,0 +1,109 @@
+"""Persistent device snapshot for smartlife."""
+from __future__ import annotations
+
+from typing import Any
+
+from tuya_sharing import CustomerDevice
+from tuya_sharing.device import DeviceFunction, DeviceStatusRange
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, LOGGER
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 30
+
+# Device attributes kept in the snapshot, secrets like the local key are left out.
+SNAPSHOT_ATTRIBUTES = (
+    "id",
+    "name",
+    "category",
+    "product_id",
+    "product_name",
+    "sub",
+    "online",
+    "icon",
+    "time_zone",
+    "active_time",
+    "create_time",
+    "update_time",
+    "support_local",
+)
+
+
+class DeviceSnapshotStore:
+    """Snapshot of the device map of a config entry, used for warm startup."""
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Init DeviceSnapshotStore."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.devices"
+        )
+
+    async def async_load(self) -> dict[str, CustomerDevice]:
+        """Load the devices of the snapshot."""
+        if not (data := await self._store.async_load()):
+            return {}
+
+        devices: dict[str, CustomerDevice] = {}
+        for item in data.get("devices", []):
+            try:
+                device = _device_from_dict(item)
+            except (KeyError, TypeError, ValueError):
+                LOGGER.debug("Ignoring invalid device in snapshot: %s", item)
+                continue
+            devices[device.id] = device
+        return devices
+
+    async def async_save(self, device_map: dict[str, CustomerDevice]) -> None:
+        """Save a snapshot of the device map now."""
+        await self._store.async_save(_snapshot_as_dict(device_map))
+
+    @callback
+    def async_delay_save(self, device_map: dict[str, CustomerDevice]) -> None:
+        """Save a snapshot of the device map after a delay."""
+        self._store.async_delay_save(
+            lambda: _snapshot_as_dict(device_map), SAVE_DELAY
+        )
+
+    async def async_remove(self) -> None:
+        """Remove the snapshot."""
+        await self._store.async_remove()
+
+
+def _snapshot_as_dict(device_map: dict[str, CustomerDevice]) -> dict[str, Any]:
+    """Represent the device map as a snapshot."""
+    return {"devices": [_device_as_dict(device) for device in device_map.values()]}
+
+
+def _device_as_dict(device: CustomerDevice) -> dict[str, Any]:
+    """Represent a device as a dictionary."""
+    data = {key: getattr(device, key, None) for key in SNAPSHOT_ATTRIBUTES}
+    data["status"] = dict(device.status)
+    data["function"] = [dict(vars(item)) for item in device.function.values()]
+    data["status_range"] = [dict(vars(item)) for item in device.status_range.values()]
+    # JSON only has string keys, the DP ids are converted back on load.
+    data["local_strategy"] = {
+        str(dp_id): strategy for dp_id, strategy in device.local_strategy.items()
+    }
+    return data
+
+
+def _device_from_dict(data: dict[str, Any]) -> CustomerDevice:
+    """Restore a device from its dictionary representation."""
+    device = CustomerDevice(
+        **{key: data[key] for key in SNAPSHOT_ATTRIBUTES},
+        status=dict(data["status"]),
+    )
+    device.function = {
+        item["code"]: DeviceFunction(**item) for item in data["function"]
+    }
+    device.status_range = {
+        item["code"]: DeviceStatusRange(**item) for item in data["status_range"]
+    }
+    device.local_strategy = {
+        int(dp_id): strategy for dp_id, strategy in data["local_strategy"].items()
+    }
+    return device
@@ -11,14 +11,15 @@ from homeassistant.components.switch import (
     SwitchEntityDescription,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import EntityCategory
+from homeassistant.const import EntityCategory, Platform
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import HomeAssistantSmartLifeData
 from .base import SmartLifeEntity
-from .const import DOMAIN, SMART_LIFE_DISCOVERY_NEW, DPCode
+from .const import DOMAIN, DPCode
+from .discovery import discovery_signal, iter_descriptions
 
 # All descriptions can be found here. Mostly the Boolean data types in the
 # default instruction set of each category end up being a Switch.
@@ -724,29 +725,30 @@ async def async_setup_entry(
     def async_discover_device(device_ids: list[str]) -> None:
         """Discover and add a discovered smartlife sensor."""
         entities: list[SmartLifeSwitchEntity] = []
-        for device_id in device_ids:
-            device = hass_data.manager.device_map[device_id]
-            if descriptions := SWITCHES.get(device.category):
-                for description in descriptions:
-                    if description.key in device.status:
-                        entities.append(
-                            SmartLifeSwitchEntity(
-                                device, hass_data.manager, description
-                            )
-                        )
+        for device, description in iter_descriptions(
+            hass_data.manager.device_map, device_ids, SWITCHES
+        ):
+            if description.key in device.status:
+                entities.append(
+                    SmartLifeSwitchEntity(device, hass_data.manager, description)
+                )
 
         async_add_entities(entities)
 
-    async_discover_device([*hass_data.manager.device_map])
+    async_discover_device(hass_data.discovery.async_device_ids(Platform.SWITCH))
 
     entry.async_on_unload(
-        async_dispatcher_connect(hass, SMART_LIFE_DISCOVERY_NEW, async_discover_device)
+        async_dispatcher_connect(
+            hass, discovery_signal(Platform.SWITCH), async_discover_device
+        )
     )
 
 
 class SmartLifeSwitchEntity(SmartLifeEntity, SwitchEntity):
     """Smart Life Switch Device."""
 
+    _optimistic = True
+
     def __init__(
             self,
             device: CustomerDevice,
@@ -756,31 +758,36 @@ class SmartLifeSwitchEntity(SmartLifeEntity, SwitchEntity):
         """Init SmartLifeHaSwitch."""
         super().__init__(device, device_manager)
         self.entity_description = description
+        self._dpcodes = frozenset({description.key})
         self._attr_unique_id = f"{super().unique_id}{description.key}"
 
     @property
     def is_on(self) -> bool:
         """Return true if switch is on."""
-        return self.device.status.get(self.entity_description.key, False)
+        return self._status.get(self.entity_description.key, False)
 
-    def turn_on(self, **kwargs: Any) -> None:
+    async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the switch on."""
         # Специальный обработчик для ворот
         if self.device.category == "qt" and self.entity_description.key == DPCode.GATE_FAST_OPEN:
             # Используем команду из логов
             command = "快捷开门"  # Быстрое открытие
-            self._send_command([{"code": command}])
+            await self._async_send_command([{"code": command}])
         else:
             # Для обычных переключателей используем стандартный формат
-            self._send_command([{"code": self.entity_description.key, "value": True}])
+            await self._async_send_command(
+                [{"code": self.entity_description.key, "value": True}]
+            )
 
-    def turn_off(self, **kwargs: Any) -> None:
+    async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the switch off."""
         # Специальный обработчик для ворот
         if self.device.category == "qt" and self.entity_description.key == DPCode.GATE_FAST_OPEN:
             # Отключаем быстрое открытие - это логически должно быть так же
             command = "快捷开门"  # Быстрое открытие, отправляем false
-            self._send_command([{"code": command, "value": False}])
+            await self._async_send_command([{"code": command, "value": False}])
         else:
             # Для обычных переключателей используем стандартный формат
-            self._send_command([{"code": self.entity_description.key, "value": False}])
+            await self._async_send_command(
+                [{"code": self.entity_description.key, "value": False}]
+            )
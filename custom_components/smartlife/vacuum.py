@@ -13,14 +13,15 @@ from homeassistant.components.vacuum import (
     VacuumEntityFeature,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import STATE_IDLE, STATE_PAUSED
+from homeassistant.const import STATE_IDLE, STATE_PAUSED, Platform
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import HomeAssistantSmartLifeData
 from .base import EnumTypeData, IntegerTypeData, SmartLifeEntity
-from .const import DOMAIN, SMART_LIFE_DISCOVERY_NEW, DPCode, DPType
+from .const import DOMAIN, DPCode, DPType
+from .discovery import discovery_signal
 
 SMART_LIFE_MODE_RETURN_HOME = "chargego"
 SMART_LIFE_STATUS_TO_HA = {
@@ -66,10 +67,12 @@ async def async_setup_entry(
                 entities.append(SmartLifeVacuumEntity(device, hass_data.manager))
         async_add_entities(entities)
 
-    async_discover_device([*hass_data.manager.device_map])
+    async_discover_device(hass_data.discovery.async_device_ids(Platform.VACUUM))
 
     entry.async_on_unload(
-        async_dispatcher_connect(hass, SMART_LIFE_DISCOVERY_NEW, async_discover_device)
+        async_dispatcher_connect(
+            hass, discovery_signal(Platform.VACUUM), async_discover_device
+        )
     )
 
 
@@ -95,7 +98,7 @@ class SmartLifeVacuumEntity(SmartLifeEntity, StateVacuumEntity):
             enum_type := self.find_dpcode(
                 DPCode.MODE, dptype=DPType.ENUM, prefer_function=True
             )
-        ) and SMART_LIFE_MODE_RETURN_HOME in enum_type.range:
+        ) and SMART_LIFE_MODE_RETURN_HOME in enum_type.range_set:
             self._attr_supported_features |= VacuumEntityFeature.RETURN_HOME
 
         if self.find_dpcode(DPCode.SEEK, prefer_function=True):
@@ -120,7 +123,7 @@ class SmartLifeVacuumEntity(SmartLifeEntity, StateVacuumEntity):
             DPCode.SUCTION, dptype=DPType.ENUM, prefer_function=True
         ):
             self._fan_speed = enum_type
-            self._attr_fan_speed_list = enum_type.range
+            self._attr_fan_speed_list = list(enum_type.range)
             self._attr_supported_features |= VacuumEntityFeature.FAN_SPEED
 
         if int_type := self.find_dpcode(DPCode.ELECTRICITY_LEFT, dptype=DPType.INTEGER):
@@ -152,44 +155,44 @@ class SmartLifeVacuumEntity(SmartLifeEntity, StateVacuumEntity):
             return None
         return SMART_LIFE_STATUS_TO_HA.get(status)
 
-    def turn_on(self, **kwargs: Any) -> None:
+    async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the device on."""
-        self._send_command([{"code": DPCode.POWER, "value": True}])
+        await self._async_send_command([{"code": DPCode.POWER, "value": True}])
 
-    def turn_off(self, **kwargs: Any) -> None:
+    async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the device off."""
-        self._send_command([{"code": DPCode.POWER, "value": False}])
+        await self._async_send_command([{"code": DPCode.POWER, "value": False}])
 
-    def start(self, **kwargs: Any) -> None:
+    async def async_start(self, **kwargs: Any) -> None:
         """Start the device."""
-        self._send_command([{"code": DPCode.POWER_GO, "value": True}])
+        await self._async_send_command([{"code": DPCode.POWER_GO, "value": True}])
 
-    def stop(self, **kwargs: Any) -> None:
+    async def async_stop(self, **kwargs: Any) -> None:
         """Stop the device."""
-        self._send_command([{"code": DPCode.POWER_GO, "value": False}])
+        await self._async_send_command([{"code": DPCode.POWER_GO, "value": False}])
 
-    def pause(self, **kwargs: Any) -> None:
+    async def async_pause(self, **kwargs: Any) -> None:
         """Pause the device."""
-        self._send_command([{"code": DPCode.POWER_GO, "value": False}])
+        await self._async_send_command([{"code": DPCode.POWER_GO, "value": False}])
 
-    def return_to_base(self, **kwargs: Any) -> None:
+    async def async_return_to_base(self, **kwargs: Any) -> None:
         """Return device to dock."""
-        self._send_command(
+        await self._async_send_command(
             [
                 {"code": DPCode.SWITCH_CHARGE, "value": True},
                 {"code": DPCode.MODE, "value": SMART_LIFE_MODE_RETURN_HOME},
             ]
         )
 
-    def locate(self, **kwargs: Any) -> None:
+    async def async_locate(self, **kwargs: Any) -> None:
         """Locate the device."""
-        self._send_command([{"code": DPCode.SEEK, "value": True}])
+        await self._async_send_command([{"code": DPCode.SEEK, "value": True}])
 
-    def set_fan_speed(self, fan_speed: str, **kwargs: Any) -> None:
+    async def async_set_fan_speed(self, fan_speed: str, **kwargs: Any) -> None:
         """Set fan speed."""
-        self._send_command([{"code": DPCode.SUCTION, "value": fan_speed}])
+        await self._async_send_command([{"code": DPCode.SUCTION, "value": fan_speed}])
 
-    def send_command(
+    async def async_send_command(
         self,
         command: str,
         params: dict[str, Any] | list[Any] | None = None,
@@ -200,4 +203,4 @@ class SmartLifeVacuumEntity(SmartLifeEntity, StateVacuumEntity):
             raise ValueError("Params cannot be omitted for smartlife vacuum commands")
         if not isinstance(params, list):
             raise TypeError("Params must be a list for smartlife vacuum commands")
-        self._send_command([{"code": command, "value": params[0]}])
+        await self._async_send_command([{"code": command, "value": params[0]}])
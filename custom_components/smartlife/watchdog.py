@@ -0,0 +1,189 @@
+"""Watchdog of the MQ connection of smartlife."""
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta
+import random
+import time
+from typing import Any
+
+from tuya_sharing import Manager
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+
+from .const import (
+    LOGGER,
+    MQ_BACKOFF_MAX,
+    MQ_BACKOFF_MIN,
+    MQ_STALE_TIMEOUT,
+    MQ_WATCHDOG_INTERVAL,
+)
+from .executor import BlockingExecutor
+from .polling import PollingFallback
+
+
+class MQWatchdog:
+    """Keep the MQ connection of a config entry alive.
+
+    The client is probed every MQ_WATCHDOG_INTERVAL seconds. A client that
+    is disconnected, or silent for MQ_STALE_TIMEOUT seconds, is reconnected
+    with a jittered exponential backoff. The devices are polled until the
+    connection is back, then resynced, as they may have reported changes in
+    the meantime.
+    """
+
+    def __init__(
+            self,
+            hass: HomeAssistant,
+            manager: Manager,
+            executor: BlockingExecutor,
+            fallback: PollingFallback,
+            resync: Callable[[], Awaitable[None]],
+    ) -> None:
+        """Init MQWatchdog."""
+        self.hass = hass
+        self.manager = manager
+        self.executor = executor
+        self.fallback = fallback
+        self._resync = resync
+        self._started = False
+        self._last_message = time.monotonic()
+        self._down_since: float | None = None
+        self._attempt = 0
+        self._cancel_retry: CALLBACK_TYPE | None = None
+        self._outages = 0
+        self._reconnects = 0
+        self._downtime_total = 0.0
+        self._last_downtime: float | None = None
+        self._resyncs = 0
+
+    async def async_refresh_mq(self) -> None:
+        """Connect the MQ, replacing the current connection."""
+        await self.executor.async_run(self.manager.refresh_mq)
+        self._last_message = time.monotonic()
+        self._started = True
+        if self.manager.mq is not None:
+            self.manager.mq.add_message_listener(self._on_message)
+
+    def _on_message(self, msg: dict[str, Any]) -> None:
+        """Note the time of a message, called from the MQ thread."""
+        self._last_message = time.monotonic()
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Probe the MQ periodically, returns a callback to stop."""
+        cancel_check = async_track_time_interval(
+            self.hass, self._async_check, timedelta(seconds=MQ_WATCHDOG_INTERVAL)
+        )
+
+        @callback
+        def async_stop() -> None:
+            cancel_check()
+            self.fallback.async_stop()
+            if self._cancel_retry is not None:
+                self._cancel_retry()
+                self._cancel_retry = None
+
+        return async_stop
+
+    def _connected(self) -> bool:
+        """Return if the MQ client is connected."""
+        mq = self.manager.mq
+        return mq is not None and mq.client is not None and mq.client.is_connected()
+
+    @callback
+    def _async_check(self, _: datetime | None = None) -> None:
+        """Probe the MQ client and start reconnecting when it is down."""
+        if not self._started or self._cancel_retry is not None:
+            # Not connected yet, or already reconnecting.
+            return
+
+        now = time.monotonic()
+        if not self._connected():
+            LOGGER.warning("MQ disconnected, reconnecting")
+            self._async_down(now)
+            self._async_schedule_retry()
+            return
+
+        if now - self._last_message >= MQ_STALE_TIMEOUT:
+            LOGGER.info(
+                "No MQ message for %s seconds, reconnecting",
+                round(now - self._last_message),
+            )
+            self._async_down(self._last_message)
+            self._reconnects += 1
+            self.hass.async_create_task(self._async_reconnect())
+            self._async_schedule_retry()
+
+    @callback
+    def _async_down(self, since: float) -> None:
+        """Record the start of an outage and poll the devices meanwhile."""
+        if self._down_since is None:
+            self._down_since = since
+            self._outages += 1
+            self.fallback.async_start()
+
+    @callback
+    def _async_schedule_retry(self) -> None:
+        """Check the connection again after a jittered exponential backoff."""
+        backoff = min(MQ_BACKOFF_MAX, MQ_BACKOFF_MIN * 2**self._attempt)
+        self._attempt += 1
+        self._cancel_retry = async_call_later(
+            self.hass, random.uniform(backoff / 2, backoff), self._async_retry
+        )
+
+    async def _async_retry(self, _: datetime) -> None:
+        """Resync once the connection is back, reconnect otherwise."""
+        self._cancel_retry = None
+        if self._connected():
+            self._async_recovered()
+            return
+
+        self._reconnects += 1
+        await self._async_reconnect()
+        self._async_schedule_retry()
+
+    async def _async_reconnect(self) -> None:
+        """Replace the MQ connection, failures are retried with the backoff."""
+        try:
+            await self.async_refresh_mq()
+        except Exception as err:  # pylint: disable=broad-except
+            LOGGER.warning("Failed to reconnect the MQ: %s", err)
+
+    @callback
+    def _async_recovered(self) -> None:
+        """Record the end of an outage and resync the devices."""
+        if self._down_since is not None:
+            downtime = time.monotonic() - self._down_since
+            self._downtime_total += downtime
+            self._last_downtime = downtime
+            LOGGER.info("MQ connection restored after %s seconds", round(downtime))
+        self._down_since = None
+        self._attempt = 0
+        self.fallback.async_stop()
+        self.hass.async_create_task(self.async_resync())
+
+    async def async_resync(self) -> None:
+        """Fetch the changes of the devices missed while disconnected."""
+        self._resyncs += 1
+        await self._resync()
+
+    @callback
+    def as_dict(self) -> dict[str, Any]:
+        """Return the state and counters of the watchdog."""
+        now = time.monotonic()
+        return {
+            "connected": self._connected(),
+            "last_message_age": round(now - self._last_message, 1),
+            "down_for": round(now - self._down_since, 1)
+            if self._down_since is not None
+            else None,
+            "outages": self._outages,
+            "reconnects": self._reconnects,
+            "downtime_total": round(self._downtime_total, 1),
+            "last_downtime": round(self._last_downtime, 1)
+            if self._last_downtime is not None
+            else None,
+            "resyncs": self._resyncs,
+        }
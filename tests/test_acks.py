@@ -0,0 +1,52 @@
+"""Tests for the command acknowledgement tracker of smartlife."""
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from custom_components.smartlife.acks import AckTracker
+
+
+def _tracker(status: dict) -> tuple[AckTracker, AsyncMock]:
+    """Return a tracker of a device with a status, and its resend mock."""
+    device = MagicMock(status=status, function={})
+    manager = MagicMock(device_map={"device": device})
+    resend = AsyncMock()
+    return AckTracker(MagicMock(), manager, resend), resend
+
+
+@patch("custom_components.smartlife.acks.async_call_later")
+def test_report_of_sent_value_acknowledges(call_later: MagicMock) -> None:
+    """A report carrying the sent value acknowledges the command."""
+    tracker, _ = _tracker({"bright_value": 500})
+    tracker.async_sent("device", [{"code": "bright_value", "value": 500}])
+    tracker.async_reported("device", {"bright_value"})
+
+    assert tracker.as_dict("device")["device"]["acked"] == 1
+    assert tracker.as_dict("device")["device"]["pending"] == 0
+
+
+@patch("custom_components.smartlife.acks.async_call_later")
+def test_report_of_other_value_does_not_resend(call_later: MagicMock) -> None:
+    """A report with another value overrides the command, it is not resent."""
+    tracker, resend = _tracker({"bright_value": 490})
+    tracker.async_sent("device", [{"code": "bright_value", "value": 500}])
+    tracker.async_reported("device", {"bright_value"})
+
+    # The timeout scheduled when the command was sent fires anyway.
+    timeout = call_later.call_args.args[2]
+    timeout(None)
+
+    resend.assert_not_called()
+    tracker.hass.async_create_task.assert_not_called()
+    stats = tracker.as_dict("device")["device"]
+    assert stats["overridden"] == 1
+    assert stats["pending"] == 0
+    assert stats["lost"] == 0
+
+
+@patch("custom_components.smartlife.acks.async_call_later")
+def test_unknown_report_keeps_command_pending(call_later: MagicMock) -> None:
+    """A report of unknown DP codes with another value keeps the command."""
+    tracker, _ = _tracker({"bright_value": 490})
+    tracker.async_sent("device", [{"code": "bright_value", "value": 500}])
+    tracker.async_reported("device", None)
+
+    assert tracker._pending["device"]["bright_value"].value == 500
@@ -0,0 +1,37 @@
+"""Tests for the optimistic overlay of smartlife."""
+from unittest.mock import MagicMock, patch
+
+from custom_components.smartlife.optimistic import OptimisticOverlay
+
+
+def _overlay() -> OptimisticOverlay:
+    """Return an overlay with a mocked router."""
+    return OptimisticOverlay(MagicMock(), MagicMock(), MagicMock())
+
+
+def test_apply_command_without_value() -> None:
+    """A command without a value, like the gate opener, shows nothing."""
+    overlay = _overlay()
+    with patch(
+        "custom_components.smartlife.optimistic.async_call_later"
+    ) as call_later:
+        overlay.async_apply("device", [{"code": "快捷开门"}])
+
+    assert overlay.values("device") is None
+    call_later.assert_not_called()
+    overlay.router.async_route.assert_not_called()
+
+
+def test_apply_skips_only_commands_without_value() -> None:
+    """Commands with a value are still shown next to one without."""
+    overlay = _overlay()
+    with patch("custom_components.smartlife.optimistic.async_call_later"):
+        overlay.async_apply(
+            "device", [{"code": "switch_1", "value": True}, {"code": "快捷开门"}]
+        )
+
+    assert overlay.values("device") == {"switch_1": True}
+    overlay.router.async_route.assert_called_once_with("device", ["switch_1"])
+
+    overlay.async_revert("device", ["switch_1", "快捷开门"])
+    assert overlay.values("device") is None